@@ -0,0 +1,149 @@
+"""
+مقارنة تحليل جدول الطلبيات عموداً بعمود مع حلقة iterrows القديمة.
+
+التشغيل من جذر المشروع:
+    python benchmarks/bench_excel_reader.py [--rows 50000] [--seed 42]
+
+يتحقق أيضاً من تطابق (processed_carpets, raw_carpets) على جداول عشوائية
+تحتوي قيماً غير صالحة (نصوص، فراغات، أعداد عشرية، خلايا فارغة).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.carpet import Carpet
+from data_io.excel_reader import build_carpets, parse_orders_frame
+
+
+def legacy_parse(df: pd.DataFrame, pair_mode: str = "B"):
+    """التنفيذ السابق صفاً بصف (مرجع للمقارنة فقط)"""
+    processed_carpets = []
+    raw_carpets = []
+    prep_offset = {"A": 8, "B": 6, "C": 1, "D": 3}
+    pair_mode = str(pair_mode).upper()
+
+    for idx, row in df.iterrows():
+        try:
+            client_order = int(row[0])
+            width_raw = int(str(row[1]).strip())
+            height_raw = int(str(row[2]).strip())
+            qty_raw = int(row[3])
+
+            raw_carpets.append(Carpet(id=idx + 1, width=width_raw, height=height_raw,
+                                      qty=qty_raw, client_order=client_order))
+
+            if len(row) > 6:
+                texture_type = str(row[5]).strip().upper()
+                prep_code = str(row[6]).strip().upper()
+            else:
+                texture_type = str(row[4]).strip().upper() if len(row) > 4 else ""
+                prep_code = str(row[5]).strip().upper() if len(row) > 5 else ""
+
+            qty = max(1, qty_raw // 2) if pair_mode == "A" else qty_raw
+            width, height = width_raw, height_raw
+            if prep_code in prep_offset:
+                height += prep_offset[prep_code]
+            if texture_type == "B":
+                width, height = height, width
+            if width <= 0 or height <= 0 or qty <= 0:
+                continue
+
+            carpet = Carpet(id=idx + 1, width=width, height=height, qty=qty, client_order=client_order)
+            carpet.qty_original_before_pair_mode = qty_raw
+            processed_carpets.append(carpet)
+        except Exception:
+            continue
+
+    return processed_carpets, raw_carpets
+
+
+def _signature(result):
+    processed, raw = result
+    return (
+        [(c.id, c.width, c.height, c.qty, c.client_order, c.qty_original_before_pair_mode,
+          type(c.width), type(c.qty)) for c in processed],
+        [(c.id, c.width, c.height, c.qty, c.client_order, type(c.id)) for c in raw],
+    )
+
+
+def make_frame(rows: int, seed: int, dirty: bool = True, columns: int = 6) -> pd.DataFrame:
+    """جدول طلبيات عشوائي، مع قيم غير صالحة اختيارياً"""
+    rng = random.Random(seed)
+    widths = [80, 84, 95, 100, 120, 126, 133, 145, 160, 168, 200, 210, 250, 260, 294, 315, 347]
+    heights = [50, 60, 70, 120, 150, 160, 170, 190, 200, 230, 235, 240, 250, 285, 300, 350, 370, 400]
+    bad = [None, "", " ", "abc", "12.5", " 7 ", 0, -3, 126.0, float("nan"), True]
+    data = []
+    for _ in range(rows):
+        row = [
+            rng.randint(1, 9),
+            rng.choice(widths),
+            rng.choice(heights),
+            rng.randint(1, 60),
+            rng.choice(["A", "B", "b ", "", None]),
+            rng.choice(["A", "B", "C", "D", " c", "", None]),
+            rng.choice(["A", "B", "", None]),
+        ][:columns]
+        if dirty and rng.random() < 0.05:
+            row[rng.randrange(min(columns, 4))] = rng.choice(bad)
+        data.append(row)
+    return pd.DataFrame(data)
+
+
+def _check_equivalence(seed: int) -> int:
+    mismatches = 0
+    rng = random.Random(seed)
+    frames = []
+    for k in range(40):
+        columns = rng.choice([3, 4, 5, 6, 7])
+        frames.append(make_frame(rng.randint(0, 300), seed + k, dirty=k % 3 != 0, columns=columns))
+    # جداول رقمية بالكامل: iterrows يرفع الصف إلى float عند وجود عمود عشري
+    frames.append(pd.DataFrame({0: [1, 2], 1: [100, 120], 2: [200, 210], 3: [5, 6]}))
+    frames.append(pd.DataFrame({0: [1, 2], 1: [100, 120], 2: [200, 210], 3: [5.0, float("nan")]}))
+    frames.append(pd.DataFrame({0: [1.0, 2.5], 1: ["100", " 120 "], 2: [200, 210], 3: ["5", " 6 "]}))
+    for df in frames:
+        for pair_mode in ("A", "B"):
+            expected = _signature(legacy_parse(df, pair_mode))
+            actual = _signature(build_carpets(parse_orders_frame(df, pair_mode)))
+            if expected != actual:
+                mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    mismatches = _check_equivalence(args.seed)
+
+    df = make_frame(args.rows, args.seed)
+    start = time.perf_counter()
+    legacy = legacy_parse(df)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columnar = build_carpets(parse_orders_frame(df))
+    columnar_time = time.perf_counter() - start
+    if _signature(legacy) != _signature(columnar):
+        mismatches += 1
+
+    print(f"rows:       {args.rows} (valid: {len(columnar[0])})")
+    print(f"iterrows:   {legacy_time:.3f}s")
+    print(f"columnar:   {columnar_time:.3f}s")
+    if columnar_time > 0:
+        print(f"speedup:    {legacy_time / columnar_time:.1f}x")
+    print(f"mismatches: {mismatches}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
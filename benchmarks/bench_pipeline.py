@@ -0,0 +1,215 @@
+"""
+قياس زمن كل مرحلة من مسار التجميع على طلبيات اصطناعية قابلة للتكرار.
+
+التشغيل من جذر المشروع:
+    python benchmarks/bench_pipeline.py [--rows 1000 10000] [--seed 42]
+
+المراحل: القراءة، merge_duplicate_carpets، build_groups لكل
+GroupingMode×SortType، generate_suggestions، write_output_excel.
+لكل مرحلة: زمن التنفيذ، ذروة الذاكرة (RSS) للعملية حتى نهاية المرحلة،
+وعدد التوافيق المفحوصة في build_groups. النتائج تُضاف إلى سجل JSON
+(--history) وتُقارن مع آخر تشغيل بنفس الإعدادات لإظهار التراجعات كأرقام.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.Enums.grouping_mode import GroupingMode
+from core.Enums.sort_type import SortType
+from core.grouping_algorithm import build_groups
+from core.pipeline import merge_duplicate_carpets
+from core.progress import CombinationCounter
+from core.suggestion_engine import generate_suggestions
+from data_io.excel_reader import build_carpets, read_input_arrays
+from data_io.excel_writer import write_output_excel
+from models.inventory import InventorySnapshot
+from models.report_metrics import ReportMetrics
+from sample_data.generate_orders import generate_orders, write_orders
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "history.json")
+
+# الإعداد الافتراضي للتشغيل (RunConfig): منه تُحسب المتبقيات للاقتراحات والكتابة
+DEFAULT_MODE = GroupingMode.NO_MAIN_REPEAT
+DEFAULT_SORT = SortType.SORT_BY_QUANTITY
+
+
+def peak_rss_mb():
+    """ذروة RSS للعملية حتى الآن (ru_maxrss بالكيلوبايت على Linux وبالبايت على macOS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def timed(records, stage, fn, **extra):
+    start = time.perf_counter()
+    result = fn()
+    record = {"stage": stage, "seconds": round(time.perf_counter() - start, 4), "peak_rss_mb": peak_rss_mb()}
+    record.update(extra)
+    records.append(record)
+    return result, record
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(rows, args, workdir):
+    records = []
+    input_path = os.path.join(workdir, f"orders_{rows}_{args.seed}.{args.input_format}")
+    write_orders(input_path, generate_orders(rows, args.seed))
+
+    (carpets, raw_carpets), _ = timed(
+        records, "read", lambda: build_carpets(read_input_arrays(input_path, pair_mode=args.pair_mode))
+    )
+    original_carpets = list(carpets)
+    merged, _ = timed(records, "merge_duplicate_carpets", lambda: merge_duplicate_carpets(carpets))
+
+    # الإعداد الافتراضي آخراً: نتيجته (دون استعادة الكميات) تُستخدم للاقتراحات والكتابة
+    combos = [(m, s) for m in args.modes for s in args.sorts if (m, s) != (DEFAULT_MODE, DEFAULT_SORT)]
+    combos.append((DEFAULT_MODE, DEFAULT_SORT))
+
+    snapshot = InventorySnapshot(merged)
+    groups = []
+    for index, (mode, sort) in enumerate(combos):
+        counter = CombinationCounter()
+        groups, record = timed(records, f"build_groups[{mode.name}/{sort.name}]", lambda: build_groups(
+            carpets=list(snapshot.carpets),
+            min_width=args.min_width,
+            max_width=args.max_width,
+            max_partner=args.max_partner,
+            tolerance=args.tolerance,
+            selected_mode=mode,
+            selected_sort_type=sort,
+            progress=counter,
+        ))
+        record["combinations"] = counter.examined
+        record["groups"] = len(groups)
+        if index < len(combos) - 1:
+            snapshot.restore()
+
+    remaining = [c for c in merged if c.rem_qty > 0]
+    suggestions, record = timed(records, "generate_suggestions", lambda: generate_suggestions(
+        remaining=remaining,
+        min_width=args.min_width,
+        max_width=args.max_width,
+        tolerance=args.tolerance,
+        selected_mode=DEFAULT_MODE,
+        selected_sort_type=DEFAULT_SORT,
+        max_workers=args.suggestion_workers,
+    ))
+    record["suggestions"] = len(suggestions)
+
+    if not args.skip_write:
+        output_path = os.path.join(workdir, f"orders_{rows}_{args.seed}_processed.xlsx")
+        timed(records, "write_output_excel", lambda: write_output_excel(
+            output_path, groups, remaining, args.min_width, args.max_width, args.tolerance,
+            original_carpets, suggestions, raw_carpets, args.pair_mode,
+            metrics=ReportMetrics(groups, remaining, original_carpets, raw_carpets),
+        ))
+
+    return records
+
+
+def load_history(path):
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def previous_run(history, params):
+    for entry in reversed(history):
+        if entry.get("params") == params:
+            return entry
+    return None
+
+
+def print_records(rows, records, previous):
+    before = {r["stage"]: r for r in previous["stages"]} if previous else {}
+    print(f"\nrows: {rows}" + (f"  (vs {previous['timestamp']} {previous.get('revision') or ''})" if previous else ""))
+    for r in records:
+        line = f"  {r['stage']:<48} {r['seconds']:>9.3f}s  {r['peak_rss_mb'] or 0:>8.1f}MB"
+        if "combinations" in r:
+            line += f"  {r['combinations']:>10} comb"
+        old = before.get(r["stage"])
+        if old and old["seconds"] > 0:
+            line += f"  {(r['seconds'] / old['seconds'] - 1) * 100:+6.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000], help="عدد الصفوف (100 - 100000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-width", type=int, default=370)
+    parser.add_argument("--max-width", type=int, default=400)
+    parser.add_argument("--tolerance", type=int, default=5)
+    parser.add_argument("--max-partner", type=int, default=7)
+    parser.add_argument("--pair-mode", choices=["A", "B"], default="B")
+    parser.add_argument("--modes", nargs="+", choices=[m.name for m in GroupingMode], default=[m.name for m in GroupingMode])
+    parser.add_argument("--sorts", nargs="+", choices=[s.name for s in SortType], default=[s.name for s in SortType])
+    parser.add_argument("--suggestion-workers", type=int, default=1, help="1 = تسلسلي (أرقام قابلة للمقارنة)")
+    parser.add_argument("--input-format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument("--skip-write", action="store_true", help="دون مرحلة write_output_excel")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="سجل JSON للنتائج (\"\" لعدم الحفظ)")
+    parser.add_argument("--label", default="", help="وصف التشغيل في السجل")
+    args = parser.parse_args()
+
+    if any(not 100 <= rows <= 100000 for rows in args.rows):
+        parser.error("--rows يجب أن يكون بين 100 و 100000")
+    args.modes = [GroupingMode[m] for m in args.modes]
+    args.sorts = [SortType[s] for s in args.sorts]
+
+    history = load_history(args.history)
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            params = {
+                "rows": rows, "seed": args.seed, "min_width": args.min_width, "max_width": args.max_width,
+                "tolerance": args.tolerance, "max_partner": args.max_partner, "pair_mode": args.pair_mode,
+                "suggestion_workers": args.suggestion_workers, "input_format": args.input_format,
+            }
+            previous = previous_run(history, params)
+            records = run_benchmark(rows, args, workdir)
+            print_records(rows, records, previous)
+            history.append({
+                "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "label": args.label,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": params,
+                "stages": records,
+            })
+
+    if args.history:
+        with open(args.history, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2, ensure_ascii=False)
+        print(f"\nhistory: {args.history} ({len(history)} runs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+مقارنة أداء equal_products_solution_with_tolerance مع البحث التنازلي القديم.
+
+التشغيل من جذر المشروع:
+    python benchmarks/bench_tolerance_solver.py [--cases 20000] [--seed 42]
+
+يتحقق أيضاً من تطابق النتائج (x_candidate, k_max) بين التنفيذين.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from math import ceil, floor
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.group_helpers import equal_products_solution_with_tolerance
+
+
+def legacy_equal_products_solution_with_tolerance(a: List[int],
+                             Xmax: List[int],
+                             delta: int,
+                             path_length_limit: int = 0) -> Tuple[Optional[List[int]], int]:
+    """التنفيذ السابق: عد تنازلي لـ x0 مع فحص كل الأزواج (مرجع للمقارنة فقط)"""
+    n = len(a)
+    if n == 0 or n != len(Xmax):
+        return None, 0
+    if any(ai <= 0 for ai in a):
+        return None, 0
+    if any(xm < 0 for xm in Xmax):
+        return None, 0
+    if n == 1:
+        return [Xmax[0]], Xmax[0]
+
+    a_ref = a[0]
+    x0_max = Xmax[0]
+
+    for i in range(1, n):
+        limit = floor((a[i] * Xmax[i] + delta) / a_ref)
+        x0_max = min(x0_max, limit)
+
+    if path_length_limit > 0:
+        x0_max_by_limit = path_length_limit // a_ref
+        x0_max = min(x0_max, x0_max_by_limit)
+    if x0_max < 0:
+        return None, 0
+
+    for x0 in range(x0_max, -1, -1):
+        target = a_ref * x0
+        x_candidate = [x0]
+        valid = True
+        for i in range(1, n):
+            x_i_min_raw = (target - delta) / a[i]
+            x_i_min = max(0, ceil(x_i_min_raw))
+
+            x_i_max = floor((target + delta) / a[i])
+            x_i = min(x_i_max, Xmax[i])
+            if x_i < x_i_min or x_i < 0:
+                valid = False
+                break
+
+            if abs(a[i] * x_i - target) > delta:
+                valid = False
+                break
+
+            x_candidate.append(x_i)
+
+        if not valid:
+            continue
+
+        all_pairs_valid = True
+        for i in range(n):
+            for j in range(i + 1, n):
+                diff = abs(a[i] * x_candidate[i] - a[j] * x_candidate[j])
+                if diff > delta:
+                    all_pairs_valid = False
+                    break
+            if not all_pairs_valid:
+                break
+        if all_pairs_valid:
+            k_max = x_candidate[0]
+            return x_candidate, k_max
+    return None, 0
+
+
+def make_cases(count: int, seed: int):
+    """حالات عشوائية قريبة من بيانات الإنتاج (ارتفاعات وكميات وهوامش)"""
+    rng = random.Random(seed)
+    heights = [50, 60, 70, 120, 150, 160, 170, 190, 200, 230, 235, 240,
+               250, 285, 300, 350, 370, 400]
+    # إزاحات كود التحضير (A/B/C/D) كما في excel_reader
+    prep_offsets = [0, 8, 6, 1, 3]
+    cases = []
+    for _ in range(count):
+        n = rng.randint(2, 6)
+        a = [rng.choice(heights) + rng.choice(prep_offsets) for _ in range(n)]
+        x_max = [rng.randint(1, 2000) for _ in range(n)]
+        delta = rng.choice([20, 50, 100])
+        limit = rng.choice([0, 0, 5000, 20000])
+        cases.append((a, x_max, delta, limit))
+    return cases
+
+
+def _time(func, cases):
+    start = time.perf_counter()
+    results = [func(a, x_max, delta, limit) for a, x_max, delta, limit in cases]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cases = make_cases(args.cases, args.seed)
+
+    legacy_time, legacy_results = _time(legacy_equal_products_solution_with_tolerance, cases)
+    new_time, new_results = _time(equal_products_solution_with_tolerance, cases)
+
+    mismatches = sum(1 for x, y in zip(legacy_results, new_results) if x != y)
+    solved = sum(1 for _, k in new_results if k > 0)
+
+    print(f"cases:      {len(cases)} (solved: {solved})")
+    print(f"legacy:     {legacy_time:.3f}s")
+    print(f"interval:   {new_time:.3f}s")
+    if new_time > 0:
+        print(f"speedup:    {legacy_time / new_time:.1f}x")
+    print(f"mismatches: {mismatches}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+مقارنة محرك الهادر المتجهي (core.waste_engine) مع حلقات ورقة الهادر القديمة.
+
+التشغيل من جذر المشروع:
+    python benchmarks/bench_waste_engine.py [--groups 20000] [--seed 42]
+
+يتحقق من تطابق هادر العرض وهادر المسارات والنسب لكل مجموعة والإجمالي.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.carpet_used import CarpetUsed
+from models.group_carpet import GroupCarpet
+from core.waste_engine import compute_group_waste
+
+
+def legacy_waste(groups, max_width, total):
+    """حلقات _generate_waste_sheet السابقة (مرجع للمقارنة فقط)"""
+    rows = []
+    total_result = 0
+    for g in groups:
+        sumPathLoss = 0
+        wasteWidth = (max_width - g.total_width()) * g.max_length_ref()
+        for item in g.items:
+            sumPathLoss += (g.max_length_ref() - item.length_ref()) * item.width
+        sumPathLoss += wasteWidth
+        result = sumPathLoss * 100 / (total) if total > 0 else 0
+        total_result += result
+        rows.append((g.total_width(), wasteWidth, g.max_length_ref(), sumPathLoss, f"{round(result, 2)}%"))
+    return rows, f"{round(total_result, 2)}%"
+
+
+def make_groups(count: int, seed: int):
+    rng = random.Random(seed)
+    groups = []
+    for gid in range(count):
+        items = []
+        for k in range(rng.randint(1, 7)):
+            items.append(CarpetUsed(
+                carpet_id=k, width=rng.choice([80, 95, 120, 145, 160, 200]),
+                height=rng.choice([120, 170, 230, 300]), qty_used=rng.randint(1, 40),
+                qty_rem=rng.randint(0, 5), client_order=rng.randint(1, 9),
+            ))
+        groups.append(GroupCarpet(group_id=gid, items=items))
+    return groups
+
+
+def engine_rows(groups, max_width, total):
+    waste = compute_group_waste(groups, max_width, total)
+    percentages = waste.percentage.tolist() if total > 0 else [0] * len(waste)
+    rows = [
+        (w, ww, m, gw, f"{round(p, 2)}%")
+        for w, ww, m, gw, p in zip(
+            waste.total_width.tolist(), waste.waste_width.tolist(),
+            waste.max_length_ref.tolist(), waste.group_waste.tolist(), percentages,
+        )
+    ]
+    return rows, f"{round(sum(percentages, 0), 2)}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groups", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-width", type=int, default=400)
+    args = parser.parse_args()
+
+    groups = make_groups(args.groups, args.seed)
+    total = sum(g.total_area() for g in groups) * 3
+
+    mismatches = 0
+    for t in (0, total):
+        if legacy_waste(groups[:500], args.max_width, t) != engine_rows(groups[:500], args.max_width, t):
+            mismatches += 1
+
+    start = time.perf_counter()
+    legacy = legacy_waste(groups, args.max_width, total)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = engine_rows(groups, args.max_width, total)
+    engine_time = time.perf_counter() - start
+    if legacy != vectorized:
+        mismatches += 1
+
+    print(f"groups:     {args.groups}")
+    print(f"loops:      {legacy_time:.3f}s")
+    print(f"engine:     {engine_time:.3f}s")
+    if engine_time > 0:
+        print(f"speedup:    {legacy_time / engine_time:.1f}x")
+    print(f"mismatches: {mismatches}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
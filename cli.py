@@ -0,0 +1,162 @@
+"""
+تشغيل التجميع من سطر الأوامر دون واجهة (بدون PySide6).
+
+أمثلة:
+    python cli.py orders/*.xlsx --min-width 370 --max-width 400 --tolerance 5
+    python cli.py a.xlsx b.xlsx --mode ALL_COMBINATIONS --sort SORT_BY_WIDTH --output-dir out/
+
+كل ملف يمر بنفس مسار الواجهة (core.pipeline.run_grouping_pipeline)،
+والملفات تُعالج بالتوازي على أنوية المعالج (--jobs).
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.config.run_config import RunConfig
+from core.pipeline import run_grouping_pipeline
+from core.Enums.grouping_mode import GroupingMode
+from core.Enums.sort_type import SortType
+from data_io.table_io import SHEET_FILE_NAMES
+
+
+def output_path_for(input_path: str, output_dir: str = None, output_format: str = None) -> str:
+    """
+    نفس تسمية الواجهة: <الاسم>_processed<الامتداد>.
+    output_format (xlsx/csv/parquet) يغير صيغة الإخراج عن صيغة الإدخال.
+    """
+    base, ext = os.path.splitext(input_path)
+    if output_format:
+        ext = "." + output_format
+    if output_dir:
+        base = os.path.join(output_dir, os.path.basename(base))
+    return f"{base}_processed{ext}"
+
+
+def process_file(input_path: str, output_path: str, config: RunConfig) -> dict:
+    """معالجة ملف واحد وإرجاع ملخص (لا يرفع استثناء)"""
+    start = time.perf_counter()
+    try:
+        groups, remaining, stats = run_grouping_pipeline(
+            input_path=input_path,
+            output_path=output_path,
+            config=config,
+        )
+        return {
+            "input": input_path,
+            "output": output_path,
+            "ok": True,
+            "groups": len(groups),
+            "stats": stats,
+            "seconds": time.perf_counter() - start,
+        }
+    except Exception:
+        return {
+            "input": input_path,
+            "output": output_path,
+            "ok": False,
+            "error": traceback.format_exc(),
+            "seconds": time.perf_counter() - start,
+        }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="تجميع السجاد لملفات Excel دون واجهة رسومية")
+    parser.add_argument("inputs", nargs="+", help="ملفات الطلبيات (xlsx/xls/csv/parquet)")
+    parser.add_argument("--min-width", type=int, required=True)
+    parser.add_argument("--max-width", type=int, required=True)
+    parser.add_argument("--tolerance", type=int, default=5)
+    parser.add_argument("--path-length-limit", type=int, default=0)
+    parser.add_argument("--max-partner", type=int, default=7)
+    parser.add_argument("--mode", choices=[m.name for m in GroupingMode], default=GroupingMode.NO_MAIN_REPEAT.name)
+    parser.add_argument("--sort", choices=[s.name for s in SortType], default=SortType.SORT_BY_QUANTITY.name)
+    parser.add_argument("--auto", action="store_true",
+                        help="تجربة كل تركيبات --mode × --sort بالتوازي واختيار الأفضل (يتجاهل --mode و --sort)")
+    parser.add_argument("--pair-mode", choices=["A", "B"], default="B",
+                        help="A: الكمية زوجية (تُقسم على 2)، B: فردية")
+    parser.add_argument("--unit", choices=["cm", "m", "m2"], default="cm", help="وحدة القياس في ملف الإخراج")
+    parser.add_argument("--streaming", action="store_true",
+                        help="قراءة ملفات xlsx دفعة بدفعة دون تحميل الورقة كاملة (للملفات الكبيرة)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="مجلد الذاكرة المؤقتة للبيانات المحللة (إعادة تشغيل نفس الملف دون قراءة Excel)")
+    parser.add_argument("--cache-max-mb", type=int, default=256, help="الحد الأقصى لحجم الذاكرة المؤقتة")
+    parser.add_argument("--output-format", choices=["xlsx", "csv", "parquet"], default=None,
+                        help="صيغة الإخراج (افتراضياً نفس صيغة الإدخال؛ csv/parquet: ملف لكل ورقة)")
+    parser.add_argument("--sheets", nargs="+", choices=list(SHEET_FILE_NAMES.values()), default=None,
+                        help="الأوراق المطلوبة فقط (افتراضياً كل الأوراق)")
+    parser.add_argument("--engine-stats", action="store_true",
+                        help="جمع عدادات محرك التجميع وإضافة ورقة \"الأداء\" (performance)")
+    parser.add_argument("--profile", action="store_true",
+                        help="كتابة ملفات القياس (cProfile + الذاكرة لكل مرحلة) بجانب ملف الإخراج")
+    parser.add_argument("--output-dir", default=None, help="مجلد الإخراج (افتراضياً بجانب ملف الإدخال)")
+    parser.add_argument("--jobs", type=int, default=0, help="عدد الملفات المعالجة بالتوازي (0 = عدد المعالجات)")
+    parser.add_argument("--suggestion-workers", type=int, default=1,
+                        help="عمليات الاقتراحات لكل ملف (1 = تسلسلي، مناسب مع --jobs)")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    config = RunConfig(
+        min_width=args.min_width,
+        max_width=args.max_width,
+        tolerance=args.tolerance,
+        path_length_limit=args.path_length_limit,
+        max_partner=args.max_partner,
+        grouping_mode=GroupingMode[args.mode],
+        sort_type=SortType[args.sort],
+        pair_mode=args.pair_mode,
+        measurement_unit=args.unit,
+        streaming_input=args.streaming,
+        suggestion_workers=args.suggestion_workers,
+        input_cache_dir=args.cache_dir,
+        input_cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        output_sheets=args.sheets,
+        collect_engine_stats=args.engine_stats,
+        profile_run=args.profile,
+        auto_select=args.auto,
+    )
+    jobs = [(path, output_path_for(path, args.output_dir, args.output_format)) for path in args.inputs]
+    workers = max(1, min(args.jobs or os.cpu_count() or 1, len(jobs)))
+
+    results = []
+    if workers == 1:
+        for input_path, output_path in jobs:
+            results.append(process_file(input_path, output_path, config))
+            _print_result(results[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_file, i, o, config) for i, o in jobs]
+            for future in as_completed(futures):
+                results.append(future.result())
+                _print_result(results[-1])
+
+    failed = [r for r in results if not r["ok"]]
+    print(f"{len(results) - len(failed)}/{len(results)} files processed", flush=True)
+    return 1 if failed else 0
+
+
+def _print_result(result: dict) -> None:
+    if result["ok"]:
+        stats = result["stats"]
+        auto = stats.get("auto")
+        chosen = f", auto: {auto['grouping_mode']}/{auto['sort_type']}" if auto else ""
+        print(
+            f"OK   {result['input']} -> {result['output']} "
+            f"({result['groups']} groups, {stats['utilization_percentage']:.2f}% used{chosen}, {result['seconds']:.1f}s)",
+            flush=True,
+        )
+    else:
+        print(f"FAIL {result['input']}\n{result['error']}", file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
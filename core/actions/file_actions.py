@@ -16,7 +16,7 @@ def generate_output_path(input_path: str)->str:
 def browse_input_lineedit(line_edit_input, line_edit_output):
     path, _ = QFileDialog.getOpenFileName(
         None, "Select Excel File", "",
-        "Excel Files (*.xlsx *.xls);;All Files (*)"
+        "Order Files (*.xlsx *.xls *.csv *.parquet);;Excel Files (*.xlsx *.xls);;All Files (*)"
     )
     if path:
         line_edit_input.setText(path)
@@ -26,10 +26,11 @@ def browse_input_lineedit(line_edit_input, line_edit_output):
 def browse_output_lineedit(line_edit_output):
     path, _ = QFileDialog.getSaveFileName(
         None, "Save Ouput File", "",
-        "Excel Files (*.xlsx *.xls);;All Files (*)"
+        "Excel Files (*.xlsx *.xls);;CSV Files (*.csv);;Parquet Files (*.parquet);;All Files (*)"
     )
     if path:
-        if not path.lower().endswith(('.xlsx', '.xls')):
+        # csv/parquet write one file per sheet next to the chosen path
+        if not path.lower().endswith(('.xlsx', '.xls', '.csv', '.parquet')):
             path += '.xlsx'
         line_edit_output.setText(path)
 
@@ -3,15 +3,20 @@ Configuration Manager
 Handles loading and saving application configuration
 """
 import json
-from PySide6.QtCore import QSettings
 
 class ConfigManager:
     """Manages application configuration using QSettings (Registry/Internal Storage)"""
-    
-    @staticmethod
-    def _get_settings():
-        return QSettings("CutOptimizer", "CutOptimizer")
-    
+
+    _settings = None
+
+    @classmethod
+    def _get_settings(cls):
+        # Imported lazily: only the UI persists settings, the engine never loads Qt
+        if cls._settings is None:
+            from PySide6.QtCore import QSettings
+            cls._settings = QSettings("CutOptimizer", "CutOptimizer")
+        return cls._settings
+
     @classmethod
     def get_value(cls, key, default=None):
         """Gets a specific config value"""
@@ -0,0 +1,58 @@
+"""
+Run Configuration
+Immutable settings for one read → solve → write run
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from core.Enums.grouping_mode import GroupingMode
+from core.Enums.sort_type import SortType
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """
+    All values a run needs, resolved once before it starts.
+
+    The engine and data_io only receive this object (or values from it);
+    QSettings/ConfigManager stay on the UI side for persistence.
+    """
+    min_width: int
+    max_width: int
+    tolerance: int = 0
+    path_length_limit: int = 0
+    max_partner: int = 7
+    grouping_mode: GroupingMode = GroupingMode.NO_MAIN_REPEAT
+    sort_type: SortType = SortType.SORT_BY_QUANTITY
+    # "A" = paired quantities (halved on read, doubled in reports), "B" = single
+    pair_mode: str = "B"
+    # Output unit: "cm", "m" or "m2"
+    measurement_unit: str = "cm"
+    # Read .xlsx input in chunks instead of loading the whole sheet into one DataFrame
+    streaming_input: bool = False
+    # Suggestion process count (None/0 = CPU count, 1 = serial)
+    suggestion_workers: Optional[int] = None
+    # Parsed-input cache directory (None = always parse the input file)
+    input_cache_dir: Optional[str] = None
+    # Size bound for the cache directory; oldest entries are evicted first
+    input_cache_max_bytes: int = 256 * 1024 * 1024
+    # Sheets to write, e.g. ("group_details", "group_summary") (None = all)
+    output_sheets: Optional[Tuple[str, ...]] = None
+    # Grouping-engine counters (core.instrumentation): adds stats["engine"]
+    # and a performance sheet; off by default so the hot paths stay free
+    collect_engine_stats: bool = False
+    # cProfile + per-stage tracemalloc, written next to the output (core.profiling)
+    profile_run: bool = False
+    # Run build_groups in a child process (core.solve_process) so the caller's
+    # process stays responsive; stopping terminates the child immediately.
+    # Ignored when profile_run is set so build_groups shows up in cProfile
+    solve_in_process: bool = False
+    # "Auto": run every GroupingMode x SortType in parallel (core.multi_start) and
+    # keep the best plan; grouping_mode/sort_type are then ignored
+    auto_select: bool = False
+
+    def __post_init__(self):
+        # Normalized once here so readers never need to re-check casing
+        object.__setattr__(self, "pair_mode", str(self.pair_mode or "B").upper())
+        object.__setattr__(self, "measurement_unit", str(self.measurement_unit or "cm"))
+        if self.output_sheets is not None:
+            object.__setattr__(self, "output_sheets", tuple(self.output_sheets))
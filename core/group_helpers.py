@@ -1,8 +1,8 @@
-from typing import List, Optional, Tuple, Iterator
+from typing import Callable, List, Optional, Tuple, Iterator
 from models.carpet import Carpet
-from math import floor, ceil 
-from collections import Counter
-from itertools import combinations, combinations_with_replacement
+from core import instrumentation
+from math import floor
+from functools import lru_cache
 
 # ------------------------
 # 1️⃣ توابع رياضية مساعدة
@@ -32,23 +32,61 @@ def lcm_list(lst: List[int])->int:
         result = lcm(result, num)
     return result
 
+# ------------------------
+# ذاكرة مؤقتة للجزء المعتمد على الارتفاعات
+# ------------------------
+
+EQUAL_PRODUCTS_CACHE_SIZE = 4096
+
+HeightProfile = Optional[Tuple[int, int, Tuple[int, ...], Tuple[int, ...]]]
+
+def _height_profile(a: Tuple[int, ...]) -> HeightProfile:
+    """
+    الجزء الذي يعتمد على الارتفاعات فقط في equal_products_solution.
+    ترجع (g, l, A, multipliers) حيث A الارتفاعات مقسومة على g،
+    و l المضاعف المشترك الأصغر لـ A، و multipliers[i] = l // A[i].
+    ترجع None إذا لم يكن هناك حل ممكن لهذه الارتفاعات.
+    """
+    g = gcd_list(list(a))
+    if g == 0:
+        return None
+    A = tuple(ai // g for ai in a)
+
+    l = lcm_list(list(A))
+    if l == 0:
+        return None
+
+    multipliers = tuple(l // Ai if Ai else 0 for Ai in A)
+    return g, l, A, multipliers
+
+def new_height_profile_cache(maxsize: int = EQUAL_PRODUCTS_CACHE_SIZE) -> Callable[[Tuple[int, ...]], HeightProfile]:
+    """
+    ذاكرة مؤقتة محدودة لـ _height_profile خاصة بتشغيل واحد (build_groups)،
+    فلا تتشارك التشغيلات المتزامنة في الخيوط ذاكرة واحدة ولا يفرغها أحدها
+    على الآخر. cache_info() على الدالة المرجعة يعطي عدادات الضبط.
+    """
+    return lru_cache(maxsize=maxsize)(_height_profile)
+
 # ------------------------
 # 2️⃣ تابع اختيار n شركاء
 # ------------------------
 
-def equal_products_solution(a: List[int], Xmax:List[int], path_length_limit: int = 0)->Tuple[Optional[List[int]], int]:
+def equal_products_solution(
+        a: List[int],
+        Xmax:List[int],
+        path_length_limit: int = 0,
+        height_profile: Optional[Callable[[Tuple[int, ...]], HeightProfile]] = None,
+    )->Tuple[Optional[List[int]], int]:
+    """height_profile: ذاكرة التشغيل من new_height_profile_cache (دون ذاكرة إذا لم تُمرر)"""
     n = len(a)
     if n == 0 or n!=len(Xmax):
         return None,0
-    g = gcd_list(a)
-    if g == 0:
-        return None, 0
-    A = [ai // g for ai in a]
 
-    l = lcm_list(A)
-    if l == 0:
+    profile = (height_profile or _height_profile)(tuple(a))
+    if profile is None:
         return None, 0
-    
+    g, l, A, multipliers = profile
+
     limits = []
     for Ai, Xmi in zip(A, Xmax):
         if Ai == 0:
@@ -73,10 +111,8 @@ def equal_products_solution(a: List[int], Xmax:List[int], path_length_limit: int
     if k_max <= 0:
         return None, 0
 
-    x_list = []
-    for Ai in A:
-        xi = (l * k_max) // Ai
-        x_list.append(int(xi))
+    # l * k_max // Ai == (l // Ai) * k_max لأن Ai يقسم l
+    x_list = [m * k_max for m in multipliers]
     
     return x_list, k_max
 
@@ -84,6 +120,17 @@ def equal_products_solution_with_tolerance(a: List[int],
                              Xmax:List[int],
                              delta : int,
                              path_length_limit: int = 0)->Tuple[Optional[List[int]], int]:
+    """
+    إيجاد أكبر x0 (كمية العنصر المرجعي) بحيث تقع أطوال كل المسارات
+    a[i] * x[i] ضمن هامش delta من الطول المرجعي T = a[0] * x0 ومن بعضها.
+
+    الأطوال الممكنة لكل عنصر متتالية حسابية (مضاعفات a[i] حتى Xmax[i])،
+    فيُختار x[i] كأكبر مضاعف ضمن المجال [T - delta, T + delta]، ويكفي
+    فحص الفرق بين أطول وأقصر مسار (O(n)) بدلاً من فحص كل الأزواج.
+    عند الفشل لا يُنقص x0 بواحد، بل يُقفز مباشرة إلى أكبر x0 يمكن أن
+    يتقاطع عنده المجال مع متتالية العنصر المسبب للفشل.
+    النتيجة مطابقة للعد التنازلي الكامل (x_candidate, k_max).
+    """
     n = len(a)
     if n == 0 or n!=len(Xmax):
         return None,0
@@ -98,101 +145,167 @@ def equal_products_solution_with_tolerance(a: List[int],
     x0_max = Xmax[0]
 
     for i in range(1, n):
-        limit = floor((a[i] * Xmax[i] + delta) /a_ref )
+        limit = (a[i] * Xmax[i] + delta) // a_ref
         x0_max = min(x0_max,limit)
     
     if path_length_limit > 0:
         x0_max_by_limit = path_length_limit // a_ref
         x0_max = min(x0_max, x0_max_by_limit)
-    if x0_max < 0:
+    if x0_max < 0 or delta < 0:
         return None, 0  
 
-    for x0 in range(x0_max, -1, -1):
+    items = list(zip(a[1:], Xmax[1:]))
+    x0 = x0_max
+    while x0 >= 0:
         target = a_ref * x0
-        x_candidate = [x0]
-        valid = True
-        for i in range(1, n):
-            x_i_min_raw = (target - delta) / a[i]
-            x_i_min = max(0, ceil(x_i_min_raw))
-
-            x_i_max = floor((target + delta) / a[i])
-            x_i = min(x_i_max, Xmax[i])
-            if x_i < x_i_min or x_i < 0:
-                valid = False
-                break
+        upper = target + delta
+        lower = target - delta
+        longest = shortest = target
+        longest_height = a_ref
 
-            if abs(a[i] * x_i - target) > delta:
-                valid = False
+        for a_i, x_max_i in items:
+            length = a_i * min(upper // a_i, x_max_i)
+            if length < lower:
                 break
+            if length > longest:
+                longest = length
+                longest_height = a_i
+            elif length < shortest:
+                shortest = length
+        else:
+            if longest - shortest <= delta:
+                x_candidate = [x0] + [min(upper // a_i, x_max_i) for a_i, x_max_i in items]
+                return x_candidate, x0
 
-            x_candidate.append(x_i)
-        
-        if not valid:
+            # الأطوال لا تزيد عند إنقاص x0، لذا يجب أن ينزل الطول المرجعي
+            # وأطول مسار إلى shortest + delta قبل أي حل ممكن
+            ceiling = shortest + delta
+            x0 = min(x0 - 1, ceiling // a_ref)
+            if longest > target:
+                next_multiple = (ceiling // longest_height + 1) * longest_height
+                x0 = min(x0, (next_multiple - delta - 1) // a_ref)
             continue
 
-        all_pairs_valid = True
-        for i in range(n):
-            for j in range(i + 1, n):
-                diff = abs(a[i] * x_candidate[i] - a[j] * x_candidate[j])
-                if diff > delta:
-                    all_pairs_valid = False
-                    break
-            if not all_pairs_valid:
-                break
-        if all_pairs_valid:
-            k_max = x_candidate[0]
-            return x_candidate, k_max
+        # لا يوجد مضاعف لـ a[i] ضمن المجال قبل أن ينزل
+        # الطول المرجعي إلى length + delta
+        x0 = (length + delta) // a_ref
     return None, 0
 
 
-def generate_combinations(candidates: List[Carpet], n: int)-> Iterator[List[Carpet]]:
-    for combo in combinations(candidates, n):
-        yield list(combo)
+def _width_bounded_combinations(
+        candidates: List[Carpet],
+        n: int,
+        min_total: int,
+        max_total: int,
+        allow_repetition: bool,
+    )-> Iterator[List[Carpet]]:
+    """
+    تعداد متفرع ومحدود (branch-and-bound) لمجموعات من n عنصر
+    بحيث يقع مجموع العروض ضمن [min_total, max_total].
+
+    يحافظ على نفس ترتيب itertools.combinations / combinations_with_replacement
+    لأن ترتيب المجموعات يؤثر على الاستهلاك الجشع لاحقاً.
+    يتم قطع أي بادئة يتجاوز عرضها max_total أو لا يمكنها بلوغ min_total
+    بالخانات المتبقية، باستخدام أصغر/أكبر عرض في ذيل القائمة.
+    """
+    size = len(candidates)
+    if n <= 0 or size == 0:
+        return
+    if not allow_repetition and n > size:
+        return
+
+    widths = [c.width for c in candidates]
+    suffix_min = widths[:] + [0]
+    suffix_max = widths[:] + [0]
+    for i in range(size - 2, -1, -1):
+        suffix_min[i] = min(widths[i], suffix_min[i + 1])
+        suffix_max[i] = max(widths[i], suffix_max[i + 1])
+
+    combo: List[Carpet] = []
+
+    def extend(start: int, slots: int, running: int, last: int, run_length: int):
+        if slots == 0:
+            if min_total <= running:
+                yield list(combo)
+            return
 
-def generate_combinations_with_repetition(candidates: List[Carpet], n: int)->Iterator[List[Carpet]]:
-    for combo in combinations_with_replacement(candidates, n):
-        counts = Counter(c.id for c in combo)
-        valid = True
-        for cid, cnt in counts.items():
-            carpet = next((cand for cand in candidates if cand.id == cid), None)
-            if not carpet or carpet.rem_qty < cnt:
-                valid = False
+        stop = size if allow_repetition else size - slots + 1
+        for j in range(start, stop):
+            # suffix_min لا يتناقص مع j، و suffix_max لا يتزايد،
+            # لذا أول فشل في أي من الحدين يعني فشل كل ما بعده
+            if running + slots * suffix_min[j] > max_total:
+                break
+            if running + slots * suffix_max[j] < min_total:
                 break
-        if valid:
-            yield list(combo)
 
-def generate_combinations_exclude_main(
+            width = widths[j]
+            if running + width > max_total:
+                continue
+
+            count = run_length + 1 if j == last else 1
+            if allow_repetition and candidates[j].rem_qty < count:
+                continue
+
+            combo.append(candidates[j])
+            yield from extend(
+                j if allow_repetition else j + 1,
+                slots - 1,
+                running + width,
+                j,
+                count,
+            )
+            combo.pop()
+
+    yield from extend(0, n, 0, -1, 0)
+
+
+def generate_combinations(
         candidates: List[Carpet],
         n: int,
-        main: Carpet
+        min_total: int = 0,
+        max_total: Optional[int] = None,
+    )-> Iterator[List[Carpet]]:
+    if max_total is None:
+        max_total = sum(c.width for c in candidates)
+    yield from _width_bounded_combinations(candidates, n, min_total, max_total, False)
+
+def generate_combinations_with_repetition(
+        candidates: List[Carpet],
+        n: int,
+        min_total: int = 0,
+        max_total: Optional[int] = None,
     )->Iterator[List[Carpet]]:
+    if max_total is None:
+        max_total = n * max((c.width for c in candidates), default=0)
+    yield from _width_bounded_combinations(candidates, n, min_total, max_total, True)
 
-    filtered_candidates = [
+def _exclude_main_candidates(candidates: List[Carpet], main: Carpet) -> List[Carpet]:
+    return [
         c for c in candidates
         if c.id != main.id and c.is_available() and c.width != main.width
     ]
-    for combo in combinations(filtered_candidates, n):
-        yield list(combo)
+
+def generate_combinations_exclude_main(
+        candidates: List[Carpet],
+        n: int,
+        main: Carpet,
+        min_total: int = 0,
+        max_total: Optional[int] = None,
+    )->Iterator[List[Carpet]]:
+    yield from generate_combinations(
+        _exclude_main_candidates(candidates, main), n, min_total, max_total
+    )
 
 def generate_combinations_with_repetition_exclude_main(
         candidates: List[Carpet],
         n: int,
-        main: Carpet,    
+        main: Carpet,
+        min_total: int = 0,
+        max_total: Optional[int] = None,
     )->Iterator[List[Carpet]]:
-    filtered_candidates = [
-        c for c in candidates
-        if c.id != main.id and c.is_available() and c.width != main.width
-    ]
-    for combo in combinations_with_replacement(filtered_candidates, n):
-        counts= Counter(c.id for c in combo)
-        valid = True
-        for cid, cnt in counts.items():
-            carpet= next((cand for cand in filtered_candidates if cand.id == cid), None)
-            if not carpet or carpet.rem_qty < cnt:
-                valid = False
-                break
-        if valid:
-            yield list(combo)
+    yield from generate_combinations_with_repetition(
+        _exclude_main_candidates(candidates, main), n, min_total, max_total
+    )
 
 def generate_valid_partner_combinations(
         main: Carpet,
@@ -203,28 +316,40 @@ def generate_valid_partner_combinations(
         allow_repetation: bool = False,
         start_index: int =0,
         exclude_main: bool = False,
-    )->List[List[Carpet]]:
-    valid_group = []
+    )->Iterator[List[Carpet]]:
+    """
+    مولّد كسول لمجموعات الشركاء الصالحة.
+    لا يتم التصفية ولا التعداد إلا عند طلب العنصر التالي، بحيث يمكن
+    للمستدعي التوقف فور نفاد السجادة الرئيسية دون بناء كل المجموعات.
+    """
+    pool = candidates[start_index:]
     filtered_candidates = [
-        c for c in candidates[start_index:]
+        c for c in pool
         if c.is_available() and (main.width + c.width) <= max_width
     ]
+    stats = instrumentation.current
+    if stats:
+        stats.record_width_rejects(len(pool) - len(filtered_candidates))
     if not filtered_candidates:
-        return valid_group
+        return
+
+    # نطاق مجموع عروض الشركاء فقط (بدون السجادة الرئيسية)
+    min_total = min_width - main.width
+    max_total = max_width - main.width
 
     if allow_repetation:
         if exclude_main:
-            iterator  = generate_combinations_with_repetition_exclude_main(filtered_candidates, n, main)
+            iterator  = generate_combinations_with_repetition_exclude_main(
+                filtered_candidates, n, main, min_total, max_total)
         else:
-            iterator  = generate_combinations_with_repetition(filtered_candidates, n)
+            iterator  = generate_combinations_with_repetition(
+                filtered_candidates, n, min_total, max_total)
     else:
         if exclude_main:
-            iterator  = generate_combinations_exclude_main(filtered_candidates, n, main)
+            iterator  = generate_combinations_exclude_main(
+                filtered_candidates, n, main, min_total, max_total)
         else:
-            iterator  = generate_combinations(filtered_candidates, n) 
+            iterator  = generate_combinations(
+                filtered_candidates, n, min_total, max_total)
 
-    for partners in iterator :
-        total_width = main.width + sum(p.width for p in partners)
-        if min_width <= total_width <= max_width:
-            valid_group.append(partners)
-    return valid_group
+    yield from iterator
@@ -1,12 +1,19 @@
+import time
 from typing import List, Optional
 from collections import Counter
+from itertools import chain
 from models.carpet import Carpet
 from models.carpet_used import CarpetUsed
 from models.group_carpet import GroupCarpet
+from models.inventory import Inventory, restore_quantities
+from core.width_index import CarpetWidthIndex
+from core.progress import COMBINATIONS_REPORT_EVERY, ProgressCallback
+from core import instrumentation
 from core.group_helpers import (
     generate_valid_partner_combinations,
     equal_products_solution,
-    equal_products_solution_with_tolerance
+    equal_products_solution_with_tolerance,
+    new_height_profile_cache,
 )
 import json, os
 from core.Enums.grouping_mode import GroupingMode
@@ -22,8 +29,18 @@ def build_groups(
         path_length_limit: int = 0,
         selected_mode: GroupingMode = GroupingMode.NO_MAIN_REPEAT,
         selected_sort_type: SortType = SortType.SORT_BY_HEIGHT,
+        progress: Optional[ProgressCallback] = None,
 ) -> List[GroupCarpet]:
+    """
+    progress(unit, done, total) يُبلغ بالسجاد الرئيسي المعالج ("mains")
+    ومستوى الشركاء ("partner_level") والتوافيق المفحوصة ("combinations")،
+    ورفع InterruptedError منه يوقف التجميع فوراً.
+    العدادات (core.instrumentation) تُسجل فقط داخل instrumentation.collect().
+    """
+    stats = instrumentation.current
 
+    # ذاكرة حلول الارتفاعات خاصة بهذا التشغيل (تشغيلات الخيوط المتزامنة لا تتشاركها)
+    height_profile = new_height_profile_cache()
 
     if selected_sort_type== SortType.SORT_BY_WIDTH:
         carpets.sort(key=lambda c: (c.width, c.height, c.qty), reverse=True)
@@ -34,92 +51,123 @@ def build_groups(
 
     group: List[GroupCarpet] = []
     group_id = 1
-    for main in carpets:
-        if not main.is_available():
-            continue
-
-        start_index = 0
-
-        if not selected_sort_type == SortType.SORT_BY_QUANTITY:
-            remaining_width = max_width - main.width
-            
-            start_index = next((j for j, c in enumerate(carpets) if c.width <= remaining_width), None)
-            if start_index is None:
-                single_group = try_create_single_group(
-                    main, min_width, max_width, group_id, path_length_limit
-                )
-                if single_group:
-                    group.append(single_group)
-                    group_id += 1
-                continue
-        current_max_partner = max_partner
-        if min_width >= 370 and min_width <= 400 and main.width <= 70:
-            current_max_partner = 10
-        if min_width >= 470 and main.width <= 60:
-            current_max_partner = 12
-        if main.width <= 40 and main.width >= 30:
-            if min_width >= 370 and min_width <= 400:
-                current_max_partner = 15
-            if min_width >= 470 and min_width <= 500:
-                current_max_partner = 18
-
-        if main.width < 30 :
-            if min_width >= 370 and min_width <= 400:
-                current_max_partner = 18
-            if min_width >= 470 and min_width <= 500:
-                current_max_partner = 21
-
-        partner_level = 1
-        
-        for partner_level in range(1, current_max_partner + 1):
+    # المخزون: الكميات المتبقية في مصفوفة واحدة، والسجاد واجهات عليها
+    inventory = Inventory.from_carpets(carpets)
+    # فهرس العروض: استعلام السجاد المتاح الملائم للعرض المتبقي دون مسح كامل القائمة
+    index = CarpetWidthIndex(inventory)
+    total_mains = len(carpets)
+    try:
+        # (السجادة الرئيسية، بداية معالجتها) لقياس زمنها عند بداية التالية
+        timed_main = None
+        for main_index, main in enumerate(carpets):
+            if timed_main:
+                stats.record_main(timed_main[0], time.perf_counter() - timed_main[1])
+                timed_main = None
+            if progress:
+                progress("mains", main_index, total_mains)
             if not main.is_available():
-                break
-            rem_qty= main.rem_qty
-            new_groups, group_id = generate_and_process_partners(
-                main=main,
-                carpets=carpets,
-                partner_level=partner_level,
-                min_width=min_width,
-                max_width=max_width,
-                tolerance=tolerance,
-                group_id=group_id,
-                path_length_limit=path_length_limit,
-                selected_mode=selected_mode,
-                start_index=start_index
-            )
-            if selected_sort_type == SortType.SORT_BY_QUANTITY:
-                if not new_groups:
-                    main.rem_qty= rem_qty
-                    continue
+                continue
+            if stats:
+                timed_main = (main, time.perf_counter())
 
-            group.extend(new_groups)
+            remaining_width = max_width - main.width
 
-        if selected_mode == GroupingMode.NO_MAIN_REPEAT:
+            if not selected_sort_type == SortType.SORT_BY_QUANTITY:
+                if not index.has_available(remaining_width):
+                    single_group = try_create_single_group(
+                        main, min_width, max_width, group_id, path_length_limit
+                    )
+                    if single_group:
+                        group.append(single_group)
+                        group_id += 1
+                    continue
+            current_max_partner = max_partner
+            if min_width >= 370 and min_width <= 400 and main.width <= 70:
+                current_max_partner = 10
+            if min_width >= 470 and main.width <= 60:
+                current_max_partner = 12
+            if main.width <= 40 and main.width >= 30:
+                if min_width >= 370 and min_width <= 400:
+                    current_max_partner = 15
+                if min_width >= 470 and min_width <= 500:
+                    current_max_partner = 18
+
+            if main.width < 30 :
+                if min_width >= 370 and min_width <= 400:
+                    current_max_partner = 18
+                if min_width >= 470 and min_width <= 500:
+                    current_max_partner = 21
+
+            partner_level = 1
+        
             for partner_level in range(1, current_max_partner + 1):
                 if not main.is_available():
                     break
-
+                if progress:
+                    progress("partner_level", partner_level, current_max_partner)
+                rem_qty= main.rem_qty
                 new_groups, group_id = generate_and_process_partners(
                     main=main,
-                    carpets=carpets,
+                    carpets=index.available_up_to(remaining_width),
                     partner_level=partner_level,
                     min_width=min_width,
                     max_width=max_width,
                     tolerance=tolerance,
                     group_id=group_id,
                     path_length_limit=path_length_limit,
-                    selected_mode=GroupingMode.ALL_COMBINATIONS,
-                    start_index=start_index
+                    selected_mode=selected_mode,
+                    start_index=0,
+                    progress=progress,
+                    height_profile=height_profile,
                 )
+                if selected_sort_type == SortType.SORT_BY_QUANTITY:
+                    if not new_groups:
+                        main.rem_qty= rem_qty
+                        continue
+
                 group.extend(new_groups)
 
-        single_group = try_create_single_group(
-                main, min_width, max_width, group_id, path_length_limit
-            )
+            if selected_mode == GroupingMode.NO_MAIN_REPEAT:
+                for partner_level in range(1, current_max_partner + 1):
+                    if not main.is_available():
+                        break
+                    if progress:
+                        progress("partner_level", partner_level, current_max_partner)
+
+                    new_groups, group_id = generate_and_process_partners(
+                        main=main,
+                        carpets=index.available_up_to(remaining_width),
+                        partner_level=partner_level,
+                        min_width=min_width,
+                        max_width=max_width,
+                        tolerance=tolerance,
+                        group_id=group_id,
+                        path_length_limit=path_length_limit,
+                        selected_mode=GroupingMode.ALL_COMBINATIONS,
+                        start_index=0,
+                        progress=progress,
+                        height_profile=height_profile,
+                    )
+                    group.extend(new_groups)
+
+            single_group = try_create_single_group(
+                    main, min_width, max_width, group_id, path_length_limit
+                )
+
+            if single_group:
+                group.append(single_group)
+                group_id += 1
+
+        if timed_main:
+            stats.record_main(timed_main[0], time.perf_counter() - timed_main[1])
+    finally:
+        # InterruptedError أو أي خطأ: لا يبقى السجاد مرتبطاً بمخزون منتهٍ
+        inventory.detach()
+        if stats:
+            stats.record_height_cache(height_profile.cache_info())
 
-        if single_group:
-            group.append(single_group)
-            group_id += 1
+    if progress:
+        progress("mains", total_mains, total_mains)
 
     for g in group:
         g.sort_items_by_width(reverse= True)
@@ -139,6 +187,8 @@ def generate_and_process_partners(
         path_length_limit: int,
         selected_mode: GroupingMode,
         start_index: int,
+        progress: Optional[ProgressCallback] = None,
+        height_profile=None,
     )->tuple[List[GroupCarpet], int]:
 
     groups: list[GroupCarpet] = []
@@ -146,40 +196,44 @@ def generate_and_process_partners(
     if not main.is_available():
         return groups,group_id
     
-    partner_sets = []
+    exclude_main = selected_mode == GroupingMode.NO_MAIN_REPEAT
 
-    if selected_mode == GroupingMode.NO_MAIN_REPEAT:
-        partner_sets += generate_valid_partner_combinations(
+    # سلسلة مولدات كسولة: لا تُبنى مجموعة الشركاء التالية إلا عند الحاجة
+    partner_sets = chain(
+        generate_valid_partner_combinations(
             main, carpets, partner_level, min_width, max_width,
-            allow_repetation=False, start_index=start_index, exclude_main=True
-        )
-        partner_sets += generate_valid_partner_combinations(
-            main, carpets, partner_level, min_width, max_width,
-            allow_repetation=True, start_index=start_index, exclude_main=True
-        )
-
-    else:
-        partner_sets += generate_valid_partner_combinations(
-            main, carpets, partner_level, min_width, max_width,
-            allow_repetation=False, start_index=start_index
-        )
-        partner_sets += generate_valid_partner_combinations(
+            allow_repetation=False, start_index=start_index, exclude_main=exclude_main
+        ),
+        generate_valid_partner_combinations(
             main, carpets, partner_level, min_width, max_width,
-            allow_repetation=True, start_index=start_index
-        )
+            allow_repetation=True, start_index=start_index, exclude_main=exclude_main
+        ),
+    )
 
+    examined = 0
     for partners in partner_sets:
         if not main.is_available():
             break
+        examined += 1
+        if progress and examined % COMBINATIONS_REPORT_EVERY == 0:
+            progress("combinations", examined, 0)
         result= process_partner_group(
             main, partners, tolerance, group_id,
             min_width= min_width, max_width=max_width,
-            path_length_limit=path_length_limit
+            path_length_limit=path_length_limit,
+            height_profile=height_profile,
         )
         if result:
             new_group, group_id =result
             groups.append(new_group)
 
+    if progress and examined % COMBINATIONS_REPORT_EVERY:
+        # العدد النهائي لهذا الاستدعاء (done = التوافيق المفحوصة منذ بدايته)
+        progress("combinations", examined, 0)
+    stats = instrumentation.current
+    if stats:
+        stats.record_partner_level(partner_level, examined)
+
     return groups, group_id
 
 def process_partner_group(
@@ -190,6 +244,7 @@ def process_partner_group(
     min_width: int,
     max_width: int,
     path_length_limit: int = 0,
+    height_profile=None,
 ) -> Optional[tuple]:
 
     elements = [main] + partners
@@ -213,15 +268,20 @@ def process_partner_group(
     if any(x <= 0 for x in XMax):
         return None
     
+    stats = instrumentation.current
     if tolerance == 0:
-        x_vals, k_max = equal_products_solution(a, XMax, path_length_limit)
+        x_vals, k_max = equal_products_solution(a, XMax, path_length_limit, height_profile)
     else:
         x_vals, k_max = equal_products_solution_with_tolerance(
             a, XMax, tolerance, path_length_limit
         )
     
     if not x_vals or k_max <= 0:
+        if stats:
+            stats.record_solver(_solver_name(tolerance), False)
         return None
+    if stats:
+        stats.record_solver(_solver_name(tolerance), True)
     
     used_items: List[CarpetUsed] = []
     all_valid = True
@@ -270,6 +330,8 @@ def process_partner_group(
     
     if not all_valid or len(used_items) < 2:
         rollback_consumption(rollback_data)
+        if stats:
+            stats.record_rollback()
         return None
     
     new_group = GroupCarpet(group_id=current_group_id, items=used_items)
@@ -277,7 +339,13 @@ def process_partner_group(
         return new_group, current_group_id + 1
     
     rollback_consumption(rollback_data)
+    if stats:
+        stats.record_rollback()
     return None
+
+
+def _solver_name(tolerance: int) -> str:
+    return "equal_products_solution" if tolerance == 0 else "equal_products_solution_with_tolerance"
     
 
 def try_create_single_group(
@@ -326,40 +394,16 @@ def try_create_single_group(
     return single_group
     
 def rollback_consumption(rollback_data):
-    for item in rollback_data:
-        carpet = item["carpet"]
-        qty = item["qty"]
-        consumed_repeated = item["consumed_repeated"]
-        
-        # إرجاع الكمية الرئيسية
-        carpet.rem_qty += qty
-        
-        # إرجاع الكميات من repeated
-        if consumed_repeated and hasattr(carpet, "restore_repeated"):
-            carpet.restore_repeated(consumed_repeated)
-        client_order= carpet.client_order,
-        repeated=result
-
-    single_group = GroupCarpet(
-        group_id=group_id,
-        items=[single_item]
+    # إرجاع الكميات الرئيسية دفعة واحدة
+    restore_quantities(
+        [item["carpet"] for item in rollback_data],
+        [item["qty"] for item in rollback_data],
     )
 
-    if not single_group.is_valid(min_width, max_width):
-        return None
-    
-    carpet.consume(carpet.rem_qty)
-    return single_group
-    
-def rollback_consumption(rollback_data):
     for item in rollback_data:
         carpet = item["carpet"]
-        qty = item["qty"]
         consumed_repeated = item["consumed_repeated"]
-        
-        # إرجاع الكمية الرئيسية
-        carpet.rem_qty += qty
-        
+
         # إرجاع الكميات من repeated
         if consumed_repeated and hasattr(carpet, "restore_repeated"):
-            carpet.restore_repeated(consumed_repeated)
\ No newline at end of file
+            carpet.restore_repeated(consumed_repeated)
@@ -0,0 +1,127 @@
+import heapq
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# عدد أبطأ السجادات الرئيسية المحفوظة في التقرير
+SLOWEST_MAINS = 10
+
+# العدادات الفعالة حالياً؛ None = معطل (الحالة الافتراضية)
+# المسارات الساخنة تقرأ هذا المتغير مرة واحدة لكل استدعاء وتتجاوز كل
+# القياسات عندما يكون None، فلا كلفة تذكر عند التعطيل.
+current: Optional["EngineStats"] = None
+
+
+class EngineStats:
+    """
+    عدادات وأزمنة محرك التجميع لتشغيل واحد لـ build_groups:
+    مجموعات الشركاء المولدة لكل مستوى، المرفوض بفلتر العرض، استدعاءات
+    equal_products_solution* وإخفاقاتها، التراجعات في process_partner_group،
+    زمن كل سجادة رئيسية، وعدادات ذاكرة حلول الارتفاعات لهذا التشغيل.
+    """
+
+    def __init__(self):
+        self.mains = 0
+        self.main_seconds = 0.0
+        self.main_seconds_max = 0.0
+        self._slowest: List[tuple] = []
+        self.partner_calls: Dict[int, int] = {}
+        self.partner_sets: Dict[int, int] = {}
+        self.width_rejects = 0
+        self.solver_calls: Dict[str, int] = {}
+        self.solver_failures: Dict[str, int] = {}
+        self.rollbacks = 0
+        self.height_cache: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    # =========================================================================
+    # التسجيل (يُستدعى من المسارات الساخنة فقط عند التفعيل)
+    # =========================================================================
+
+    def record_main(self, main, seconds: float) -> None:
+        self.mains += 1
+        self.main_seconds += seconds
+        if seconds > self.main_seconds_max:
+            self.main_seconds_max = seconds
+        entry = (seconds, self.mains, main.id, main.width, main.height)
+        if len(self._slowest) < SLOWEST_MAINS:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def record_partner_level(self, level: int, examined: int) -> None:
+        self.partner_calls[level] = self.partner_calls.get(level, 0) + 1
+        self.partner_sets[level] = self.partner_sets.get(level, 0) + examined
+
+    def record_width_rejects(self, rejected: int) -> None:
+        self.width_rejects += rejected
+
+    def record_solver(self, name: str, solved: bool) -> None:
+        self.solver_calls[name] = self.solver_calls.get(name, 0) + 1
+        if not solved:
+            self.solver_failures[name] = self.solver_failures.get(name, 0) + 1
+
+    def record_rollback(self) -> None:
+        self.rollbacks += 1
+
+    def record_height_cache(self, info) -> None:
+        """info: cache_info() لذاكرة new_height_profile_cache الخاصة بالتشغيل"""
+        self.height_cache = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "currsize": info.currsize,
+            "maxsize": info.maxsize,
+        }
+
+    # =========================================================================
+    # التقرير
+    # =========================================================================
+
+    def report(self) -> dict:
+        """تقرير منظم (قيم بسيطة قابلة للتحويل إلى JSON)"""
+        slowest = sorted(self._slowest, reverse=True)
+        return {
+            "seconds": round(self.seconds, 4),
+            "mains": self.mains,
+            "main_seconds_total": round(self.main_seconds, 4),
+            "main_seconds_mean": round(self.main_seconds / self.mains, 6) if self.mains else 0.0,
+            "main_seconds_max": round(self.main_seconds_max, 4),
+            "slowest_mains": [
+                {"id": carpet_id, "width": width, "height": height, "seconds": round(seconds, 4)}
+                for seconds, _, carpet_id, width, height in slowest
+            ],
+            "partner_calls_by_level": dict(sorted(self.partner_calls.items())),
+            "partner_sets_by_level": dict(sorted(self.partner_sets.items())),
+            "partner_sets_total": sum(self.partner_sets.values()),
+            "width_filter_rejects": self.width_rejects,
+            "solver": {
+                name: {"calls": calls, "failures": self.solver_failures.get(name, 0)}
+                for name, calls in sorted(self.solver_calls.items())
+            },
+            "rollbacks": self.rollbacks,
+            "height_profile_cache": dict(self.height_cache),
+        }
+
+
+@contextmanager
+def collect(stats: Optional[EngineStats] = None) -> Iterator[EngineStats]:
+    """
+    تفعيل العدادات داخل الكتلة فقط:
+
+        with instrumentation.collect() as stats:
+            build_groups(...)
+        stats.report()
+
+    العدادات عامة على مستوى العملية، لذا لا تشمل build_groups الذي يعمل
+    في عمليات أخرى (نوافذ الاقتراحات المتوازية).
+    """
+    global current
+    stats = stats or EngineStats()
+    previous = current
+    current = stats
+    try:
+        yield stats
+    finally:
+        current = previous
+        stats.seconds = time.perf_counter() - stats.started
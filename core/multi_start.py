@@ -0,0 +1,215 @@
+"""
+الوضع التلقائي: تشغيل build_groups لكل تركيبة GroupingMode × SortType
+بالتوازي على نسخ مستقلة من السجاد، واختيار الخطة الأفضل.
+
+كل تركيبة تعمل في عملية منفصلة (core.solve_process)، وعدد التركيبات
+المتزامنة max_workers (الافتراضي عدد المعالجات)، فزمن التشغيل على جهاز
+متعدد الأنوية قريب من زمن تشغيل واحد. مع solve_in_process=False (القياس
+بـ core.profiling) تعمل التركيبات تسلسلياً في الخيط الحالي ليظهر
+build_groups في cProfile.
+
+النتيجة = نسبة الاستخدام - نسبة الهدر (نفس حساب ورقة الهادر من
+core.waste_engine)، والأعلى هو المختار؛ عند التساوي تُقدم التركيبة
+الأسبق في AUTO_CANDIDATES.
+"""
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Tuple
+from models.carpet import Carpet
+from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
+from core import instrumentation
+from core.grouping_algorithm import build_groups
+from core.progress import ProgressCallback
+from core.solve_process import apply_solution, build_groups_in_process, pack_carpets, unpack_carpets
+from core.waste_engine import waste_from_metrics
+from core.Enums.grouping_mode import GroupingMode
+from core.Enums.sort_type import SortType
+
+# مدة الانتظار بين فحوص الإيقاف وتحديثات التقدم (ثانية)
+INTERRUPT_POLL_SECONDS = 0.1
+
+# كل التركيبات بترتيب ثابت (ترتيب جدول المقارنة وأولوية التساوي)
+AUTO_CANDIDATES: Tuple[Tuple[GroupingMode, SortType], ...] = tuple(
+    (mode, sort_type) for mode in GroupingMode for sort_type in SortType
+)
+
+
+class AutoSelection:
+    """
+    نتيجة الوضع التلقائي:
+    - groups: مجموعات التركيبة المختارة (السجاد الأصلي مُحدّث بحالتها)
+    - grouping_mode / sort_type: التركيبة المختارة
+    - candidates: صف لكل تركيبة (جدول المقارنة) بقيم بسيطة قابلة لـ JSON
+    - engine_report: عدادات المحرك للتركيبة المختارة (عند التفعيل)
+    """
+
+    def __init__(self, groups, grouping_mode, sort_type, candidates, engine_report=None):
+        self.groups: List[GroupCarpet] = groups
+        self.grouping_mode: GroupingMode = grouping_mode
+        self.sort_type: SortType = sort_type
+        self.candidates: List[dict] = candidates
+        self.engine_report: Optional[dict] = engine_report
+
+    def report(self) -> dict:
+        """ملخص للإحصائيات (stats["auto"])"""
+        return {
+            "grouping_mode": self.grouping_mode.name,
+            "sort_type": self.sort_type.name,
+            "candidates": self.candidates,
+        }
+
+
+def _score_candidate(groups, carpets, originals, max_width) -> dict:
+    """نسبة الاستخدام ونسبة الهدر لنتيجة واحدة (نفس أرقام الواجهة وورقة الهادر)"""
+    remaining = [c for c in carpets if c.rem_qty > 0]
+    metrics = ReportMetrics(groups, remaining, originals)
+    stats = metrics.stats()
+    waste = waste_from_metrics(metrics, max_width)
+    waste_percentage = waste.total_percentage if waste.original_area > 0 else 0.0
+    return {
+        "groups": len(groups),
+        "total_used": stats["total_used"],
+        "total_remaining": stats["total_remaining"],
+        "utilization_percentage": round(stats["utilization_percentage"], 4),
+        "total_waste": waste.total_waste,
+        "waste_percentage": round(waste_percentage, 4),
+        "score": round(stats["utilization_percentage"] - waste_percentage, 4),
+    }
+
+
+def _run_in_processes(run, count, workers, cancelled, check_interrupt, report_all) -> list:
+    """run(i) لكل تركيبة في خيوط، كل خيط ينتظر عمليته فقط والحساب الفعلي في العمليات"""
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {executor.submit(run, i): i for i in range(count)}
+    results = [None] * count
+    try:
+        pending = set(futures)
+        while pending:
+            if check_interrupt:
+                check_interrupt()
+            done, pending = wait(pending, timeout=INTERRUPT_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+            report_all()
+    except BaseException:
+        cancelled.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return results
+
+
+def select_best_plan(
+        carpets: List[Carpet],
+        originals: List[Carpet],
+        min_width: int,
+        max_width: int,
+        max_partner: int = 7,
+        tolerance: int = 0,
+        path_length_limit: int = 0,
+        candidates: Tuple[Tuple[GroupingMode, SortType], ...] = AUTO_CANDIDATES,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        check_interrupt: Optional[Callable[[], None]] = None,
+        collect_engine_stats: bool = False,
+        solve_in_process: bool = True,
+    ) -> AutoSelection:
+    """
+    تشغيل build_groups لكل تركيبة في candidates واختيار الأفضل.
+
+    carpets تبقى دون تغيير أثناء التشغيل (كل تركيبة على نسخة)، ثم تُطبق
+    عليها حالة التركيبة المختارة كما لو شُغل build_groups بها مباشرة.
+    originals (السجاد قبل دمج المكرر) لحساب المساحة ونسبة الاستخدام.
+    progress("mains", done, total) لمجموع السجاد الرئيسي المعالج في كل
+    التركيبات، و check_interrupt يُفحص دورياً؛ عند الإيقاف تُنهى كل العمليات.
+    solve_in_process=False يشغل build_groups لكل تركيبة بالتتابع في الخيط
+    الحالي (دون عمليات ولا خيوط)، ليشمله cProfile عند قياس التشغيل.
+    """
+    values, repeated = pack_carpets(carpets)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(candidates)))
+    mains: List[Tuple[int, int]] = [(0, len(carpets))] * len(candidates)
+    cancelled = threading.Event()
+
+    def stop_requested() -> None:
+        if cancelled.is_set():
+            raise InterruptedError("تم إيقاف العملية يدوياً.")
+
+    def report_all() -> None:
+        if progress:
+            progress("mains", sum(d for d, _ in mains), sum(t for _, t in mains))
+
+    def run(index: int):
+        stop_requested()
+        grouping_mode, sort_type = candidates[index]
+        clone = unpack_carpets(values, repeated)
+        positions = {id(c): i for i, c in enumerate(clone)}
+        build_kwargs = dict(
+            min_width=min_width,
+            max_width=max_width,
+            max_partner=max_partner,
+            tolerance=tolerance,
+            path_length_limit=path_length_limit,
+            selected_mode=grouping_mode,
+            selected_sort_type=sort_type,
+        )
+
+        started = time.perf_counter()
+        if solve_in_process:
+            def report(unit: str, done: int, total: int) -> None:
+                mains[index] = (done, total)
+
+            groups, engine_report = build_groups_in_process(
+                clone,
+                progress=report,
+                check_interrupt=stop_requested,
+                collect_engine_stats=collect_engine_stats,
+                **build_kwargs,
+            )
+        else:
+            # نفس الخيط: الإيقاف والتقدم يُفحصان من داخل build_groups
+            def report(unit: str, done: int, total: int) -> None:
+                if check_interrupt:
+                    check_interrupt()
+                if unit == "mains":
+                    mains[index] = (done, total)
+                    report_all()
+
+            engine_stats = instrumentation.EngineStats() if collect_engine_stats else None
+            with instrumentation.collect(engine_stats) if engine_stats else contextlib.nullcontext():
+                groups = build_groups(clone, progress=report, **build_kwargs)
+            engine_report = engine_stats.report() if engine_stats else None
+        seconds = time.perf_counter() - started
+        order = [positions[id(c)] for c in clone]
+        return groups, clone, order, engine_report, seconds
+
+    if solve_in_process:
+        results = _run_in_processes(run, len(candidates), workers, cancelled, check_interrupt, report_all)
+    else:
+        results = [run(i) for i in range(len(candidates))]
+
+    rows = []
+    for (grouping_mode, sort_type), (groups, clone, _, _, seconds) in zip(candidates, results):
+        row = {"grouping_mode": grouping_mode.name, "sort_type": sort_type.name}
+        row.update(_score_candidate(groups, clone, originals, max_width))
+        row["seconds"] = round(seconds, 3)
+        rows.append(row)
+
+    best = max(range(len(rows)), key=lambda i: (rows[i]["score"], -i))
+    for i, row in enumerate(rows):
+        row["selected"] = i == best
+
+    groups, clone, order, engine_report, _ = results[best]
+    # النسخة مرتبة كما رتبها build_groups: clone[i] هي السجادة رقم order[i]
+    clone_by_position: Dict[int, Carpet] = {order[i]: c for i, c in enumerate(clone)}
+    apply_solution(
+        carpets,
+        order,
+        [c.rem_qty for c in clone],
+        {i: clone_by_position[i].repeated for i in repeated},
+    )
+    grouping_mode, sort_type = candidates[best]
+    return AutoSelection(groups, grouping_mode, sort_type, rows, engine_report)
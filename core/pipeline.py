@@ -0,0 +1,303 @@
+from typing import Callable, ContextManager, List, Optional, Tuple
+from enum import Enum
+import contextlib
+import copy
+import dataclasses
+import os
+from models.carpet import Carpet
+from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
+from data_io.excel_io import write_output_excel
+from data_io.excel_reader import build_carpets, read_input_excel
+from data_io.input_cache import ParsedInputCache, read_input_arrays_cached
+from core.validation import validate_carpets
+from core.grouping_algorithm import build_groups
+from core.solve_process import build_groups_in_process
+from core.multi_start import select_best_plan
+from core.suggestion_engine import generate_suggestions
+from core.progress import PipelineProgress
+from core import instrumentation
+from core.profiling import RunProfiler
+from core.config.run_config import RunConfig
+
+# نهاية كل مرحلة كنسبة من التشغيل كاملاً (build_groups هو الأطول عادة)
+PROGRESS_READ = 5
+PROGRESS_GROUPS = 75
+PROGRESS_SUGGESTIONS = 95
+
+
+def merge_duplicate_carpets(carpets: List[Carpet]) -> List[Carpet]:
+    """
+    دمج السجاد المتطابق في (العرض، الارتفاع) في سجادة واحدة
+    مع حفظ كل أصل في repeated. الكائنات المقروءة لا تتغير.
+    """
+    merged = {}
+
+    for carpet in carpets:
+        key = (carpet.width, carpet.height)
+
+        if key not in merged:
+            merged[key] = carpet
+        else:
+            original = merged[key]
+
+            if not original.repeated:
+                # نسخة سطحية للسجادة المدمجة حتى لا تتغير كميات القائمة الأصلية
+                original = copy.copy(original)
+                original.repeated = []
+                merged[key] = original
+                original.repeated.append({
+                    "id": original.id,
+                    "qty_original":original.qty,
+                    "qty_rem":original.qty,
+                    "qty": 0,
+                    "client_order": original.client_order
+                })
+
+            original.repeated.append({
+                "id": carpet.id,
+                "qty": 0,
+                "qty_original":carpet.qty,
+                "qty_rem":carpet.qty,
+                "client_order": carpet.client_order
+            })
+
+            original.qty += carpet.qty
+            original.rem_qty += carpet.qty
+    return list(merged.values())
+
+
+def run_grouping_pipeline(
+        input_path: str,
+        output_path: str,
+        config: RunConfig,
+        log: Optional[Callable[[str], None]] = None,
+        check_interrupt: Optional[Callable[[], None]] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Tuple[List[GroupCarpet], List[Carpet], dict]:
+    """
+    المسار الكامل لملف واحد: قراءة ← دمج المكرر ← build_groups ←
+    generate_suggestions ← write_output_excel.
+
+    يُستخدم من GroupingWorker (الواجهة) ومن سطر الأوامر (cli.py) دون Qt.
+    كل الإعدادات تأتي من config ولا تتم أي قراءة للإعدادات أثناء التشغيل.
+    log لرسائل التقدم، و check_interrupt يرفع InterruptedError عند الإيقاف.
+    progress يستقبل النسبة المئوية (0-100) المحسوبة من وحدات العمل الفعلية
+    (السجاد الرئيسي في build_groups ثم نوافذ الاقتراحات)، ويُفحص الإيقاف
+    داخل الخوارزمية نفسها وليس فقط بين المراحل.
+    config.auto_select يجرب كل تركيبات الترتيب × طريقة التجميع (core.multi_start)
+    ويكمل بالأفضل، مع stats["auto"] وورقة "مقارنة الخيارات".
+    config.profile_run يكتب ملفات القياس (core.profiling) بجانب ملف الإخراج،
+    حتى عند الإيقاف أو الفشل، ويشغل build_groups في هذه العملية حتى مع
+    solve_in_process ليظهر في cProfile؛ ومع auto_select تعمل التركيبات
+    تسلسلياً في هذا الخيط بدل العمليات المتوازية (select_best_plan
+    بـ solve_in_process=False)، فيطول زمن مرحلة build_groups.
+    يرجع (groups, remaining, stats)، و stats["output_files"] مسارات الملفات
+    المكتوبة فعلاً.
+    """
+    log = log or (lambda message: None)
+    if not config.profile_run:
+        return _run_stages(input_path, output_path, config, log, check_interrupt, progress, _untimed_stage)
+
+    profiler = RunProfiler(output_path, _profile_metadata(input_path, config))
+    profiler.start()
+    status = "failed"
+    try:
+        result = _run_stages(input_path, output_path, config, log, check_interrupt, progress, profiler.stage)
+        status = "ok"
+        return result
+    except InterruptedError:
+        status = "interrupted"
+        raise
+    finally:
+        paths = profiler.stop(status)
+        log(f"🧪 تم حفظ ملفات القياس: {paths[1]}")
+
+
+def _untimed_stage(name: str):
+    return contextlib.nullcontext()
+
+
+def _profile_metadata(input_path: str, config: RunConfig) -> dict:
+    """وصف التشغيل في ملفات القياس (لمقارنة تشغيلات بنفس الإعدادات)"""
+    settings = {
+        field: (value.name if isinstance(value, Enum) else value)
+        for field, value in dataclasses.asdict(config).items()
+    }
+    return {
+        "input": os.path.basename(input_path),
+        "input_bytes": os.path.getsize(input_path) if os.path.exists(input_path) else None,
+        "config": settings,
+        # مع القياس تعمل تركيبات auto_select تسلسلياً في هذا الخيط (زمن build_groups أطول)
+        "auto_select_sequential": config.auto_select,
+    }
+
+
+def _run_stages(
+        input_path: str,
+        output_path: str,
+        config: RunConfig,
+        log: Callable[[str], None],
+        check_interrupt: Optional[Callable[[], None]],
+        progress: Optional[Callable[[int], None]],
+        stage: Callable[[str], ContextManager],
+    ) -> Tuple[List[GroupCarpet], List[Carpet], dict]:
+    # دون progress أو check_interrupt (سطر الأوامر) لا تُمرر أي callbacks للخوارزمية
+    tracker = PipelineProgress(progress, check_interrupt) if (progress or check_interrupt) else None
+    check_interrupt = check_interrupt or (lambda: None)
+
+    check_interrupt()
+    log("📖 بدء قراءة ملف البيانات...")
+
+    with stage("read"):
+        if config.input_cache_dir:
+            cache = ParsedInputCache(config.input_cache_dir, config.input_cache_max_bytes)
+            parsed, hit = read_input_arrays_cached(
+                input_path, cache, pair_mode=config.pair_mode, streaming=config.streaming_input
+            )
+            if hit:
+                log("⚡ تم تحميل البيانات المحللة من الذاكرة المؤقتة")
+            carpets, raw_carpets = build_carpets(parsed)
+        else:
+            # مع streaming_input يُبنى السجاد دفعة بدفعة دون دمج مصفوفات الملف كاملاً
+            carpets, raw_carpets = read_input_excel(
+                input_path, pair_mode=config.pair_mode, streaming=config.streaming_input
+            )
+    log(f"✅ تم قراءة {len(carpets)} نوع من السجاد")
+    if tracker:
+        tracker.set(PROGRESS_READ)
+
+    check_interrupt()
+
+    errs = validate_carpets(carpets)
+    for e in errs:
+        log(f"⚠️ {e}")
+
+    log("🔄 بدء تشكيل المجموعات...")
+
+    # الدمج لا يعدل الكائنات المقروءة، فتبقى القائمة الأصلية كما هي دون نسخ
+    original_carpets = list(carpets)
+
+    check_interrupt()
+
+    with stage("merge_duplicates"):
+        carpets = merge_duplicate_carpets(carpets)
+
+    build_kwargs = dict(
+        min_width=config.min_width,
+        max_width=config.max_width,
+        max_partner=config.max_partner,
+        tolerance=config.tolerance,
+        path_length_limit=config.path_length_limit,
+    )
+    groups_progress = tracker.stage("mains", PROGRESS_READ, PROGRESS_GROUPS) if tracker else None
+    engine_report = None
+    auto = None
+    with stage("build_groups"):
+        if config.auto_select:
+            # كل تركيبات الترتيب × طريقة التجميع بالتوازي، والأفضل يُطبق على carpets
+            auto = select_best_plan(
+                carpets,
+                original_carpets,
+                progress=groups_progress,
+                check_interrupt=check_interrupt,
+                collect_engine_stats=config.collect_engine_stats,
+                # القياس يحتاج build_groups في هذا الخيط ليظهر في cProfile
+                solve_in_process=not config.profile_run,
+                **build_kwargs,
+            )
+            groups, engine_report = auto.groups, auto.engine_report
+        elif config.solve_in_process and not config.profile_run:
+            # الحل في عملية منفصلة؛ هذا الخيط ينتظر التقدم وينهي العملية عند الإيقاف
+            groups, engine_report = build_groups_in_process(
+                carpets,
+                selected_mode=config.grouping_mode,
+                selected_sort_type=config.sort_type,
+                progress=groups_progress,
+                check_interrupt=check_interrupt,
+                collect_engine_stats=config.collect_engine_stats,
+                **build_kwargs,
+            )
+        else:
+            engine_stats = instrumentation.EngineStats() if config.collect_engine_stats else None
+            with instrumentation.collect(engine_stats) if engine_stats else contextlib.nullcontext():
+                groups = build_groups(
+                    carpets=carpets,
+                    selected_mode=config.grouping_mode,
+                    selected_sort_type=config.sort_type,
+                    progress=groups_progress,
+                    **build_kwargs,
+                )
+            if engine_stats:
+                engine_report = engine_stats.report()
+
+    grouping_mode, sort_type = config.grouping_mode, config.sort_type
+    if auto:
+        grouping_mode, sort_type = auto.grouping_mode, auto.sort_type
+        for row in auto.candidates:
+            log(f"   {row['grouping_mode']} / {row['sort_type']}: "
+                f"{row['utilization_percentage']:.2f}% استخدام، {row['waste_percentage']:.2f}% هدر")
+        log(f"🏆 التركيبة المختارة: {grouping_mode.name} / {sort_type.name}")
+    log(f"✅ تم تشكيل {len(groups)} مجموعة")
+
+    check_interrupt()
+    log("📦 حساب المتبقيات...")
+
+    with stage("metrics"):
+        remaining = [c for c in carpets if c.rem_qty > 0]
+
+        # مرور واحد تقرأ منه الإحصائيات وكل أوراق التقرير
+        metrics = ReportMetrics(groups, remaining, original_carpets, raw_carpets)
+        stats = metrics.stats()
+        if engine_report:
+            stats["engine"] = engine_report
+        if auto:
+            stats["auto"] = auto.report()
+
+    check_interrupt()
+
+    with stage("suggestions"):
+        suggested_groups = generate_suggestions(
+            remaining=remaining,
+            min_width=config.min_width,
+            max_width=config.max_width,
+            tolerance= config.tolerance,
+            selected_mode=grouping_mode,
+            selected_sort_type=sort_type,
+            path_length_limit=config.path_length_limit,
+            max_workers=config.suggestion_workers,
+            check_interrupt=check_interrupt,
+            progress=tracker.stage("windows", PROGRESS_GROUPS, PROGRESS_SUGGESTIONS) if tracker else None,
+        )
+    if tracker:
+        tracker.set(PROGRESS_SUGGESTIONS)
+    check_interrupt()
+
+    log("💾 حفظ النتائج...")
+
+    with stage("write"):
+        output_files = write_output_excel(
+            path=output_path,
+            groups=groups,
+            remaining=remaining,
+            min_width=config.min_width,
+            max_width=config.max_width,
+            tolerance_length= config.tolerance,
+            originals=original_carpets,
+            suggested_groups= suggested_groups,
+            raw_originals=raw_carpets,
+            pair_mode=config.pair_mode,
+            measurement_unit=config.measurement_unit,
+            metrics=metrics,
+            sheets=config.output_sheets,
+            engine_report=stats.get("engine"),
+            auto_comparison=auto.candidates if auto else None,
+            )
+
+    # csv/parquet: ملف لكل ورقة بدل output_path نفسه
+    stats["output_files"] = output_files
+
+    if tracker:
+        tracker.set(100)
+    log(f"✅ تم حفظ النتائج في: {', '.join(output_files) or output_path}")
+    return groups, remaining, stats
@@ -0,0 +1,253 @@
+"""
+قياس تشغيل واحد (cProfile + tracemalloc لكل مرحلة) لإرساله للمطور.
+
+عند التفعيل (RunConfig.profile_run) تُكتب ثلاثة ملفات بجانب ملف الإخراج:
+    <الإخراج>.profile.prof   إحصائيات cProfile (pstats / snakeviz)
+    <الإخراج>.profile.txt    ملخص مقروء: المراحل، أعلى الدوال، أعلى التخصيصات
+    <الإخراج>.profile.json   نفس الملخص بمفاتيح ثابتة للمقارنة بين التشغيلات
+
+مسارات الدوال نسبية لجذر المشروع (أو لـ site-packages / المكتبة القياسية)
+فتبقى المفاتيح نفسها بين الأجهزة. للمقارنة:
+    python -m core.profiling old.profile.json new.profile.json
+"""
+import cProfile
+import datetime
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# عدد الدوال والتخصيصات في الملخص
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 10
+# عمق مكدس tracemalloc (1 يكفي للتجميع حسب السطر ويقلل الكلفة)
+TRACEMALLOC_FRAMES = 1
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def profile_base_path(output_path: str) -> str:
+    """المسار المشترك لملفات القياس: ملف الإخراج دون الامتداد + ".profile" """
+    return os.path.splitext(output_path)[0] + ".profile"
+
+
+def _location(filename: str, lineno: int, function: Optional[str] = None) -> str:
+    """مسار قصير ثابت بين الأجهزة: نسبي لجذر المشروع أو لمجلد المكتبات"""
+    path = filename.replace("\\", "/")
+    root = ROOT.replace("\\", "/") + "/"
+    if path.startswith(root):
+        path = path[len(root):]
+    else:
+        for marker in ("/site-packages/", "/dist-packages/", "/lib/python"):
+            index = path.find(marker)
+            if index >= 0:
+                path = path[index + 1:]
+                if marker == "/lib/python":
+                    # lib/python3.x/module.py -> module.py
+                    path = path.split("/", 2)[-1]
+                break
+    location = f"{path}:{lineno}"
+    return f"{location}({function})" if function else location
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+class RunProfiler:
+    """
+    cProfile للتشغيل كاملاً (الخيط الحالي فقط)، و tracemalloc لكل مرحلة:
+    الزمن، ذروة ذاكرة Python داخل المرحلة، وأعلى الأسطر تخصيصاً فيها
+    (الفرق بين لقطتي بداية ونهاية المرحلة).
+    عمليات الاقتراحات المتوازية لا تظهر في cProfile (عمليات منفصلة)؛ يبقى
+    زمن المرحلة صحيحاً. build_groups يعمل دائماً في هذا الخيط عند القياس:
+    run_grouping_pipeline يتجاهل solve_in_process، ومع auto_select يشغل
+    التركيبات تسلسلياً (select_best_plan بـ solve_in_process=False).
+    """
+
+    def __init__(self, output_path: str, metadata: Optional[dict] = None):
+        self.base_path = profile_base_path(output_path)
+        self.metadata = dict(metadata or {})
+        self.stages: List[dict] = []
+        self._profile = cProfile.Profile()
+        self._started = None
+        self._snapshot_seconds = 0.0
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        self._started = time.perf_counter()
+        self._profile.enable()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        # اللقطات خارج cProfile وخارج زمن المرحلة
+        self._profile.disable()
+        snapshot_start = time.perf_counter()
+        before = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        tracemalloc.reset_peak()
+        start_current = tracemalloc.get_traced_memory()[0]
+        self._profile.enable()
+        start = time.perf_counter()
+        self._snapshot_seconds += start - snapshot_start
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._profile.disable()
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            allocations = [
+                {
+                    "location": _location(stat.traceback[0].filename, stat.traceback[0].lineno),
+                    "size_kb": round(stat.size_diff / 1024, 1),
+                    "count": stat.count_diff,
+                }
+                for stat in after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+                if stat.size_diff > 0
+            ]
+            self.stages.append({
+                "stage": name,
+                "seconds": round(seconds, 4),
+                "peak_mb": round((peak - start_current) / (1024 * 1024), 2),
+                "retained_mb": round((current - start_current) / (1024 * 1024), 2),
+                "rss_high_water_mb": _peak_rss_mb(),
+                "top_allocations": allocations,
+            })
+            self._snapshot_seconds += time.perf_counter() - (start + seconds)
+            self._profile.enable()
+
+    def stop(self, status: str = "ok") -> List[str]:
+        """إيقاف القياس وكتابة الملفات الثلاثة؛ يرجع مساراتها"""
+        self._profile.disable()
+        total = time.perf_counter() - self._started if self._started else 0.0
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+        summary = {
+            "version": 1,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "status": status,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "metadata": self.metadata,
+            # دون زمن لقطات tracemalloc (يتغير مع حجم الذاكرة لا مع الخوارزمية)
+            "seconds": round(total - self._snapshot_seconds, 4),
+            "snapshot_seconds": round(self._snapshot_seconds, 4),
+            "stages": self.stages,
+            "top_functions": self._top_functions(),
+        }
+
+        prof_path = self.base_path + ".prof"
+        json_path = self.base_path + ".json"
+        txt_path = self.base_path + ".txt"
+        self._profile.dump_stats(prof_path)
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(format_summary(summary))
+        return [prof_path, txt_path, json_path]
+
+    def _top_functions(self) -> List[dict]:
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, lineno, function), (cc, nc, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                "function": _location(filename, lineno, function),
+                "calls": nc,
+                "tottime": round(tottime, 4),
+                "cumtime": round(cumtime, 4),
+            })
+        rows.sort(key=lambda row: row["cumtime"], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+
+
+def format_summary(summary: dict) -> str:
+    """الملخص المقروء (ملف .profile.txt)"""
+    lines = [
+        f"CutOptimizer profile - {summary['timestamp']} ({summary['status']})",
+        f"python {summary['python']} on {summary['platform']}",
+    ]
+    for key, value in summary.get("metadata", {}).items():
+        lines.append(f"{key}: {value}")
+    lines.append(f"total: {summary['seconds']:.3f}s (+{summary['snapshot_seconds']:.3f}s tracemalloc snapshots)")
+    lines.append("times include cProfile/tracemalloc overhead; compare only with other profiled runs")
+
+    lines += ["", "Stages", f"  {'stage':<20} {'seconds':>10} {'peak MB':>10} {'kept MB':>10} {'RSS MB':>10}"]
+    for stage in summary["stages"]:
+        lines.append(
+            f"  {stage['stage']:<20} {stage['seconds']:>10.3f} {stage['peak_mb']:>10.2f} "
+            f"{stage['retained_mb']:>10.2f} {stage['rss_high_water_mb'] or 0:>10.1f}"
+        )
+
+    lines += ["", "Top functions (cumulative)", f"  {'cumtime':>9} {'tottime':>9} {'calls':>10}  function"]
+    for row in summary["top_functions"]:
+        lines.append(f"  {row['cumtime']:>9.3f} {row['tottime']:>9.3f} {row['calls']:>10}  {row['function']}")
+
+    for stage in summary["stages"]:
+        if not stage["top_allocations"]:
+            continue
+        lines += ["", f"Top allocations - {stage['stage']}"]
+        for alloc in stage["top_allocations"]:
+            lines.append(f"  {alloc['size_kb']:>10.1f} KB {alloc['count']:>9}  {alloc['location']}")
+    return "\n".join(lines) + "\n"
+
+
+def compare_profiles(old: dict, new: dict) -> str:
+    """مقارنة ملخصين (.profile.json): زمن وذروة كل مرحلة وأعلى الدوال"""
+    lines = [f"{'stage':<20} {'old s':>9} {'new s':>9} {'change':>8} {'old MB':>9} {'new MB':>9}"]
+    old_stages: Dict[str, dict] = {s["stage"]: s for s in old["stages"]}
+    for stage in new["stages"]:
+        before = old_stages.get(stage["stage"])
+        if not before:
+            continue
+        change = (stage["seconds"] / before["seconds"] - 1) * 100 if before["seconds"] else 0.0
+        lines.append(
+            f"{stage['stage']:<20} {before['seconds']:>9.3f} {stage['seconds']:>9.3f} {change:>+7.1f}% "
+            f"{before['peak_mb']:>9.2f} {stage['peak_mb']:>9.2f}"
+        )
+
+    old_functions = {row["function"]: row for row in old["top_functions"]}
+    lines += ["", f"{'old cum':>9} {'new cum':>9} {'old calls':>10} {'new calls':>10}  function"]
+    for row in new["top_functions"]:
+        before = old_functions.get(row["function"])
+        if before:
+            lines.append(
+                f"{before['cumtime']:>9.3f} {row['cumtime']:>9.3f} {before['calls']:>10} {row['calls']:>10}  {row['function']}"
+            )
+        else:
+            lines.append(f"{'-':>9} {row['cumtime']:>9.3f} {'-':>10} {row['calls']:>10}  {row['function']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m core.profiling old.profile.json new.profile.json", file=sys.stderr)
+        sys.exit(2)
+    with open(sys.argv[1], encoding="utf-8") as f_old, open(sys.argv[2], encoding="utf-8") as f_new:
+        print(compare_profiles(json.load(f_old), json.load(f_new)))
@@ -0,0 +1,77 @@
+from typing import Callable, Optional
+
+# progress(unit, done, total): تقرير وحدات العمل من داخل الخوارزمية
+#   "mains"        السجاد الرئيسي المعالج في build_groups
+#   "partner_level" مستوى الشركاء الحالي للسجادة الرئيسية (total = أعلى مستوى)
+#   "combinations" التوافيق المفحوصة في generate_and_process_partners (total = 0، غير معروف)
+#   "windows"      نوافذ العرض المنتهية في generate_suggestions
+# يُستدعى أيضاً كنقطة فحص للإيقاف: رفع InterruptedError منه يوقف الخوارزمية.
+ProgressCallback = Callable[[str, int, int], None]
+
+# عدد التوافيق بين كل استدعاءين لـ progress (فحص إيقاف دقيق بتكلفة مهملة)
+COMBINATIONS_REPORT_EVERY = 64
+
+
+class PipelineProgress:
+    """
+    تحويل وحدات العمل لكل مرحلة إلى نسبة مئوية للتشغيل كاملاً.
+
+    كل مرحلة تأخذ مجالاً ثابتاً من النسبة (start..end) وتتقدم داخله حسب
+    done/total للوحدة الرئيسية للمرحلة. كل استدعاء يفحص الإيقاف
+    (check_interrupt)، والنسبة لا تُرسل إلا عند تغيرها ولا تتراجع.
+    """
+
+    def __init__(
+            self,
+            emit: Optional[Callable[[int], None]] = None,
+            check_interrupt: Optional[Callable[[], None]] = None,
+        ):
+        self._emit = emit
+        self._check_interrupt = check_interrupt
+        self.percentage = 0
+
+    def set(self, percentage: int) -> None:
+        if self._check_interrupt:
+            self._check_interrupt()
+        percentage = max(self.percentage, min(100, int(percentage)))
+        if percentage != self.percentage:
+            self.percentage = percentage
+            if self._emit:
+                self._emit(percentage)
+
+    def stage(self, unit: str, start: int, end: int) -> ProgressCallback:
+        """callback لمرحلة واحدة: وحدتها unit تملأ المجال start..end"""
+        def report(reported_unit: str, done: int, total: int) -> None:
+            if reported_unit == unit and total > 0:
+                self.set(start + (end - start) * min(done, total) // total)
+            elif self._check_interrupt:
+                self._check_interrupt()
+        return report
+
+
+class CombinationCounter:
+    """
+    ProgressCallback يعد التوافيق المفحوصة في build_groups بدقة.
+
+    done في "combinations" يبدأ من الصفر مع كل استدعاء لـ
+    generate_and_process_partners، وكل استدعاء يسبقه "partner_level"،
+    فيُضاف العدد الحالي للإجمالي عند أي وحدة أخرى.
+    """
+
+    def __init__(self, forward: Optional[ProgressCallback] = None):
+        self._forward = forward
+        self._total = 0
+        self._current = 0
+
+    def __call__(self, unit: str, done: int, total: int) -> None:
+        if unit == "combinations":
+            self._current = done
+        else:
+            self._total += self._current
+            self._current = 0
+        if self._forward:
+            self._forward(unit, done, total)
+
+    @property
+    def examined(self) -> int:
+        return self._total + self._current
@@ -0,0 +1,182 @@
+"""
+تشغيل build_groups في عملية منفصلة (لتبقى عملية الواجهة للعرض فقط).
+
+السجاد يُرسل للعملية بصيغة مضغوطة (مصفوفة أعداد واحدة + repeated للسجاد
+الذي يملكه)، والتقدم يُبث منها أثناء التشغيل، والنتيجة تعود كصفوف بسيطة
+تُطبق على نفس كائنات Carpet في العملية الأصلية (الترتيب، الكمية المتبقية،
+repeated) فيبقى باقي المسار كما لو شُغل build_groups محلياً.
+الإيقاف ينهي العملية مباشرة (terminate) دون انتظار نهاية حلقة التوافيق.
+"""
+import multiprocessing
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from models.carpet import Carpet
+from models.carpet_used import CarpetUsed
+from models.group_carpet import GroupCarpet
+from core.grouping_algorithm import build_groups
+from core.progress import ProgressCallback
+from core import instrumentation
+
+# مدة الانتظار بين فحوص الإيقاف أثناء عمل العملية (ثانية)
+INTERRUPT_POLL_SECONDS = 0.1
+
+# spawn: العملية لا ترث خيوط Qt ولا حالتها (fork غير آمن مع الخيوط)؛
+# كل العمليات التي تُنشأ أثناء التشغيل (هنا و suggestion_engine) تستخدمه
+SPAWN_CONTEXT = multiprocessing.get_context("spawn")
+
+# أعمدة المصفوفة المرسلة للعملية
+_CARPET_FIELDS = ("id", "width", "height", "qty", "client_order", "qty_original_before_pair_mode", "rem_qty")
+
+
+def pack_carpets(carpets: List[Carpet]) -> Tuple[np.ndarray, Dict[int, list]]:
+    """(مصفوفة n×7 من الأعداد، {الموضع: repeated}) للسجاد الذي يملك repeated فقط"""
+    values = np.array(
+        [[getattr(c, field) for field in _CARPET_FIELDS] for c in carpets],
+        dtype=np.int64,
+    ).reshape(len(carpets), len(_CARPET_FIELDS))
+    repeated = {i: c.repeated for i, c in enumerate(carpets) if c.repeated}
+    return values, repeated
+
+
+def unpack_carpets(values: np.ndarray, repeated: Dict[int, list]) -> List[Carpet]:
+    """سجاد مستقل من ناتج pack_carpets (نسخ جديدة من قوائم repeated وعناصرها)"""
+    carpets = []
+    for i, (carpet_id, width, height, qty, client_order, qty_original, rem_qty) in enumerate(values.tolist()):
+        carpet = Carpet(carpet_id, width, height, qty, client_order, [dict(rep) for rep in repeated.get(i, [])])
+        carpet.qty_original_before_pair_mode = qty_original
+        carpet.rem_qty = rem_qty
+        carpets.append(carpet)
+    return carpets
+
+
+def _pack_groups(groups: List[GroupCarpet]) -> list:
+    return [
+        (g.group_id, [
+            (i.carpet_id, i.width, i.height, i.qty_used, i.qty_rem, i.client_order, i.repeated)
+            for i in g.items
+        ])
+        for g in groups
+    ]
+
+
+def _unpack_groups(packed: list) -> List[GroupCarpet]:
+    return [GroupCarpet(group_id, [CarpetUsed(*item) for item in items]) for group_id, items in packed]
+
+
+def _solve_child(conn, values, repeated, kwargs: dict, collect_stats: bool) -> None:
+    """نقطة دخول العملية: build_groups ثم إرسال النتيجة أو الخطأ عبر conn"""
+    try:
+        carpets = unpack_carpets(values, repeated)
+        positions = {id(c): i for i, c in enumerate(carpets)}
+
+        def report(unit: str, done: int, total: int) -> None:
+            # "mains" فقط: باقي الوحدات كانت نقاط فحص للإيقاف، والإيقاف هنا بإنهاء العملية
+            if unit == "mains":
+                conn.send(("progress", done, total))
+
+        stats = instrumentation.EngineStats() if collect_stats else None
+        if stats:
+            with instrumentation.collect(stats):
+                groups = build_groups(carpets=carpets, progress=report, **kwargs)
+        else:
+            groups = build_groups(carpets=carpets, progress=report, **kwargs)
+
+        # build_groups يرتب القائمة في مكانها ويستهلك منها
+        order = [positions[id(c)] for c in carpets]
+        rem_qty = [c.rem_qty for c in carpets]
+        carpets_repeated = {positions[id(c)]: c.repeated for c in carpets if positions[id(c)] in repeated}
+        conn.send(("result", _pack_groups(groups), order, rem_qty, carpets_repeated,
+                   stats.report() if stats else None))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def build_groups_in_process(
+        carpets: List[Carpet],
+        min_width: int,
+        max_width: int,
+        max_partner: int = 7,
+        tolerance: int = 0,
+        path_length_limit: int = 0,
+        selected_mode=None,
+        selected_sort_type=None,
+        progress: Optional[ProgressCallback] = None,
+        check_interrupt: Optional[Callable[[], None]] = None,
+        collect_engine_stats: bool = False,
+    ) -> Tuple[List[GroupCarpet], Optional[dict]]:
+    """
+    نفس build_groups لكن في عملية منفصلة؛ يرجع (groups, تقرير العدادات أو None).
+
+    carpets تُعدل كما يعدلها build_groups (الترتيب والكميات المتبقية وrepeated).
+    progress("mains", done, total) يصل من العملية أثناء التشغيل، و
+    check_interrupt يُفحص كل INTERRUPT_POLL_SECONDS؛ رفعه InterruptedError
+    (أو من progress) ينهي العملية فوراً ويُعاد رفعه.
+    عند التفعيل تُجمع العدادات (core.instrumentation) داخل العملية.
+    """
+    kwargs = dict(
+        min_width=min_width,
+        max_width=max_width,
+        max_partner=max_partner,
+        tolerance=tolerance,
+        path_length_limit=path_length_limit,
+    )
+    if selected_mode is not None:
+        kwargs["selected_mode"] = selected_mode
+    if selected_sort_type is not None:
+        kwargs["selected_sort_type"] = selected_sort_type
+
+    values, repeated = pack_carpets(carpets)
+    receiver, sender = SPAWN_CONTEXT.Pipe(duplex=False)
+    process = SPAWN_CONTEXT.Process(
+        target=_solve_child,
+        args=(sender, values, repeated, kwargs, collect_engine_stats),
+        daemon=True,
+    )
+    process.start()
+    # نسخة الإرسال تبقى في العملية فقط: موتها يصل هنا كـ EOFError
+    sender.close()
+
+    try:
+        while True:
+            if check_interrupt:
+                check_interrupt()
+            if not receiver.poll(INTERRUPT_POLL_SECONDS):
+                continue
+            try:
+                message = receiver.recv()
+            except EOFError:
+                process.join()
+                raise RuntimeError(f"توقفت عملية التجميع بشكل غير متوقع (exit code {process.exitcode})")
+            if message[0] == "progress":
+                if progress:
+                    progress("mains", message[1], message[2])
+            elif message[0] == "error":
+                raise RuntimeError(f"فشل build_groups في عملية التجميع:\n{message[1]}")
+            else:
+                break
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+
+    _, packed_groups, order, rem_qty, carpets_repeated, engine_report = message
+    apply_solution(carpets, order, rem_qty, carpets_repeated)
+    return _unpack_groups(packed_groups), engine_report
+
+
+def apply_solution(carpets: List[Carpet], order: List[int], rem_qty: List[int], repeated: Dict[int, list]) -> None:
+    """
+    تطبيق نتيجة build_groups المحسوبة على نسخة على carpets نفسها:
+    order مواضع السجاد الأصلية بالترتيب الجديد، و rem_qty بنفس الترتيب،
+    و repeated {الموضع الأصلي: القائمة بعد الاستهلاك}.
+    """
+    original = list(carpets)
+    carpets[:] = [original[i] for i in order]
+    for carpet, remaining in zip(carpets, rem_qty):
+        carpet.rem_qty = remaining
+    for i, carpet_repeated in repeated.items():
+        original[i].repeated[:] = carpet_repeated
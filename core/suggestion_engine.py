@@ -1,11 +1,100 @@
-import copy
-from typing import List
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional, Tuple
 from models.group_carpet import GroupCarpet
 from models.carpet import Carpet
+from models.inventory import InventorySnapshot
 from core.grouping_algorithm import build_groups
+from core.solve_process import SPAWN_CONTEXT
+from core.progress import ProgressCallback
 from core.Enums.grouping_mode import GroupingMode
 from core.Enums.sort_type import SortType
 
+# مدة الانتظار بين فحوص الإيقاف أثناء عمل العمليات (ثانية)
+INTERRUPT_POLL_SECONDS = 0.1
+
+# لقطة السجاد داخل كل عملية عاملة (تُرسل مرة واحدة عند إنشاء العملية)
+_worker_snapshot: Optional[InventorySnapshot] = None
+
+
+def _suggestion_windows(min_width: int, max_width: int, min_remaining_width: int, step: int) -> List[Tuple[int, int]]:
+    """نوافذ العرض (min, max) بنفس ترتيب الإزاحة التنازلية"""
+    windows = []
+    current_min = min_width
+    current_max = max_width
+    while current_max > min_remaining_width:
+        windows.append((current_min, current_max))
+        current_min -= step
+        current_max -= step
+        if current_min < 0:
+            current_min = 0
+    return windows
+
+
+def _init_window_worker(carpets: List[Carpet]) -> None:
+    global _worker_snapshot
+    _worker_snapshot = InventorySnapshot(carpets)
+
+
+def _run_window(
+        snapshot: InventorySnapshot,
+        window: Tuple[int, int],
+        tolerance: int,
+        selected_mode: GroupingMode,
+        selected_sort_type: SortType,
+        path_length_limit: int,
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[GroupCarpet]:
+    current_min, current_max = window
+    # build_groups يرتب القائمة ويستهلك منها، لذا تُعاد الحالة بعد كل نافذة
+    try:
+        return build_groups(
+            carpets= list(snapshot.carpets),
+            min_width= current_min,
+            max_width= current_max,
+            max_partner= 9,
+            tolerance= tolerance,
+            path_length_limit= path_length_limit,
+            selected_mode= selected_mode,
+            selected_sort_type= selected_sort_type,
+            progress= progress,
+        )
+    finally:
+        snapshot.restore()
+
+
+def _run_window_in_worker(window, tolerance, selected_mode, selected_sort_type, path_length_limit):
+    return _run_window(_worker_snapshot, window, tolerance, selected_mode, selected_sort_type, path_length_limit)
+
+
+def _pool_processes(executor: ProcessPoolExecutor) -> list:
+    """
+    عمليات المجموعة العاملة، أو [] إذا تغيرت تفاصيل ProcessPoolExecutor الداخلية
+    (لا توجد واجهة عامة لها؛ عندها يكتفي الإيقاف بإلغاء النوافذ المنتظرة).
+    """
+    try:
+        processes = executor._processes
+        return [p for p in processes.values() if hasattr(p, "terminate")] if processes else []
+    except Exception:
+        return []
+
+
+def _terminate_pool(executor: ProcessPoolExecutor) -> None:
+    """إيقاف المجموعة فوراً: إلغاء النوافذ المنتظرة وإنهاء العمليات العاملة"""
+    processes = _pool_processes(executor)
+    executor.shutdown(wait= False, cancel_futures= True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join()
+
+
+def _resolve_workers(max_workers: Optional[int], windows_count: int) -> int:
+    if not max_workers or max_workers < 1:
+        max_workers = os.cpu_count() or 1
+    return max(1, min(max_workers, windows_count))
+
 
 def generate_suggestions(
         remaining: List[Carpet],
@@ -15,42 +104,87 @@ def generate_suggestions(
         selected_mode: GroupingMode ,
         selected_sort_type: SortType ,
         path_length_limit: int = 0,
-        step: int= 10,    
+        step: int= 10,
+        max_workers: Optional[int] = None,
+        check_interrupt: Optional[Callable[[], None]] = None,
+        progress: Optional[ProgressCallback] = None,
     )->List[List[GroupCarpet]]:
+    """
+    توليد اقتراحات بإزاحة نافذة العرض للأسفل بمقدار step.
 
+    النوافذ مستقلة عن بعضها، لذا تُنفذ في مجموعة عمليات (max_workers،
+    الافتراضي عدد المعالجات، و 1 للتنفيذ التسلسلي). النتائج تُجمع بترتيب
+    النوافذ ثم يُحذف المكرر، فتبقى مطابقة للتنفيذ التسلسلي.
+    check_interrupt يُستدعى دورياً ويُتوقع أن يرفع InterruptedError
+    (مثل GroupingWorker._check_interrupt)، وعندها تُلغى النوافذ المتبقية
+    وتُنهى العمليات العاملة دون انتظار نوافذها الجارية.
+    progress("windows", done, total) يُبلغ بالنوافذ المنتهية؛ في التنفيذ
+    التسلسلي يُمرر أيضاً إلى build_groups كنقطة فحص للإيقاف داخل النافذة.
+    """
     suggestions: List[List[GroupCarpet]]= []
 
     # Filter for carpets that actually have remaining quantity
     active_remaining = [c for c in remaining if c.rem_qty > 0]
-    
+
     if not active_remaining:
         return []
 
     min_remaining_width= min(c.width for c in active_remaining)
-    work_copy= [copy.deepcopy(c) for c in remaining]
 
-    current_min= min_width
-    current_max= max_width
+    windows = _suggestion_windows(min_width, max_width, min_remaining_width, step)
+    if not windows:
+        return []
 
-    while current_max > min_remaining_width:
-        carpets_for_run= [copy.deepcopy(c) for c in work_copy]
+    run_args = (tolerance, selected_mode, selected_sort_type, path_length_limit)
+    workers = _resolve_workers(max_workers, len(windows))
 
-        groups= build_groups(
-            carpets= carpets_for_run,
-            min_width= current_min,
-            max_width= current_max,
-            max_partner= 9,
-            tolerance= tolerance,
-            path_length_limit= path_length_limit,
-            selected_mode= selected_mode,
-            selected_sort_type= selected_sort_type,
+    if workers == 1:
+        # التشغيل على نفس الكائنات مع استعادة حالتها بعد كل نافذة
+        snapshot = InventorySnapshot(remaining)
+        results = []
+        for finished, window in enumerate(windows):
+            if check_interrupt:
+                check_interrupt()
+            window_progress = None
+            if progress:
+                progress("windows", finished, len(windows))
+                # وحدات build_groups داخل النافذة لا تغير عدد النوافذ المنتهية
+                window_progress = lambda unit, done, total, finished=finished: progress("windows", finished, len(windows))
+            results.append(_run_window(snapshot, window, *run_args, window_progress))
+    else:
+        results = [None] * len(windows)
+        executor = ProcessPoolExecutor(
+            max_workers= workers,
+            # spawn كما في solve_process: المجموعة تُنشأ من خيط GroupingWorker
+            mp_context= SPAWN_CONTEXT,
+            initializer= _init_window_worker,
+            initargs= (remaining,),
         )
-        if groups and not groups in suggestions:
-            suggestions.append(groups)
+        try:
+            futures = {
+                executor.submit(_run_window_in_worker, window, *run_args): i
+                for i, window in enumerate(windows)
+            }
+            pending = set(futures)
+            while pending:
+                if check_interrupt:
+                    check_interrupt()
+                done, pending = wait(pending, timeout= INTERRUPT_POLL_SECONDS, return_when= FIRST_COMPLETED)
+                for future in done:
+                    results[futures[future]] = future.result()
+                if progress:
+                    progress("windows", len(windows) - len(pending), len(windows))
+        except BaseException:
+            # cancel_futures يلغي النوافذ التي لم تبدأ فقط، فتُنهى العمليات
+            # العاملة كما ينهي solve_process عمليته عند الإيقاف
+            _terminate_pool(executor)
+            raise
+        executor.shutdown()
 
-        current_min -= step
-        current_max -= step
+    if progress:
+        progress("windows", len(windows), len(windows))
 
-        if current_min < 0:
-            current_min = 0
-    return suggestions
\ No newline at end of file
+    for groups in results:
+        if groups and not groups in suggestions:
+            suggestions.append(groups)
+    return suggestions
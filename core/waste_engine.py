@@ -0,0 +1,101 @@
+from typing import List
+import numpy as np
+from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
+
+
+class WasteResult:
+    """
+    هادر كل المجموعات كمصفوفات (عنصر لكل مجموعة):
+    - waste_width: (max_width - العرض الإجمالي) * المسار المرجعي
+    - path_loss: مجموع (المسار المرجعي - طول المسار) * العرض لعناصر المجموعة
+    - group_waste: waste_width + path_loss
+    - percentage: group_waste * 100 / مساحة الطلبية الأصلية (0 إذا كانت 0)
+    """
+
+    def __init__(self, total_width, max_length_ref, waste_width, path_loss, original_area):
+        self.total_width = total_width
+        self.max_length_ref = max_length_ref
+        self.waste_width = waste_width
+        self.path_loss = path_loss
+        self.group_waste = waste_width + path_loss
+        self.original_area = original_area
+        if original_area > 0:
+            self.percentage = self.group_waste * 100 / original_area
+        else:
+            self.percentage = np.zeros(len(self.group_waste), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.group_waste)
+
+    @property
+    def total_waste(self) -> int:
+        return int(self.group_waste.sum())
+
+    @property
+    def total_percentage(self) -> float:
+        # جمع تسلسلي مثل ورقة الهادر (لا sum الزوجي في NumPy) لنفس التقريب
+        return sum(self.percentage.tolist(), 0)
+
+
+def compute_waste(
+        item_group: np.ndarray,
+        item_width: np.ndarray,
+        item_length_ref: np.ndarray,
+        n_groups: int,
+        max_width: int,
+        original_area: int = 0,
+    ) -> WasteResult:
+    """
+    حساب الهادر لكل المجموعات دفعة واحدة من مصفوفات العناصر المسطحة
+    (item_group رقم مجموعة كل عنصر). المسار المرجعي يُحسب مرة لكل مجموعة.
+    """
+    total_width = np.zeros(n_groups, dtype=np.int64)
+    np.add.at(total_width, item_group, item_width)
+
+    max_length_ref = np.zeros(n_groups, dtype=np.int64)
+    np.maximum.at(max_length_ref, item_group, item_length_ref)
+
+    path_loss = np.zeros(n_groups, dtype=np.int64)
+    np.add.at(path_loss, item_group, (max_length_ref[item_group] - item_length_ref) * item_width)
+
+    waste_width = (max_width - total_width) * max_length_ref
+    return WasteResult(total_width, max_length_ref, waste_width, path_loss, original_area)
+
+
+def compute_group_waste(
+        groups: List[GroupCarpet],
+        max_width: int,
+        original_area: int = 0,
+    ) -> WasteResult:
+    """
+    نفس compute_waste مباشرة من قائمة GroupCarpet، للاستدعاء من الواجهة
+    (معاينة الهادر أثناء تعديل المجموعات أو max_width).
+    """
+    item_group, widths, length_refs = [], [], []
+    for index, g in enumerate(groups):
+        for it in g.items:
+            item_group.append(index)
+            widths.append(it.width)
+            length_refs.append(it.height * it.qty_used)
+
+    return compute_waste(
+        np.asarray(item_group, dtype=np.int64),
+        np.asarray(widths, dtype=np.int64),
+        np.asarray(length_refs, dtype=np.int64),
+        len(groups),
+        max_width,
+        original_area,
+    )
+
+
+def waste_from_metrics(metrics: ReportMetrics, max_width: int) -> WasteResult:
+    """نفس compute_waste من أعمدة ReportMetrics المحسوبة مسبقاً"""
+    return compute_waste(
+        metrics.item_group,
+        metrics.item_width,
+        metrics.item_length_ref,
+        metrics.group_count,
+        max_width,
+        metrics.original_area,
+    )
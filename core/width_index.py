@@ -0,0 +1,62 @@
+from bisect import bisect_right, insort
+from typing import List, Optional, Tuple
+from models.inventory import Inventory
+from models.carpet import Carpet
+
+
+class CarpetWidthIndex:
+    """
+    فهرس مرتب حسب العرض للسجاد المتاح في مخزون (Inventory).
+
+    يسمح باستعلام "السجاد المتاح بعرض <= X" عبر bisect بدلاً من
+    المرور على كامل القائمة لكل سجادة رئيسية ولكل مستوى شركاء.
+    يُحدَّث عند نفاد سجادة أو عودتها عبر Inventory.on_availability_changed،
+    ويعيد النتائج بنفس ترتيب القائمة الأصلية لأن الترتيب يؤثر على التجميع.
+    """
+
+    def __init__(self, inventory: Inventory):
+        self._inventory = inventory
+        self._widths = inventory.widths.tolist()
+        self._keys: List[Tuple[int, int]] = sorted(
+            (width, slot)
+            for slot, (width, rem_qty) in enumerate(zip(self._widths, inventory.rem_qty.tolist()))
+            if rem_qty > 0
+        )
+        self._version = 0
+        self._cache_key: Optional[Tuple[int, int]] = None
+        self._cache_value: List[Carpet] = []
+        inventory.on_availability_changed = self._availability_changed
+
+    def _availability_changed(self, slot: int, available: bool) -> None:
+        key = (self._widths[slot], slot)
+        i = bisect_right(self._keys, key) - 1
+        present = i >= 0 and self._keys[i] == key
+
+        if available and not present:
+            insort(self._keys, key)
+            self._version += 1
+        elif not available and present:
+            del self._keys[i]
+            self._version += 1
+
+    def has_available(self, max_width: int) -> bool:
+        """هل توجد سجادة متاحة بعرض <= max_width"""
+        return bool(self._keys) and self._keys[0][0] <= max_width
+
+    def available_up_to(self, max_width: int) -> List[Carpet]:
+        """
+        السجاد المتاح بعرض <= max_width بنفس ترتيب القائمة الأصلية.
+        النتيجة مخزنة مؤقتاً طالما لم يتغير التوفر، ويجب عدم تعديلها.
+        """
+        cache_key = (max_width, self._version)
+        if cache_key == self._cache_key:
+            return self._cache_value
+
+        end = bisect_right(self._keys, (max_width, len(self._widths)))
+        slots = sorted(slot for _, slot in self._keys[:end])
+        carpets = self._inventory.carpets
+        result = [carpets[slot] for slot in slots]
+
+        self._cache_key = cache_key
+        self._cache_value = result
+        return result
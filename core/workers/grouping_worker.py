@@ -1,15 +1,8 @@
-import copy
 import traceback
 from PySide6.QtCore import QObject, QThread, Signal
-from typing import List
-from models.carpet import Carpet
 
-from data_io.excel_io import read_input_excel, write_output_excel
-from core.validation import validate_carpets
-from core.grouping_algorithm import build_groups
-from core.suggestion_engine import generate_suggestions
-from core.Enums.grouping_mode import GroupingMode
-from core.Enums.sort_type import SortType
+from core.pipeline import run_grouping_pipeline
+from core.config.run_config import RunConfig
 
 class WorkerSignals(QObject):
     progress = Signal(int)
@@ -19,128 +12,26 @@ class WorkerSignals(QObject):
     finished = Signal(bool, str)
 
 class GroupingWorker(QThread):
-    def __init__(self, input_path, output_path,
-                 min_width, max_width, tolerance_len, path_length_limit, cfg):
+    def __init__(self, input_path, output_path, run_config: RunConfig):
         super().__init__()
         self.signals = WorkerSignals()
 
         self.input_path = input_path
         self.output_path = output_path
-        self.min_width = min_width
-        self.max_width = max_width
-        self.tolerance_len = tolerance_len
-        self.path_length_limit = path_length_limit
-        self.cfg = cfg
+        self.run_config = run_config
 
         self._is_interrupted = False
     
     def run(self):
         try:
-            self._check_interrupt()
-            # self.signals.progress.emit(5)
-            self.signals.log.emit("📖 بدء قراءة ملف البيانات...")
-
-            carpets, raw_carpets = read_input_excel(self.input_path)
-            self.signals.log.emit(f"✅ تم قراءة {len(carpets)} نوع من السجاد")
-
-            self._check_interrupt()
-            # self.signals.progress.emit(15)
-
-            errs = validate_carpets(carpets)
-            if errs:
-                for e in errs:
-                    self.signals.log.emit(f"⚠️ {e}")
-            
-            # self.signals.progress.emit(30)
-            self.signals.log.emit("🔄 بدء تشكيل المجموعات...")
-
-            original_carpets = copy.deepcopy(carpets)
-
-            self._check_interrupt()
-
-            carpets = self.merge_duplicate_carpets(carpets)
-            
-            # Debug: Verify parameters being passed to algorithm
-            selected_mode = self.cfg.get("grouping_mode", GroupingMode.NO_MAIN_REPEAT)
-            selected_sort = self.cfg.get("sort_type",SortType.SORT_BY_QUANTITY)
-            
-            groups = build_groups(
-                carpets= carpets,
-                min_width=self.min_width,
-                max_width=self.max_width,
-                max_partner=self.cfg.get("max_partner", 7),
-                tolerance=self.tolerance_len,
-                path_length_limit=self.path_length_limit,
-                selected_mode=selected_mode,
-                selected_sort_type=selected_sort,
+            groups, remaining, stats = run_grouping_pipeline(
+                input_path=self.input_path,
+                output_path=self.output_path,
+                config=self.run_config,
+                log=self.signals.log.emit,
+                check_interrupt=self._check_interrupt,
+                progress=self.signals.progress.emit,
             )
-            
-
-            self.signals.log.emit(f"✅ تم تشكيل {len(groups)} مجموعة")
-            # self.signals.progress.emit(60)
-
-            self._check_interrupt()
-            self.signals.log.emit("📦 حساب المتبقيات...")
-
-            remaining = [c for c in carpets if c.rem_qty > 0]
-
-            total_rem= sum(c.rem_qty for c in remaining)
-            total_original = sum(c.qty for c in original_carpets)
-            total_used = sum(g.total_qty() for g in groups)
-            utilization = (total_used / total_original * 100) if total_original > 0 else 0
-
-            stats = {
-                "total_original": total_original,
-                "total_used": total_used,
-                "total_remaining": total_rem,
-                "utilization_percentage": utilization
-            }    
-
-            # self.signals.progress.emit(80)
-            self._check_interrupt()
-            
-            suggested_groups = generate_suggestions(
-                remaining=remaining,
-                min_width=self.min_width,
-                max_width=self.max_width,
-                tolerance= self.tolerance_len,
-                selected_mode=selected_mode,
-                selected_sort_type=selected_sort,
-                path_length_limit=self.path_length_limit,
-            )
-            self._check_interrupt()
-
-            self.signals.log.emit("💾 حفظ النتائج...")
-
-            # self.signals.progress.emit(80)
-            self._check_interrupt()
-            suggested_groups = generate_suggestions(
-                remaining=remaining,
-                min_width=self.min_width,
-                max_width=self.max_width,
-                tolerance= self.tolerance_len,
-                selected_mode=selected_mode,
-                selected_sort_type=selected_sort,
-                path_length_limit=self.path_length_limit,
-            )
-            self._check_interrupt()
-
-            self.signals.log.emit("💾 حفظ النتائج...")
-
-            write_output_excel(
-                path=self.output_path,
-                groups=groups,
-                remaining=remaining,
-                min_width=self.min_width,
-                max_width=self.max_width,
-                tolerance_length= self.tolerance_len,
-                originals=original_carpets,
-                suggested_groups= suggested_groups,
-                raw_originals=raw_carpets
-                )
-            
-            self.signals.log.emit(f"✅ تم حفظ النتائج في: {self.output_path}")
-            # self.signals.progress.emit(100)
 
             self.signals.data_ready.emit(groups, remaining, stats)
             self.signals.finished.emit(True,"تمت العملية بنجاح ✅")
@@ -160,36 +51,3 @@ class GroupingWorker(QThread):
     def stop(self):
         self._is_interrupted = True
         self.signals.log.emit("⚠️ تم إرسال أمر إيقاف العامل.")
-
-        
-    def merge_duplicate_carpets(self, carpets: List[Carpet]) -> List[Carpet]:
-        merged = {}
-        
-        for carpet in carpets:
-            key = (carpet.width, carpet.height)
-
-            if key not in merged:
-                merged[key] = carpet
-            else:
-                original = merged[key]
-
-                if not original.repeated:
-                    original.repeated.append({
-                        "id": original.id,
-                        "qty_original":original.qty,
-                        "qty_rem":original.qty,
-                        "qty": 0,
-                        "client_order": original.client_order
-                    })
-
-                original.repeated.append({
-                    "id": carpet.id,
-                    "qty": 0,
-                    "qty_original":carpet.qty,
-                    "qty_rem":carpet.qty,
-                    "client_order": carpet.client_order
-                })
-
-                original.qty += carpet.qty
-                original.rem_qty += carpet.qty
-        return list(merged.values())
\ No newline at end of file
@@ -1,6 +1,58 @@
-import pandas as pd
+import colorsys
+from functools import lru_cache
+from typing import List
+
 from xlsxwriter.utility import xl_range
 
+# عدد ألوان القصات؛ القصات تأخذ الألوان بالتناوب فيبقى عدد التنسيقات ثابتاً
+CUT_PALETTE_SIZE = 12
+
+# =============================================================================
+# FORMAT REGISTRY & PALETTE - سجل التنسيقات ولوحة الألوان
+# =============================================================================
+
+class FormatRegistry:
+    """
+    بديل لـ workbook.add_format يعيد نفس كائن Format للخصائص المتطابقة،
+    فلا يتكرر التنسيق في styles.xml مهما زاد عدد الأوراق أو القصات.
+    """
+
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self._formats = {}
+
+    def add_format(self, properties=None):
+        properties = properties or {}
+        key = tuple(sorted(properties.items()))
+        cell_format = self._formats.get(key)
+        if cell_format is None:
+            cell_format = self._formats[key] = self.workbook.add_format(properties)
+        return cell_format
+
+    def __len__(self):
+        return len(self._formats)
+
+
+@lru_cache(maxsize=None)
+def cut_palette(size: int = CUT_PALETTE_SIZE) -> tuple:
+    """ألوان فاتحة متنوعة وقابلة للقراءة (hex) موزعة على دائرة الألوان"""
+    colors = []
+    for i in range(size):
+        # Hue: توزيع متساوي، تشبع بين 0.35 و 0.55، إضاءة بين 0.85 و 0.90
+        hue = i / size
+        saturation = 0.35 + (i % 3) * 0.1
+        lightness = 0.85 + (i % 2) * 0.05
+        r, g, b = colorsys.hls_to_rgb(hue, lightness, saturation)
+        colors.append('#{:02X}{:02X}{:02X}'.format(int(r * 255), int(g * 255), int(b * 255)))
+    return tuple(colors)
+
+
+def cut_color(index: int) -> str:
+    """لون القصة رقم index (بالتناوب على cut_palette)"""
+    palette = cut_palette()
+    return palette[index % len(palette)]
+
+
 # =============================================================================
 # FORMAT CREATION FUNCTIONS - دوال إنشاء التنسيقات
 # =============================================================================
@@ -69,21 +121,21 @@ def _create_summary_row_format(workbook):
 # CONDITIONAL FORMATTING - التنسيق الشرطي
 # =============================================================================
 
-def add_conditional_formatting(writer, worksheet, df: pd.DataFrame) -> None:
+def add_conditional_formatting(workbook, worksheet, columns: List[str], row_count: int) -> None:
     """تمييز الأعمدة مثل الكفاءة بالألوان عند تجاوز القيم 80%."""
     try:
         efficiency_col = None
-        for col_num, col_name in enumerate(df.columns):
+        for col_num, col_name in enumerate(columns):
             if 'كفاءة' in str(col_name):
                 efficiency_col = col_num
                 break
 
         if efficiency_col is not None:
-            worksheet.conditional_format(2, efficiency_col, len(df) + 1, efficiency_col, {
+            worksheet.conditional_format(2, efficiency_col, row_count + 1, efficiency_col, {
                 'type': 'cell',
                 'criteria': '>',
                 'value': 80,
-                'format': writer.book.add_format({
+                'format': workbook.add_format({
                     'bg_color': '#C6EFCE',
                     'font_color': '#006100'
                 })
@@ -92,13 +144,13 @@ def add_conditional_formatting(writer, worksheet, df: pd.DataFrame) -> None:
         pass
 
 
-def _apply_row_highlight_on_selection(writer, worksheet, df):
-    highlight_format = writer.book.add_format({
+def _apply_row_highlight_on_selection(workbook, worksheet, columns: List[str], row_count: int):
+    highlight_format = workbook.add_format({
         'bg_color': '#FFF2CC', 
     })
 
-    last_row = len(df)
-    last_col = len(df.columns) - 1
+    last_row = row_count
+    last_col = len(columns) - 1
     cell_range = xl_range(1, 0, last_row, last_col)
 
     worksheet.conditional_format(cell_range, {
@@ -111,13 +163,20 @@ def _apply_row_highlight_on_selection(writer, worksheet, df):
 # HELPER FUNCTION
 # =============================================================================
 
+SUMMARY_LABELS = frozenset(['المجموع', 'مجموع', 'الإجمالي', 'إجمالي', 'Total', 'TOTAL'])
+
+
 def _is_summary_row(df, row_num):
     """تحقق إذا كان الصف يمثل إجمالي أو مجموع."""
     if row_num >= len(df):
         return False
-    
+
     try:
-        val = str(df.iloc[row_num, 0]).strip()
-        return val in ['المجموع', 'مجموع', 'الإجمالي', 'إجمالي', 'Total', 'TOTAL']
+        return _is_summary_value(df.iloc[row_num, 0])
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+def _is_summary_value(value):
+    """نفس _is_summary_row لقيمة العمود الأول مباشرة."""
+    return str(value).strip() in SUMMARY_LABELS
@@ -1,21 +1,19 @@
 
-import pandas as pd
-from typing import List, Dict, Optional
+from typing import Iterable, List, Optional
 from models.carpet import Carpet
 from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
 
 # استيراد الوحدات المنفصلة
 from .excel_writer import write_output_excel as _write_output_excel
 # استيراد دوال القراءة
-from .excel_reader import (
-    read_input_excel as _read_input_excel,
-)
+from .excel_reader import read_input_excel as _read_input_excel
 
 # =============================================================================
 # MAIN FUNCTIONS
 # =============================================================================
 
-def read_input_excel(path: str, sheet_name: int = 0) -> List[Carpet]:
+def read_input_excel(path: str, sheet_name: int = 0, pair_mode: str = "B", streaming: bool = False) -> List[Carpet]:
     """
     قراءة ملف Excel وتحويله إلى قائمة من كائنات Carpet.
     
@@ -25,6 +23,10 @@ def read_input_excel(path: str, sheet_name: int = 0) -> List[Carpet]:
         مسار ملف Excel
     sheet_name : int, optional
         رقم الورقة (افتراضي: 0)
+    pair_mode : str, optional
+        "A" لتقسيم الكميات على 2 (زوجي)، "B" كما هي (افتراضي)
+    streaming : bool, optional
+        قراءة xlsx دفعة بدفعة لتقليل الذاكرة في الملفات الكبيرة
         
     الإرجاع:
     -------
@@ -36,7 +38,7 @@ def read_input_excel(path: str, sheet_name: int = 0) -> List[Carpet]:
     >>> carpets = read_input_excel("data.xlsx")
     >>> print(f"تم قراءة {len(carpets)} نوع من السجاد")
     """
-    return _read_input_excel(path, sheet_name)
+    return _read_input_excel(path, sheet_name, pair_mode, streaming)
 
 def write_output_excel(
     path: str,
@@ -47,8 +49,14 @@ def write_output_excel(
     tolerance_length: Optional[int] = None,
     originals: Optional[List[Carpet]] = None,
     suggested_groups: Optional[List[List[GroupCarpet]]]= None,
-    raw_originals: Optional[List[Carpet]] = None
-) -> None:
+    raw_originals: Optional[List[Carpet]] = None,
+    pair_mode: str = "B",
+    measurement_unit: str = "cm",
+    metrics: Optional[ReportMetrics] = None,
+    sheets: Optional[Iterable[str]] = None,
+    engine_report: Optional[dict] = None,
+    auto_comparison: Optional[List[dict]] = None,
+) -> List[str]:
     """
     كتابة النتائج إلى ملف Excel.
     
@@ -70,6 +78,24 @@ def write_output_excel(
         البيانات الأصلية للتدقيق
     raw_originals : Optional[List[Carpet]]
         البيانات الخام الأصلية قبل التعديلات
+    pair_mode : str
+        نمط الكميات من إعدادات التشغيل
+    measurement_unit : str
+        وحدة القياس في الملف الناتج
+    metrics : Optional[ReportMetrics]
+        نتيجة التجميع المحسوبة مسبقاً (مشتركة مع إحصائيات الواجهة)
+    sheets : Optional[Iterable[str]]
+        الأوراق المطلوبة فقط (group_details, group_summary, remaining,
+        totals, audit, waste, pair_complement, performance, auto_comparison)، والافتراضي الكل
+    engine_report : Optional[dict]
+        تقرير عدادات المحرك (core.instrumentation) لورقة "الأداء"
+    auto_comparison : Optional[List[dict]]
+        جدول مقارنة الوضع التلقائي (core.multi_start) لورقة "مقارنة الخيارات"
+
+    الإرجاع:
+    -------
+    List[str]
+        مسارات الملفات المكتوبة (ملف لكل ورقة في csv/parquet)
         
     أمثلة:
     -------
@@ -79,7 +105,7 @@ def write_output_excel(
     >>>     remaining=remaining_carpets
     >>> )
     """
-    from .excel_writer import write_output_excel as _write_output_excel
-    _write_output_excel(
-        path, groups, remaining, min_width, max_width,tolerance_length , originals, suggested_groups, raw_originals
+    return _write_output_excel(
+        path, groups, remaining, min_width, max_width,tolerance_length , originals, suggested_groups, raw_originals,
+        pair_mode, measurement_unit, metrics, sheets, engine_report, auto_comparison
     )
\ No newline at end of file
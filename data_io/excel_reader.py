@@ -1,86 +1,352 @@
 import os
+import numpy as np
 import pandas as pd
-from typing import List
+from pandas.io.parsers import TextParser
 from models.data_models import Carpet
-from typing import List, Tuple
-from core.config.config_manager import ConfigManager
+from .table_io import read_input_table, table_format
+from typing import Dict, Iterator, List, Optional, Tuple
 
-def read_input_excel(path: str, sheet_name: int = 0)-> Tuple[List[Carpet], List[Carpet]]:
+# إزاحة الارتفاع حسب كود التحضير
+PREP_OFFSET = {"A": 8, "B": 6, "C": 1, "D": 3}
+
+# مفاتيح مصفوفات parse_orders_frame (وما يخزنه input_cache)
+PARSED_FIELDS = (
+    "raw_id", "raw_client_order", "raw_width", "raw_height", "raw_qty",
+    "id", "client_order", "width", "height", "qty",
+    "qty_original_before_pair_mode", "invalid_rows",
+)
+
+# عدد الصفوف في كل دفعة عند القراءة المتدفقة
+STREAM_CHUNK_ROWS = 20000
+
+
+def read_input_excel(
+        path: str,
+        sheet_name: int = 0,
+        pair_mode: str = "B",
+        streaming: bool = False,
+    )-> Tuple[List[Carpet], List[Carpet]]:
+    """
+    قراءة ملف الطلبيات وإرجاع (processed_carpets, raw_carpets).
+    streaming=True يقرأ ملفات xlsx دفعة بدفعة (iter_input_excel) دون تحميل
+    الورقة كاملة في DataFrame واحد، ويبني السجاد من كل دفعة قبل قراءة
+    التالية؛ ملفات xls تمر دائماً عبر xlrd.
+    ملفات csv و parquet تُقرأ حسب الامتداد (table_io).
+    """
+    if streaming and os.path.exists(path) and _is_xlsx(path):
+        processed_carpets, raw_carpets = [], []
+        for processed, raw in iter_input_excel(path, sheet_name, pair_mode):
+            processed_carpets.extend(processed)
+            raw_carpets.extend(raw)
+        return processed_carpets, raw_carpets
+
+    return build_carpets(read_input_arrays(path, sheet_name, pair_mode, streaming))
+
+
+def read_input_arrays(
+        path: str,
+        sheet_name: int = 0,
+        pair_mode: str = "B",
+        streaming: bool = False,
+    ) -> Dict[str, np.ndarray]:
+    """
+    نفس read_input_excel لكن يرجع مصفوفات parse_orders_frame دون بناء Carpet.
+    مع streaming تُقرأ الورقة دفعة بدفعة ثم تُدمج مصفوفات الدفعات (بضعة
+    أعداد لكل صف)، فالتوفير في عدم تحميل الورقة كاملة وليس في النتيجة.
+    """
     if not os.path.exists(path):
         raise FileExistsError(f"❌ الملف غير موجود: {path}")
-    
+
+    if table_format(path):
+        # CSV/Parquet: نفس ترتيب الأعمدة وقواعد التحليل
+        return parse_orders_frame(read_input_table(path), pair_mode)
+
+    if streaming and _is_xlsx(path):
+        chunks = list(_iter_parsed_chunks(path, sheet_name, pair_mode, STREAM_CHUNK_ROWS))
+        if not chunks:
+            return parse_orders_frame(pd.DataFrame(), pair_mode)
+        return {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+
     try:
         ext= os.path.splitext(path)[1].lower()
         engine = "openpyxl" if ext == ".xlsx" else "xlrd"
         df = pd.read_excel(path, sheet_name=sheet_name, header=None, engine=engine)
     except Exception as e:
         raise Exception(f"فشل في قراءة الملف: {e}")
-    
-    processed_carpets = []
-    raw_carpets = []
-    invalid_rows = []
-
-    prep_offset = {"A": 8, "B": 6, "C": 1, "D": 3}
-    
-    # Get pair_mode from config (set from Processing Configuration)
-    pair_mode = str(ConfigManager.get_value("pair_mode", "B")).upper()
-
-    for idx, row in df.iterrows():
-        try:
-            client_order = int(row[0])
-            width_raw = int(str(row[1]).strip())
-            height_raw = int(str(row[2]).strip())
-            qty_raw = int(row[3])
-            
-            # Save raw carpet data
-            raw_carpet = Carpet(
-                id=idx + 1,
-                width=width_raw,
-                height=height_raw,
-                qty=qty_raw,
-                client_order=client_order
-            )
-            raw_carpets.append(raw_carpet)
-
-            # Determine texture/prep columns based on new format (no A/B column)
-            if len(row) > 6:
-                # Legacy format with extra A/B column present at index 4
-                texture_type = str(row[5]).strip().upper()
-                prep_code = str(row[6]).strip().upper()
-            else:
-                texture_type = str(row[4]).strip().upper() if len(row) > 4 else ""
-                prep_code = str(row[5]).strip().upper() if len(row) > 5 else ""
-
-            # Apply pair_mode to quantity
-            if pair_mode == "A":
-                qty = max(1, qty_raw // 2)
-            else:
-                qty = qty_raw
-
-            width = width_raw
-            height = height_raw
-
-            if prep_code in prep_offset:
-                height += prep_offset[prep_code]
-
-            if texture_type == "B":
-                width, height = height, width
-                
-            if width <= 0 or height <= 0 or qty <= 0:
-                invalid_rows.append(idx + 1)
+
+    return parse_orders_frame(df, pair_mode)
+
+
+def iter_input_excel(
+        path: str,
+        sheet_name: int = 0,
+        pair_mode: str = "B",
+        chunk_size: int = STREAM_CHUNK_ROWS,
+    ) -> Iterator[Tuple[List[Carpet], List[Carpet]]]:
+    """
+    قراءة متدفقة: يرجع (processed, raw) لكل دفعة من chunk_size صفاً
+    عبر مكرر openpyxl للقراءة فقط، فتبقى الذاكرة ثابتة تقريباً
+    ويمكن معالجة أول الصفوف قبل اكتمال قراءة الملف.
+
+    تحويل الخلايا مطابق لـ pd.read_excel، بما فيه الصفوف الفارغة: ما قبل
+    آخر صف غير فارغ يبقى كصف NaN (فيصبح العمود عشرياً كما في pandas)،
+    وما بعده يُحذف. يبقى فرقان لا يمكن تجنبهما دون قراءة الملف كاملاً:
+    أنواع الأعمدة تُستنتج لكل دفعة (صف فارغ أو عدد عشري يؤثر على دفعته
+    فقط)، والصيغة القديمة (أكثر من 6 أعمدة) تُحدد من الصفوف المقروءة حتى
+    الآن. الملفات الأصغر من chunk_size تطابق القراءة الكاملة تماماً.
+    ملفات xls (xlrd) و csv/parquet لا تدعم القراءة المتدفقة فتُرجع كدفعة واحدة.
+    """
+    if not os.path.exists(path):
+        raise FileExistsError(f"❌ الملف غير موجود: {path}")
+
+    if not _is_xlsx(path):
+        yield read_input_excel(path, sheet_name, pair_mode)
+        return
+
+    for parsed in _iter_parsed_chunks(path, sheet_name, pair_mode, chunk_size):
+        yield build_carpets(parsed)
+
+
+def _iter_parsed_chunks(path: str, sheet_name, pair_mode: str, chunk_size: int) -> Iterator[Dict[str, np.ndarray]]:
+    try:
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    except Exception as e:
+        raise Exception(f"فشل في قراءة الملف: {e}")
+
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        sheet.reset_dimensions()
+
+        rows: List[list] = []
+        row_numbers: List[int] = []
+        # الصفوف الفارغة تُضاف فقط عند ظهور صف غير فارغ بعدها (pandas يحذف الفارغ في النهاية)
+        blank_rows: List[int] = []
+        layout_columns = 0
+        for row_number, row in enumerate(sheet.rows):
+            converted = [_convert_cell(cell) for cell in row]
+            while converted and converted[-1] == "":
+                converted.pop()
+            if not converted:
+                blank_rows.append(row_number)
                 continue
 
-            carpet = Carpet(
-                id=idx + 1,
-                width=width,
-                height=height,
-                qty=qty,
-                client_order=client_order
-            )
-            carpet.qty_original_before_pair_mode = qty_raw
-            processed_carpets.append(carpet)
-        except Exception as e:
-            invalid_rows.append(idx + 1)
-            continue
+            for blank_number in blank_rows:
+                rows.append([])
+                row_numbers.append(blank_number)
+            blank_rows = []
+
+            layout_columns = max(layout_columns, len(converted))
+            rows.append(converted)
+            row_numbers.append(row_number)
+            if len(rows) >= chunk_size:
+                yield _parse_chunk(rows, row_numbers, layout_columns, pair_mode)
+                rows, row_numbers = [], []
+
+        if rows:
+            yield _parse_chunk(rows, row_numbers, layout_columns, pair_mode)
+    finally:
+        workbook.close()
+
+
+def _is_xlsx(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() == ".xlsx"
+
+
+def _convert_cell(cell):
+    """نفس تحويل pandas لخلايا openpyxl (الأعداد الصحيحة تبقى int)"""
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    if cell.value is None:
+        return ""
+    elif cell.data_type == TYPE_ERROR:
+        return np.nan
+    elif cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        if value == cell.value:
+            return value
+        return float(cell.value)
+    return cell.value
+
+
+def _parse_chunk(rows: List[list], row_numbers: List[int], layout_columns: int, pair_mode: str):
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    # نفس محلل pd.read_excel: "" والقيم مثل "N/A" تصبح NaN واستنتاج الأنواع لكل عمود
+    df = TextParser(rows, header=None, skip_blank_lines=False).read()
+    df.index = pd.Index(row_numbers)
+    return parse_orders_frame(df, pair_mode, layout_columns)
+
+
+def parse_orders_frame(
+        df: pd.DataFrame,
+        pair_mode: str = "B",
+        layout_columns: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+    """
+    تحليل جدول الطلبيات عموداً بعمود بدل المرور صفاً بصف.
+
+    الأعمدة: أمر العميل، العرض، الارتفاع، الكمية، ثم (النسيج، التحضير)
+    أو (عمود قديم، النسيج، التحضير) في الصيغة القديمة ذات السبعة أعمدة.
+
+    يحافظ على نفس قواعد التحويل السابقة (int للأمر والكمية،
+    int(str(...).strip()) للعرض والارتفاع) ويحدد الصفوف غير الصالحة بقناع منطقي.
+    يرجع مصفوفات raw_* (كل صف قابل للتحويل) و *(للصفوف الصالحة بعد
+    pair_mode وإزاحة التحضير وتبديل النسيج).
+    layout_columns يحدد الصيغة (قديمة أو جديدة) عند تحليل جزء من ملف،
+    والافتراضي عدد أعمدة الجدول.
+    """
+    pair_mode = str(pair_mode).upper()
+    n = len(df)
+    ids = df.index.to_numpy() + 1
+
+    if df.shape[1] < 4:
+        # نفس سلوك الصف الواحد: فشل الوصول للعمود يعني أن كل الصفوف غير صالحة
+        raw_ok = np.zeros(n, dtype=bool)
+        zeros = np.zeros(n, dtype=np.int64)
+        client_order = width_raw = height_raw = qty_raw = zeros
+    else:
+        columns = _effective_columns(df)
+        client_order, co_ok = _parse_int(columns[0])
+        width_raw, w_ok = _parse_int_text(columns[1])
+        height_raw, h_ok = _parse_int_text(columns[2])
+        qty_raw, q_ok = _parse_int(columns[3])
+        raw_ok = co_ok & w_ok & h_ok & q_ok
+
+    if layout_columns is None:
+        layout_columns = df.shape[1]
+    if layout_columns > 6:
+        # الصيغة القديمة: عمود A/B إضافي في الموقع 4
+        texture_type = _text_column(df, 5)
+        prep_code = _text_column(df, 6)
+    else:
+        texture_type = _text_column(df, 4)
+        prep_code = _text_column(df, 5)
+
+    if pair_mode == "A":
+        qty = np.maximum(1, qty_raw // 2)
+    else:
+        qty = qty_raw
+
+    offset = np.zeros(n, dtype=np.int64)
+    for code, value in PREP_OFFSET.items():
+        offset[prep_code == code] = value
+
+    swap = texture_type == "B"
+    width = np.where(swap, height_raw + offset, width_raw)
+    height = np.where(swap, width_raw, height_raw + offset)
+
+    valid = raw_ok & (width > 0) & (height > 0) & (qty > 0)
+
+    return {
+        "raw_id": ids[raw_ok],
+        "raw_client_order": client_order[raw_ok],
+        "raw_width": width_raw[raw_ok],
+        "raw_height": height_raw[raw_ok],
+        "raw_qty": qty_raw[raw_ok],
+        "id": ids[valid],
+        "client_order": client_order[valid],
+        "width": width[valid],
+        "height": height[valid],
+        "qty": qty[valid],
+        "qty_original_before_pair_mode": qty_raw[valid],
+        "invalid_rows": ids[~valid],
+    }
+
+
+def build_carpets(parsed: Dict[str, np.ndarray]) -> Tuple[List[Carpet], List[Carpet]]:
+    """بناء (processed_carpets, raw_carpets) من مصفوفات parse_orders_frame"""
+    raw_carpets = [
+        Carpet(id=i, width=w, height=h, qty=q, client_order=co)
+        for i, co, w, h, q in zip(
+            parsed["raw_id"].tolist(),
+            parsed["raw_client_order"].tolist(),
+            parsed["raw_width"].tolist(),
+            parsed["raw_height"].tolist(),
+            parsed["raw_qty"].tolist(),
+        )
+    ]
+
+    processed_carpets = []
+    for i, co, w, h, q, q_raw in zip(
+            parsed["id"].tolist(),
+            parsed["client_order"].tolist(),
+            parsed["width"].tolist(),
+            parsed["height"].tolist(),
+            parsed["qty"].tolist(),
+            parsed["qty_original_before_pair_mode"].tolist(),
+        ):
+        carpet = Carpet(id=i, width=w, height=h, qty=q, client_order=co)
+        carpet.qty_original_before_pair_mode = q_raw
+        processed_carpets.append(carpet)
 
     return processed_carpets, raw_carpets
+
+
+# =============================================================================
+# COLUMN PARSING - تحويل الأعمدة
+# =============================================================================
+
+def _effective_columns(df: pd.DataFrame) -> List[np.ndarray]:
+    """
+    قيم الأعمدة كما كان iterrows يراها: إذا كانت كل الأعمدة رقمية
+    يُرفع الصف لنوع مشترك (مثلاً float64 إذا وُجد عمود عشري)،
+    وإلا تبقى قيم كل عمود كما هي.
+    """
+    dtypes = list(df.dtypes)
+    if dtypes and all(dt.kind in "iuf" for dt in dtypes):
+        common = np.result_type(*dtypes)
+        return [df.iloc[:, i].to_numpy(dtype=common) for i in range(4)]
+    return [df.iloc[:, i].to_numpy() for i in range(4)]
+
+
+def _parse_int(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """مكافئ int(x) لكل خلية: (القيم، قناع النجاح)"""
+    kind = values.dtype.kind
+    if kind in "iub":
+        return values.astype(np.int64), np.ones(len(values), dtype=bool)
+    if kind == "f":
+        ok = np.isfinite(values)
+        return np.trunc(np.where(ok, values, 0)).astype(np.int64), ok
+    if kind != "O":
+        # تواريخ ومدد زمنية: int() يرفضها
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+    return _parse_cells(values, _int_cell)
+
+
+def _parse_int_text(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """مكافئ int(str(x).strip()) لكل خلية: الأعداد العشرية ("126.0") غير صالحة"""
+    kind = values.dtype.kind
+    if kind in "iu":
+        return values.astype(np.int64), np.ones(len(values), dtype=bool)
+    if kind != "O":
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+    return _parse_cells(values, _int_text_cell)
+
+
+def _parse_cells(values: np.ndarray, convert) -> Tuple[np.ndarray, np.ndarray]:
+    # أعمدة object (نصوص أو قيم مختلطة): تحويل خلية بخلية داخل العمود
+    parsed = [convert(v) for v in values.tolist()]
+    ok = np.fromiter((v is not None for v in parsed), dtype=bool, count=len(parsed))
+    return np.array([v if v is not None else 0 for v in parsed], dtype=np.int64), ok
+
+
+def _int_cell(value):
+    try:
+        return int(value)
+    except Exception:
+        return None
+
+
+def _int_text_cell(value):
+    try:
+        return int(str(value).strip())
+    except Exception:
+        return None
+
+
+def _text_column(df: pd.DataFrame, position: int) -> np.ndarray:
+    """مكافئ str(x).strip().upper() للعمود كاملاً، و "" إذا لم يوجد العمود"""
+    if position >= df.shape[1]:
+        return np.full(len(df), "", dtype=object)
+    return np.array([str(v).strip().upper() for v in df.iloc[:, position].tolist()], dtype=object)
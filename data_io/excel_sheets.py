@@ -49,6 +49,16 @@ from .sheets.suggestion_sheets import (
     _create_pair_complement_sheet
 )
 
+from .sheets.performance_sheet import (
+    _create_performance_sheet,
+    _performance_sheet_table
+)
+
+from .sheets.auto_comparison_sheet import (
+    _create_auto_comparison_sheet,
+    _auto_comparison_sheet_table
+)
+
 
 # إعادة تصدير جميع الدوال للحفاظ على التوافقية
 # Re-export all functions for backward compatibility
@@ -67,5 +77,9 @@ __all__ = [
     '_create_remaining_suggestion_sheet',
     '_create_enhanset_remaining_suggestion_sheet',
     '_generate_detailed_waste_sheet',
-    '_create_pair_complement_sheet'
+    '_create_pair_complement_sheet',
+    '_create_performance_sheet',
+    '_performance_sheet_table',
+    '_create_auto_comparison_sheet',
+    '_auto_comparison_sheet_table'
 ]
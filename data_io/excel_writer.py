@@ -1,10 +1,17 @@
 
+import os
 import pandas as pd
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 from models.carpet import Carpet
 from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
 import traceback
-from core.config.config_manager import ConfigManager
+import xlsxwriter
+from itertools import chain
+
+from .table_io import SHEET_FILE_NAMES, table_format, write_output_tables
+from .sheets.sheet_table import SheetTable
 
 # استيراد دوال إنشاء الصفحات من الملف المنفصل
 from .excel_sheets import (
@@ -14,10 +21,14 @@ from .excel_sheets import (
     _create_totals_sheet,
     _create_audit_sheet,
     _generate_waste_sheet,
-    _create_pair_complement_sheet
+    _create_pair_complement_sheet,
+    _create_performance_sheet,
+    _create_auto_comparison_sheet,
 )
 
 from .excel_formatting import (
+    FormatRegistry,
+    cut_color,
     _create_header_format,
     _create_normal_format,
     _create_number_format,
@@ -25,53 +36,9 @@ from .excel_formatting import (
     _create_border_format_for_first_column,
     add_conditional_formatting,
     _apply_row_highlight_on_selection,
-    _is_summary_row
+    _is_summary_value
 )
 
-# =============================================================================
-# COLOR GENERATION - توليد الألوان
-# =============================================================================
-
-def _generate_readable_colors(num_colors):
-    """
-    توليد ألوان متنوعة وقابلة للقراءة لكل قصة.
-    
-    المعاملات:
-    ----------
-    num_colors : int
-        عدد الألوان المطلوبة
-        
-    Returns:
-    --------
-    list
-        قائمة من الألوان بصيغة hex
-    """
-    import colorsys
-    
-    colors = []
-    for i in range(num_colors):
-        # استخدام HSL لتوليد ألوان متنوعة
-        # Hue: توزيع متساوي على دائرة الألوان
-        hue = i / num_colors
-        # Saturation: تشبع متوسط لألوان هادئة
-        saturation = 0.35 + (i % 3) * 0.1  # تنويع بسيط بين 0.35 و 0.55
-        # Lightness: فاتح للخلفية مع قابلية القراءة
-        lightness = 0.85 + (i % 2) * 0.05  # بين 0.85 و 0.90
-        
-        # تحويل HSL إلى RGB
-        r, g, b = colorsys.hls_to_rgb(hue, lightness, saturation)
-        
-        # تحويل إلى hex
-        hex_color = '#{:02X}{:02X}{:02X}'.format(
-            int(r * 255),
-            int(g * 255),
-            int(b * 255)
-        )
-        colors.append(hex_color)
-    
-    return colors
-
-
 # =============================================================================
 # MAIN FUNCTION - الدالة الرئيسية
 # =============================================================================
@@ -86,7 +53,13 @@ def write_output_excel(
     originals: Optional[List[Carpet]] = None,
     suggested_groups: Optional[List[List[GroupCarpet]]]= None,
     raw_originals: Optional[List[Carpet]] = None,
-) -> None:
+    pair_mode: str = "B",
+    measurement_unit: str = "cm",
+    metrics: Optional[ReportMetrics] = None,
+    sheets: Optional[Iterable[str]] = None,
+    engine_report: Optional[dict] = None,
+    auto_comparison: Optional[List[dict]] = None,
+) -> List[str]:
     """
     كتابة النتائج إلى ملف Excel مع صفحات متعددة.
     
@@ -112,316 +85,303 @@ def write_output_excel(
         البيانات الأصلية للتدقيق
     raw_originals : Optional[List[Carpet]]
         البيانات الخام الأصلية قبل التعديلات
+    pair_mode : str
+        "A" للكميات الزوجية (تُضاعف في التقارير)، "B" للفردية
+    measurement_unit : str
+        وحدة القياس في الملف: "cm" أو "m" أو "m2"
+    metrics : Optional[ReportMetrics]
+        نتيجة التجميع المحسوبة مسبقاً (تُحسب هنا إذا لم تُمرر)
+    sheets : Optional[Iterable[str]]
+        الأوراق المطلوبة فقط (مثل ["group_details", "group_summary"])، والافتراضي الكل
+    engine_report : Optional[dict]
+        تقرير عدادات المحرك (core.instrumentation)؛ عند تمريره تُضاف ورقة "الأداء"
+    auto_comparison : Optional[List[dict]]
+        جدول مقارنة الوضع التلقائي (core.multi_start)؛ عند تمريره تُضاف ورقة "مقارنة الخيارات"
+
+    الإرجاع:
+    -------
+    List[str]
+        مسارات الملفات المكتوبة: [path] لملف Excel، أو ملف لكل ورقة في csv/parquet
     """
-    # إنشاء ورقة تفاصيل المجموعات
-    df1 = _create_group_details_sheet(groups)
-
-    # إنشاء ورقة ملخص المجموعات
-    df2 = _create_group_summary_sheet(groups)
-
-    # إنشاء ورقة السجاد المتبقي
-    df3 = _create_remaining_sheet(remaining)
+    tables = build_output_sheets(
+        groups, remaining, min_width, max_width, originals, raw_originals, pair_mode, measurement_unit, metrics,
+        sheets, engine_report=engine_report, auto_comparison=auto_comparison,
+    )
 
-    # إنشاء ورقة الإجماليات
-    totals_df = _create_totals_sheet(originals, groups, remaining, max_width, raw_originals)
+    if table_format(path):
+        # csv/parquet: ملف مستقل لكل ورقة دون تنسيق Excel
+        return write_output_tables(path, sheet_frames(tables))
 
-    # إنشاء ورقة إحصائيات المجموعات الإضافية
-    waste_df = _generate_waste_sheet(groups, originals, max_width) 
+    _write_all_sheets_to_excel(path, tables)
+    return [path]
 
-    # إنشاء ورقة التدقيق
-    df_audit = _create_audit_sheet(groups, remaining, originals)
 
-    # إنشاء ورقة اقتراح مكمل مباشر لكل عنصر متبقي
-    df_pair_complement = _create_pair_complement_sheet(remaining, min_width, max_width)
+def build_output_sheets(
+    groups: List[GroupCarpet],
+    remaining: List[Carpet],
+    min_width: Optional[int] = None,
+    max_width: Optional[int] = None,
+    originals: Optional[List[Carpet]] = None,
+    raw_originals: Optional[List[Carpet]] = None,
+    pair_mode: str = "B",
+    measurement_unit: str = "cm",
+    metrics: Optional[ReportMetrics] = None,
+    sheets: Optional[Iterable[str]] = None,
+    engine_report: Optional[dict] = None,
+    auto_comparison: Optional[List[dict]] = None,
+) -> Dict[str, SheetTable]:
+    """
+    إنشاء جداول الأوراق بعد تحويل الوحدة، مرتبة حسب ترتيب الكتابة
+    {اسم الورقة: SheetTable}. تُستخدم لكتابة Excel و csv/parquet.
+
+    كل الأوراق تقرأ من نفس ReportMetrics (مرور واحد على البيانات)، وصفوفها
+    مولدات tuple تُحسب عند الكتابة: كاتب Excel يكتب كل صف مباشرة دون
+    DataFrame وسيط، و sheet_frames يبنيها DataFrame لملفات csv/parquet.
+    sheets: أسماء الأوراق المطلوبة (مثل "group_details" أو الاسم العربي)،
+    والافتراضي كل الأوراق.
+    engine_report يضيف ورقة "الأداء" في النهاية (لا تتأثر بتحويل الوحدة)،
+    و auto_comparison يضيف ورقة "مقارنة الخيارات".
+    """
+    if metrics is None:
+        metrics = ReportMetrics(groups, remaining, originals, raw_originals)
+
+    builders = {
+        # إنشاء ورقة تفاصيل المجموعات
+        'تفاصيل القصات': lambda: _create_group_details_sheet(groups, metrics),
+        # إنشاء ورقة ملخص المجموعات
+        'ملخص القصات': lambda: _create_group_summary_sheet(groups, pair_mode, metrics),
+        # إنشاء ورقة السجاد المتبقي
+        'السجاد المتبقي': lambda: _create_remaining_sheet(remaining, metrics),
+        # إنشاء ورقة الإجماليات
+        'الإجماليات': lambda: _create_totals_sheet(
+            originals, groups, remaining, max_width, raw_originals, pair_mode, metrics
+        ),
+        # إنشاء ورقة التدقيق
+        'تدقيق الكميات': lambda: _create_audit_sheet(groups, remaining, originals, metrics),
+        # إنشاء ورقة إحصائيات المجموعات الإضافية
+        'الهادر': lambda: _generate_waste_sheet(groups, originals, max_width, metrics),
+        # إنشاء ورقة اقتراح مكمل مباشر لكل عنصر متبقي
+        'اقتراح مكمل لكل عنصر': lambda: _create_pair_complement_sheet(remaining, min_width, max_width, metrics),
+    }
+    if engine_report:
+        # إنشاء ورقة عدادات محرك التجميع (اختيارية)
+        builders['الأداء'] = lambda: _create_performance_sheet(engine_report)
+    if auto_comparison:
+        # إنشاء ورقة مقارنة تركيبات الوضع التلقائي (اختيارية)
+        builders['مقارنة الخيارات'] = lambda: _create_auto_comparison_sheet(auto_comparison)
+    wanted = None if sheets is None else _resolve_sheet_names(sheets)
+    names = [name for name in builders if wanted is None or name in wanted]
+
+    def build(name: str) -> SheetTable:
+        table = builders[name]()
+        # Apply Unit Conversion
+        try:
+            if measurement_unit in ['m', 'm2']:
+                table = _convert_table_units(table, measurement_unit)
+        except Exception as e:
+            print(f"Error applying unit conversion: {e}")
+            traceback.print_exc()
+        return table
+
+    return {name: build(name) for name in names}
+
+
+def sheet_frames(tables: Dict[str, SheetTable], max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    بناء DataFrame لكل ورقة (لملفات csv/parquet). الأوراق مستقلة عن بعضها
+    فتُبنى بالتوازي في threads؛ max_workers=1 للبناء التسلسلي.
+    """
+    names = list(tables)
+    workers = min(len(names), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return {name: tables[name].to_frame() for name in names}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(tables[name].to_frame) for name in names}
+        return {name: futures[name].result() for name in names}
+
+
+def _resolve_sheet_names(sheets: Iterable[str]) -> set:
+    """تحويل أسماء الأوراق (المفتاح الإنجليزي أو الاسم العربي) إلى الأسماء العربية"""
+    by_key = {key: name for name, key in SHEET_FILE_NAMES.items()}
+    resolved = set()
+    for sheet in sheets:
+        sheet = str(sheet).strip()
+        if sheet in SHEET_FILE_NAMES:
+            resolved.add(sheet)
+        elif sheet in by_key:
+            resolved.add(by_key[sheet])
+        else:
+            raise ValueError(f"ورقة غير معروفة: {sheet} (المتاح: {', '.join(by_key)})")
+    return resolved
 
-    # Apply Unit Conversion
-    try:
-        # config_manager = ConfigManager() # No longer needed
-        # config = config_manager.load_config() # No longer needed
-        unit = ConfigManager.get_value("measurement_unit", "cm")
-        
-        if unit in ['m', 'm2']:
-            dfs = [df1, df2, df3, totals_df, df_audit, waste_df, df_pair_complement]
-            _convert_dfs_units(dfs, unit)
-    except Exception as e:
-        print(f"Error applying unit conversion: {e}")
-        traceback.print_exc()
-
-    _write_all_sheets_to_excel(
-        path, df1, df2, df3, totals_df, df_audit, waste_df, df_pair_complement
-    )
 
 # =============================================================================
 # WRITING & FORMATTING FUNCTIONS - دوال الكتابة والتنسيق
 # =============================================================================
 
-def _write_all_sheets_to_excel(
-    path: str,
-    df1: pd.DataFrame,
-    df2: pd.DataFrame,
-    df3: pd.DataFrame,
-    totals_df: pd.DataFrame,
-    df_audit: pd.DataFrame,
-    waste_df: pd.DataFrame,
-    df_pair_complement: pd.DataFrame
-) -> None:
-    """كتابة جميع الأوراق إلى ملف Excel مع ضبط تلقائي لعرض الأعمدة."""
+NUMERIC_COLUMNS = frozenset([
+    'العرض', 'الطول','الارتفاع', 'الكمية المستخدمة', 'الكمية الأصلية',
+    'الطول الاجمالي للسجادة', 'العرض الإجمالي', 'الطول الإجمالي المرجعي (التقريبي)',
+    'المساحة الإجمالية (cm²)', 'المساحة الإجمالية (m²)', 'الكمية المتبقية', 'الإجمالي قبل العملية',
+    'الإجمالي بعد العملية', 'المستهلك', 'الكفاءة (%)','الكمية المنتجة',
+    'كمية الهادر', 'كمية الطلبية',
+    'الكمية المستخدمة الكلية', 'الكمية الاصلية',
+    'طول المسار', 'الهادر في العرض (cm²)', 'الهادر في العرض (m²)', 'المسار المرجعي',
+    'هادر المسارات (cm²)', 'هادر المسارات (m²)', 'طول مكمل مقترح', 'كمية مكمل مقترحة',
+    'العرض الإجمالي بعد الإكمال', 'كمية الطلبية (cm²)', 'كمية الطلبية (m²)',
+    'الكمية المتبقية (cm²)', 'الكمية المتبقية (m²)', 'الكمية المنتجة (cm²)',
+    'الكمية المنتجة (m²)', 'كمية الهادر (cm²)', 'كمية الهادر (m²)',
+    'الإجمالي الأصلي (m²)', 'المستهلك (m²)', 'المتبقي (m²)',
+    'إجمالي المساحة (cm²)', 'إجمالي المساحة (m²)', 'القيمة',
+    'عدد القصات', 'نسبة الاستخدام (%)', 'النتيجة', 'الزمن (ثانية)'])
+
+DETAILS_SHEET = 'تفاصيل القصات'
+CUT_COLUMN = 'رقم القصة'
+
+
+def _write_all_sheets_to_excel(path: str, sheets: Dict[str, SheetTable]) -> None:
+    """
+    كتابة جميع الأوراق غير الفارغة مباشرة عبر xlsxwriter بوضع constant_memory:
+    كل صف يُكتب مرة واحدة بتنسيقه النهائي عند توليده، فلا تبقى الأوراق
+    في الذاكرة ولا يُعاد المرور عليها للتنسيق أو لعرض الأعمدة بعد الكتابة.
+    """
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    registry = FormatRegistry(workbook)
     try:
-        with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
-            if not df1.empty:
-                df1.to_excel(writer, sheet_name='تفاصيل القصات', index=False)
-
-            if not df2.empty:
-                df2.to_excel(writer, sheet_name='ملخص القصات', index=False)
-
-            if not df3.empty:
-                df3.to_excel(writer, sheet_name='السجاد المتبقي', index=False)
-
-            if not totals_df.empty:
-                totals_df.to_excel(writer, sheet_name='الإجماليات', index=False)
-
-            # كتابة ورقة التدقيق
-            if not df_audit.empty:
-                df_audit.to_excel(writer, sheet_name='تدقيق الكميات', index=False)
-
-            if not waste_df.empty:
-                waste_df.to_excel(writer, sheet_name='الهادر', index=False)
-
-            if not df_pair_complement.empty:
-                df_pair_complement.to_excel(writer, sheet_name='اقتراح مكمل لكل عنصر', index=False)
-
-            _auto_adjust_column_width(writer, df1, df2, df3, totals_df, df_audit, waste_df, df_pair_complement)
-
-    except Exception as e2:
-        raise
-
-
-def _auto_adjust_column_width(writer, df1, df2, df3, totals_df, df_audit, waste_df, df_pair_complement):
-    workbook = writer.book
-
-    header_format = _create_header_format(workbook)
-    normal_format = _create_normal_format(workbook)
-    number_format = _create_number_format(workbook)
-    summary_row_format = _create_summary_row_format(workbook)
-    first_col_border = _create_border_format_for_first_column(workbook)
-    
-    sheet_dataframes = {}
-
-    if not df1.empty:
-        sheet_dataframes['تفاصيل القصات'] = df1
-
-    if not df2.empty:
-        sheet_dataframes['ملخص القصات'] = df2
-
-    if not df3.empty:
-        sheet_dataframes['السجاد المتبقي'] = df3
-
-    if not totals_df.empty:
-        sheet_dataframes['الإجماليات'] = totals_df
-
-    if not df_audit.empty:
-        sheet_dataframes['تدقيق الكميات'] = df_audit
-
-    if not waste_df.empty:
-        sheet_dataframes['الهادر'] = waste_df
-
-    if not df_pair_complement.empty:
-        sheet_dataframes['اقتراح مكمل لكل عنصر'] = df_pair_complement
-
-    for sheet_name, df in sheet_dataframes.items():
-        if sheet_name in writer.sheets:
-            worksheet = writer.sheets[sheet_name]
+        formats = {
+            'header': _create_header_format(registry),
+            'normal': _create_normal_format(registry),
+            'number': _create_number_format(registry),
+            'summary': _create_summary_row_format(registry),
+            'first_col': _create_border_format_for_first_column(registry),
+        }
+
+        for sheet_name, table in sheets.items():
+            rows = iter(table.rows)
+            first_row = next(rows, None)
+            if not table.columns or first_row is None:
+                continue
 
+            worksheet = workbook.add_worksheet(sheet_name)
             try:
-                _apply_advanced_formatting(
-                    writer,
-                    sheet_name,
-                    df,
-                    header_format,
-                    normal_format,
-                    number_format,
-                    summary_row_format,
-                    first_col_border
-                )
-
-                for i, col in enumerate(df.columns):
-                    try:
-                        max_length = max(
-                            df[col].astype(str).apply(len).max(),
-                            len(str(col))  
-                        )
-                        column_width = min(max_length + 2, 50)
-                        worksheet.set_column(i, i, column_width)
-                    except Exception as e:
-                        worksheet.set_column(i, i, 15)
-
-            except Exception as e:
+                _write_sheet(registry, worksheet, sheet_name, table.columns, chain((first_row,), rows), formats)
+            except Exception:
                 traceback.print_exc()
+    finally:
+        workbook.close()
 
-def _apply_advanced_formatting(
-        writer, 
-        sheet_name, 
-        df, 
-        header_format, 
-        normal_format, 
-        number_format, 
-        summary_row_format,
-        first_col_border):
-    worksheet = writer.sheets[sheet_name]
 
-    try:
-        numeric_cols = ['العرض', 'الطول','الارتفاع', 'الكمية المستخدمة', 'الكمية الأصلية',
-                                  'الطول الاجمالي للسجادة', 'العرض الإجمالي', 'الطول الإجمالي المرجعي (التقريبي)',
-                                  'المساحة الإجمالية (cm²)', 'المساحة الإجمالية (m²)', 'الكمية المتبقية', 'الإجمالي قبل العملية',
-                                  'الإجمالي بعد العملية', 'المستهلك', 'الكفاءة (%)','الكمية المنتجة', 
-                                  'كمية الهادر', 'كمية الطلبية', 
-                                  'الكمية المستخدمة الكلية', 'الكمية الاصلية', 
-                                  'طول المسار', 'الهادر في العرض (cm²)', 'الهادر في العرض (m²)', 'المسار المرجعي', 
-                                  'هادر المسارات (cm²)', 'هادر المسارات (m²)', 'طول مكمل مقترح', 'كمية مكمل مقترحة',
-                                  'العرض الإجمالي بعد الإكمال', 'كمية الطلبية (cm²)', 'كمية الطلبية (m²)',
-                                  'الكمية المتبقية (cm²)', 'الكمية المتبقية (m²)', 'الكمية المنتجة (cm²)',
-                                  'الكمية المنتجة (m²)', 'كمية الهادر (cm²)', 'كمية الهادر (m²)',
-                                  'الإجمالي الأصلي (m²)', 'المستهلك (m²)', 'المتبقي (m²)',
-                                  'إجمالي المساحة (cm²)', 'إجمالي المساحة (m²)']
-        
-        for col_num, col_name in enumerate(df.columns, start=0):
-            col_data = df[col_name].astype(str)
-            max_len = max(col_data.str.len().max(), len(str(col_name)))
-            column_width = min(max_len + 3, 60)
-            worksheet.set_column(col_num, col_num, column_width)
-
-        for col_num, col_name in enumerate(df.columns):
-            worksheet.write(0, col_num, col_name, header_format)
-
-        total_rows_found = set()
-        
-        # إعداد ألوان القصات (فقط لورقة تفاصيل القصات)
-        cut_colors = {}
-        cut_formats = {}
-        cut_number_formats = {}
-        
-        if sheet_name == 'تفاصيل القصات' and 'رقم القصة' in df.columns:
-            # استخراج أرقام القصات الفريدة
-            cut_col_idx = df.columns.get_loc('رقم القصة')
-            unique_cuts = []
-            for val in df.iloc[:, cut_col_idx]:
-                val_str = str(val).strip()
-                if val_str and val_str not in ['', 'nan', 'المجموع'] and val_str not in unique_cuts:
-                    unique_cuts.append(val_str)
-            
-            # توليد ألوان لكل قصة
-            num_cuts = len(unique_cuts)
-            if num_cuts > 0:
-                colors = _generate_readable_colors(num_cuts)
-                
-                # ربط كل قصة بلون
-                for idx, cut_name in enumerate(unique_cuts):
-                    bg_color = colors[idx]
-                    cut_colors[cut_name] = bg_color
-                    
-                    # إنشاء format خاص لكل قصة (للنص العادي)
-                    cut_formats[cut_name] = writer.book.add_format({
-                        'bold': True,
-                        'font_size': 10,
-                        'font_name': 'Arial',
-                        'border': 2,
-                        'border_color': '#006400',
-                        'bg_color': bg_color,
-                        'font_color': '#2C3E50',  # لون نص داكن للقراءة
-                        'align': 'center',
-                        'valign': 'vcenter'
-                    })
-                    
-                    # إنشاء format للأرقام
-                    cut_number_formats[cut_name] = writer.book.add_format({
-                        'bold': True,
-                        'font_size': 10,
-                        'font_name': 'Arial',
-                        'border': 2,
-                        'border_color': '#006400',
-                        'bg_color': bg_color,
-                        'font_color': '#2C3E50',
-                        'align': 'center',
-                        'valign': 'vcenter',
-                        'num_format': '#,##0.###'
-                    })
-
-        for row_num in range(len(df)):
-            if row_num in total_rows_found:
-                continue
-
-            is_summary = _is_summary_row(df, row_num)
-            if is_summary:
-                excel_row = row_num + 1
-                for col_num in range(len(df.columns)):
-                    col_name = df.columns[col_num]
-                    cell_value = df.iloc[row_num, col_num]
-                    
-                    if col_name in numeric_cols:
-                        numeric_value = float(cell_value)
-                        worksheet.write(excel_row, col_num, numeric_value, summary_row_format)
-                    else:
-                        worksheet.write(excel_row, col_num, cell_value, summary_row_format)
-                
-                total_rows_found.add(row_num)
-                continue
-            
-            # تحديد لون القصة الحالية
-            current_cut = None
-            current_cut_format = normal_format
-            current_cut_number_format = number_format
-            
-            if sheet_name == 'تفاصيل القصات' and 'رقم القصة' in df.columns:
-                cut_col_idx = df.columns.get_loc('رقم القصة')
-                cut_value = str(df.iloc[row_num, cut_col_idx]).strip()
-                if cut_value in cut_formats:
-                    current_cut = cut_value
-                    current_cut_format = cut_formats[cut_value]
-                    current_cut_number_format = cut_number_formats[cut_value]
-            
-            excel_row = row_num + 1
-            num_cols = len(df.columns)
-            for col_num in range(num_cols):
-                col_name = df.columns[col_num]
-                cell_value = df.iloc[row_num, col_num]
-                if col_name in numeric_cols:
-                    try:
-                        numeric_value = float(cell_value)
-                        worksheet.write(excel_row, col_num, numeric_value, current_cut_number_format)
-                    except (ValueError, TypeError):
-                        worksheet.write(excel_row, col_num, cell_value, current_cut_format)
+def _write_sheet(registry, worksheet, sheet_name: str, columns: List[str], rows: Iterable[tuple], formats: dict) -> None:
+    """
+    كتابة ورقة واحدة في مرور واحد: العناوين، ثم كل صف بتنسيقاته مع تتبع
+    أطول قيمة في كل عمود، ثم عرض الأعمدة والتنسيق الشرطي.
+    """
+    numeric = [col_name in NUMERIC_COLUMNS for col_name in columns]
+    widths = [len(str(col_name)) for col_name in columns]
+
+    header_format = formats['header']
+    normal_format = formats['normal']
+    number_format = formats['number']
+    summary_row_format = formats['summary']
+    first_col_border = formats['first_col']
+
+    for col_num, col_name in enumerate(columns):
+        worksheet.write(0, col_num, col_name, header_format)
+
+    # ألوان القصات (فقط لورقة تفاصيل القصات)، تُنشأ عند أول ظهور لكل قصة
+    cut_col_idx = None
+    cut_formats = {}
+    if sheet_name == DETAILS_SHEET and CUT_COLUMN in columns:
+        cut_col_idx = columns.index(CUT_COLUMN)
+
+    row_count = 0
+    for row_count, row in enumerate(rows, 1):
+        excel_row = row_count
+
+        for col_num, cell_value in enumerate(row):
+            cell_width = len(str(cell_value))
+            if cell_width > widths[col_num]:
+                widths[col_num] = cell_width
+
+        cut = None
+        if cut_col_idx is not None:
+            cut = _cut_format(registry, cut_formats, row[cut_col_idx])
+
+        if _is_summary_value(row[0]):
+            text_format = cell_number_format = summary_row_format
+        elif cut is not None:
+            text_format, cell_number_format = cut
+        else:
+            text_format, cell_number_format = normal_format, number_format
+
+        # العمود الأول: القيمة كما هي بإطار العمود الأول
+        _write_cell(worksheet, excel_row, 0, row[0], first_col_border)
+
+        for col_num in range(1, len(row)):
+            cell_value = row[col_num]
+            if numeric[col_num]:
+                try:
+                    number = float(cell_value)
+                except (ValueError, TypeError):
+                    pass
                 else:
-                    worksheet.write(excel_row, col_num, cell_value, current_cut_format)
+                    if number == number:
+                        worksheet.write_number(excel_row, col_num, number, cell_number_format)
+                    else:
+                        worksheet.write_blank(excel_row, col_num, None, cell_number_format)
+                    continue
+            _write_cell(worksheet, excel_row, col_num, cell_value, text_format)
 
+    for col_num, width in enumerate(widths):
+        worksheet.set_column(col_num, col_num, min(width + 2, 50))
 
-        excel_rows = 1 + len(df)
-        max_col = len(df.columns)
+    add_conditional_formatting(registry, worksheet, columns, row_count)
+    _apply_row_highlight_on_selection(registry, worksheet, columns, row_count)
 
 
+def _write_cell(worksheet, row: int, col: int, value, cell_format) -> None:
+    if isinstance(value, float) and value != value:
+        # NaN: خلية فارغة منسقة (write_number لا يقبل NaN)
+        worksheet.write_blank(row, col, None, cell_format)
+    else:
+        worksheet.write(row, col, value, cell_format)
 
-        for row_num in range(excel_rows):
-            for col_num in range(max_col):
-                if row_num == 0 or row_num == excel_rows or col_num == 0 or col_num == max_col:
-                    if row_num == 0:
-                        continue
-                    else:
-                        if row_num >= 1 and row_num - 1 < len(df):
-                            cell_value = df.iloc[row_num - 1, col_num]
-                        else:
-                            cell_value = ''
-                        worksheet.write(row_num, col_num, cell_value, first_col_border)
 
-        add_conditional_formatting(writer, worksheet, df)
-        _apply_row_highlight_on_selection(writer, worksheet, df)
-
-    except Exception as e:
-        raise
+def _cut_format(registry, cut_formats: Dict[str, tuple], value) -> Optional[tuple]:
+    """
+    تنسيق (نص، أرقام) لقصة value، يُنشأ عند أول ظهورها. الألوان تتناوب على
+    cut_palette والتنسيقات من السجل، فعددها ثابت مهما زاد عدد القصات.
+    """
+    val_str = str(value).strip()
+    if val_str in cut_formats:
+        return cut_formats[val_str]
+    if not val_str or val_str in ('nan', 'None', 'المجموع'):
+        return None
+
+    base = {
+        'bold': True,
+        'font_size': 10,
+        'font_name': 'Arial',
+        'border': 2,
+        'border_color': '#006400',
+        'bg_color': cut_color(len(cut_formats)),
+        'font_color': '#2C3E50',  # لون نص داكن للقراءة
+        'align': 'center',
+        'valign': 'vcenter'
+    }
+    cut_formats[val_str] = (
+        registry.add_format(base),
+        registry.add_format(dict(base, num_format='#,##0.###')),
+    )
+    return cut_formats[val_str]
 
 
-def _convert_dfs_units(dfs: List[pd.DataFrame], unit: str):
+def _convert_table_units(table: SheetTable, unit: str) -> SheetTable:
     """
-    Convert values in DataFrames based on the selected unit.
+    Convert values in a sheet table based on the selected unit.
     cm -> m: divide linear by 100, area by 10000
+    Rows are converted lazily as the writer consumes them.
     """
     linear_factor = 100.0
     area_factor = 10000.0
@@ -469,22 +429,19 @@ def _convert_dfs_units(dfs: List[pd.DataFrame], unit: str):
         'إجمالي المساحة (cm²)': 'إجمالي المساحة (m²)'
     }
 
-    for df in dfs:
-        if df.empty:
-            continue
-            
-        # Convert Linear Columns
-        for col in linear_cols:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: _safe_convert(x, linear_factor))
-                
-        # Convert Area Columns
-        for col in area_cols:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: _safe_convert(x, area_factor))
-        
-        # Rename columns
-        df.rename(columns=rename_map, inplace=True)
+    factors = [
+        linear_factor if col in linear_cols else area_factor if col in area_cols else None
+        for col in table.columns
+    ]
+    columns = [rename_map.get(col, col) for col in table.columns]
+    if not any(factors):
+        return SheetTable(columns, table.rows, table.frame_dtype)
+
+    rows = (
+        tuple(val if factor is None else _safe_convert(val, factor) for val, factor in zip(row, factors))
+        for row in table.rows
+    )
+    return SheetTable(columns, rows, table.frame_dtype)
 
 
 def _safe_convert(val, factor):
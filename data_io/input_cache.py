@@ -0,0 +1,154 @@
+"""
+Parsed Input Cache
+==================
+ذاكرة مؤقتة على القرص لنتيجة تحليل ملفات الطلبيات.
+
+المفتاح: بصمة SHA-256 لمحتوى الملف + الإعدادات المؤثرة على التحليل
+(pair_mode، إزاحات التحضير، الورقة، وضع القراءة). القيمة: مصفوفات
+parse_orders_frame بصيغة npz مضغوطة، فإعادة تشغيل نفس الملف بإعدادات
+آلة أو سماحية أو ترتيب مختلفة لا تعيد قراءة Excel إطلاقاً.
+
+الحجم الكلي محدود (max_bytes)، وعند تجاوزه تُحذف الملفات الأقدم استخداماً.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+import numpy as np
+
+from .excel_reader import PARSED_FIELDS, PREP_OFFSET, read_input_arrays
+
+# يُرفع عند تغيير شكل المصفوفات المخزنة أو قواعد التحليل
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cutoptimizer", "input_cache")
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+_CACHE_SUFFIX = ".npz"
+
+
+class ParsedInputCache:
+    """ذاكرة مؤقتة محدودة الحجم لمصفوفات الطلبيات المحللة"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key_for(self, path: str, sheet_name=0, pair_mode: str = "B", streaming: bool = False) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+
+        settings = json.dumps({
+            "version": CACHE_FORMAT_VERSION,
+            "sheet_name": sheet_name,
+            "pair_mode": str(pair_mode).upper(),
+            "prep_offset": sorted(PREP_OFFSET.items()),
+            "streaming": bool(streaming),
+        }, sort_keys=True)
+        digest.update(settings.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _CACHE_SUFFIX)
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        entry = self._entry_path(key)
+        try:
+            with np.load(entry, allow_pickle=False) as data:
+                # KeyError إذا كان الملف بصيغة أقدم تنقصها مصفوفة
+                parsed = {name: data[name] for name in PARSED_FIELDS}
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # BadZipFile/zlib.error/ValueError لملف تالف، KeyError لصيغة قديمة:
+            # تالف أو بصيغة قديمة: يُحذف ويُعاد التحليل بدل الفشل في كل تشغيل
+            self._discard(entry)
+            return None
+
+        try:
+            # تحديث وقت الاستخدام لترتيب الحذف (الأقدم استخداماً أولاً)
+            os.utime(entry)
+        except OSError:
+            pass
+        return parsed
+
+    def _discard(self, entry: str) -> None:
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
+
+    def store(self, key: str, parsed: Dict[str, np.ndarray]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **parsed)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """حذف الأقدم استخداماً حتى يصبح الحجم الكلي ضمن max_bytes"""
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(_CACHE_SUFFIX)]
+        except OSError:
+            return
+
+        entries = []
+        for name in names:
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        self.max_bytes, max_bytes = 0, self.max_bytes
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+
+
+def read_input_arrays_cached(
+        path: str,
+        cache: ParsedInputCache,
+        sheet_name=0,
+        pair_mode: str = "B",
+        streaming: bool = False,
+    ):
+    """
+    مثل read_input_arrays مع المرور بالذاكرة المؤقتة.
+    يرجع (parsed, hit) حيث hit=True إذا لم يُقرأ ملف Excel.
+    """
+    key = cache.key_for(path, sheet_name, pair_mode, streaming)
+    parsed = cache.load(key)
+    if parsed is not None:
+        return parsed, True
+
+    parsed = read_input_arrays(path, sheet_name, pair_mode, streaming)
+    try:
+        cache.store(key, parsed)
+    except OSError:
+        # فشل الكتابة (صلاحيات/مساحة) لا يوقف التشغيل
+        pass
+    return parsed, False
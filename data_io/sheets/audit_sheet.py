@@ -1,7 +1,8 @@
-import pandas as pd
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from models.carpet import Carpet
 from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
+from .sheet_table import SheetTable
 
 
 def _audit_sheet_table(
@@ -28,50 +29,32 @@ def _audit_sheet_table(
         })
 
 
+AUDIT_COLUMNS = list(_audit_sheet_table())
+
+
 def _create_audit_sheet(
     groups: List[GroupCarpet],
     remaining: List[Carpet],
-    originals: Optional[List[Carpet]] = None
-) -> pd.DataFrame:
-    used_totals: Dict[tuple, int] = {}
-
-    def _accumulate_used(from_groups: Optional[List[GroupCarpet]]):
-        if from_groups:
-            for g in from_groups:
-                for it in g.items:
-                    if it.repeated:
-                        for rep in it.repeated:
-                            key = (rep.get("id"), it.width, it.height, rep.get("client_order"))
-                            used_totals[key] = used_totals.get(key, 0) + int(rep.get("qty"))
-                    else:
-                        key = (it.carpet_id, it.width, it.height, it.client_order)
-                        used_totals[key] = used_totals.get(key, 0) + int(it.qty_used)
-
-    _accumulate_used(groups)
-
-    remaining_totals: Dict[tuple, int] = {}
-    for r in remaining:
-        if r.repeated:
-            for rep in r.repeated:
-                if rep.get("qty_rem") > 0:
-                    key = (rep.get("id"), r.width, r.height, rep.get("client_order"))
-                    remaining_totals[key] = remaining_totals.get(key, 0) + int(rep.get("qty_rem"))
-        else:
-            if r.rem_qty > 0:
-                key = (r.id, r.width, r.height, r.client_order)
-                remaining_totals[key] = remaining_totals.get(key, 0) + int(r.rem_qty)
-
-    original_totals: Dict[tuple, int] = {}
-    if originals is not None:
-        for r in originals:
-            key = (r.id, r.width, r.height, r.client_order)
-            original_totals[key] = original_totals.get(key, 0) + int(r.qty)
+    originals: Optional[List[Carpet]] = None,
+    metrics: Optional[ReportMetrics] = None,
+) -> SheetTable:
+    if metrics is None:
+        metrics = ReportMetrics(groups, remaining, originals)
+    return SheetTable(AUDIT_COLUMNS, _audit_rows(metrics))
+
+
+def _audit_rows(metrics: ReportMetrics) -> Iterator[tuple]:
+    used_totals = metrics.used_by_sku
+    remaining_totals = metrics.remaining_by_sku
+
+    if metrics.original_by_sku is not None:
+        original_totals = metrics.original_by_sku
     else:
+        original_totals: Dict[tuple, int] = {}
         all_keys = set(list(used_totals.keys()) + list(remaining_totals.keys()))
         for k in all_keys:
             original_totals[k] = used_totals.get(k, 0) + remaining_totals.get(k, 0)
 
-    audit_rows = []
     all_keys = set(list(original_totals.keys()) + list(used_totals.keys()) + list(remaining_totals.keys()))
 
     total_width= 0
@@ -95,7 +78,7 @@ def _create_audit_sheet(
         total_rem_qty+= rem
         total_diff_qty+= diff
 
-        audit_rows.append(
+        yield tuple(
             _audit_sheet_table(
                 rid,
                 co,
@@ -106,16 +89,16 @@ def _create_audit_sheet(
                 rem,
                 diff,
                 '✅ نعم' if diff == 0 else '❌ لا'
-            )
+            ).values()
         )
 
-    audit_rows.append(_audit_sheet_table())
+    yield tuple(_audit_sheet_table().values())
 
     is_same= '❌ لا'
     if total_original_qty == total_used_qty + total_rem_qty:
         is_same= '✅ نعم'
 
-    audit_rows.append(
+    yield tuple(
         _audit_sheet_table(
             'المجموع',
             '',
@@ -126,8 +109,5 @@ def _create_audit_sheet(
             total_rem_qty,
             total_diff_qty,
             is_same
-        )
+        ).values()
     )
-    df = pd.DataFrame(audit_rows)
-
-    return df
@@ -0,0 +1,61 @@
+from typing import List, Optional
+
+from .sheet_table import SheetTable
+
+
+def _auto_comparison_sheet_table(
+        grouping_mode= '',
+        sort_type= '',
+        groups= '',
+        total_used= '',
+        total_remaining= '',
+        utilization= '',
+        total_waste= '',
+        waste_percentage= '',
+        score= '',
+        seconds= '',
+        selected= '',
+    ):
+    return ({
+            'طريقة التجميع': grouping_mode,
+            'الترتيب': sort_type,
+            'عدد القصات': groups,
+            'الكمية المستخدمة': total_used,
+            'الكمية المتبقية': total_remaining,
+            'نسبة الاستخدام (%)': utilization,
+            'كمية الهادر (cm²)': total_waste,
+            'نسبة الهدر': waste_percentage,
+            'النتيجة': score,
+            'الزمن (ثانية)': seconds,
+            'المختار': selected,
+        })
+
+
+AUTO_COMPARISON_COLUMNS = list(_auto_comparison_sheet_table())
+
+
+def _create_auto_comparison_sheet(candidates: Optional[List[dict]]) -> SheetTable:
+    """
+    جدول مقارنة الوضع التلقائي (AutoSelection.candidates في core.multi_start):
+    صف لكل تركيبة GroupingMode × SortType، والنتيجة = نسبة الاستخدام - نسبة الهدر.
+    """
+    if not candidates:
+        return SheetTable()
+
+    rows = (
+        tuple(_auto_comparison_sheet_table(
+            row["grouping_mode"],
+            row["sort_type"],
+            row["groups"],
+            row["total_used"],
+            row["total_remaining"],
+            row["utilization_percentage"],
+            row["total_waste"],
+            row["waste_percentage"],
+            row["score"],
+            row["seconds"],
+            '✅' if row["selected"] else '',
+        ).values())
+        for row in candidates
+    )
+    return SheetTable(AUTO_COMPARISON_COLUMNS, rows)
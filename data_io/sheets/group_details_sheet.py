@@ -1,6 +1,7 @@
-import pandas as pd
-from typing import List
+from typing import Iterator, List, Optional
 from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
+from .sheet_table import SheetTable
 
 
 def _detals_sheet_table(
@@ -29,84 +30,90 @@ def _detals_sheet_table(
         })
 
 
+DETAILS_COLUMNS = list(_detals_sheet_table())
+
+
+def _details_row(
+        group_id= '',
+        client_order= '',
+        carpet_id= '',
+        width= '',
+        height= '',
+        path_num= '',
+        qty_used= '',
+        path_length= '',
+        original_qty= '',
+        qty_rem= '',
+    ):
+    """نفس _detals_sheet_table كصف tuple بترتيب DETAILS_COLUMNS (أقل ذاكرة من dict لكل صف)"""
+    return (client_order, group_id, path_num, width, height, qty_used, path_length, original_qty, qty_rem, carpet_id)
+
+
 def _create_group_details_sheet(
     groups: List[GroupCarpet],
-) -> pd.DataFrame:
-    rows = []
-    total_width= 0
-    total_height= 0
-    total_qty_used= 0
-    total_length_ref= 0
-    total_qty= 0
-    total_qty_rem= 0
-    total_path= 0
+    metrics: Optional[ReportMetrics] = None,
+) -> SheetTable:
+    if metrics is None:
+        metrics = ReportMetrics(groups, [])
+    return SheetTable(DETAILS_COLUMNS, _group_details_rows(groups, metrics))
+
+
+def _group_details_rows(groups: List[GroupCarpet], metrics: ReportMetrics) -> Iterator[tuple]:
+    length_refs = metrics.item_length_ref.tolist()
+
     group_id= 0
+    item_index= 0
     for g in groups:
         group_id+= 1
+        group_label = f'القصة_{group_id}'
         path_num= 0
         for it in g.items:
             path_num+= 1
+            path_label = f"المسار_{path_num}"
             if it.repeated:
                 ref_lenth= 0
                 for rep in it.repeated:
                     ref_lenth+= rep.get('qty') * it.height
-                    rows.append(
-                        _detals_sheet_table(
-                            f'القصة_{group_id}',
-                            rep.get('client_order'),
-                            it.carpet_id,
-                            it.width,
-                            it.height,
-                            f"المسار_{path_num}",
-                            rep.get('qty'),
-                            ref_lenth,
-                            rep.get("qty_original"),
-                            rep.get("qty_rem")
-                        )
-                    )
-            else:
-                rows.append(
-                    _detals_sheet_table(
-                        f'القصة_{group_id}',
-                        it.client_order,
+                    yield _details_row(
+                        group_label,
+                        rep.get('client_order'),
                         it.carpet_id,
                         it.width,
                         it.height,
-                        f"المسار_{path_num}",
-                        it.qty_used,
-                        it.length_ref(),
-                        it.qty_used + it.qty_rem,
-                        it.qty_rem
+                        path_label,
+                        rep.get('qty'),
+                        ref_lenth,
+                        rep.get("qty_original"),
+                        rep.get("qty_rem")
                     )
+            else:
+                yield _details_row(
+                    group_label,
+                    it.client_order,
+                    it.carpet_id,
+                    it.width,
+                    it.height,
+                    path_label,
+                    it.qty_used,
+                    length_refs[item_index],
+                    it.qty_used + it.qty_rem,
+                    it.qty_rem
                 )
+            item_index+= 1
 
-        rows.append(
-            _detals_sheet_table()
-        )
-        total_qty+= it.qty_used + it.qty_rem
-        total_qty_rem+= it.qty_rem
-        total_path += path_num
+        yield _details_row()
 
-        total_width+= g.total_width()
-        total_height+= g.total_height()
-        total_qty_used+= g.total_qty()
-        total_length_ref+= g.total_length_ref()
-
-    rows.append(
-        _detals_sheet_table(
-            '',
-            'المجموع',
-            '',
-            total_width,
-            total_height,
-            '',
-            total_qty_used,
-            total_length_ref,
-            total_qty,
-            total_qty_rem,
-        )
+    # الكمية الأصلية والمتبقية في صف المجموع تُحسب من آخر مسار في كل قصة
+    last_items = metrics.group_last_item
+    yield _details_row(
+        '',
+        'المجموع',
+        '',
+        int(metrics.group_total_width.sum()),
+        int(metrics.group_total_height.sum()),
+        '',
+        int(metrics.group_total_qty.sum()),
+        int(metrics.group_total_length_ref.sum()),
+        int((metrics.item_qty_used[last_items] + metrics.item_qty_rem[last_items]).sum()),
+        int(metrics.item_qty_rem[last_items].sum()),
     )
-
-    df = pd.DataFrame(rows)
-
-    return df
@@ -1,7 +1,7 @@
-import pandas as pd
-from typing import List
+from typing import Iterator, List, Optional
 from models.group_carpet import GroupCarpet
-from core.config.config_manager import ConfigManager
+from models.report_metrics import ReportMetrics
+from .sheet_table import SheetTable
 
 def _summary_sheet_table(
         group_id= '',
@@ -25,13 +25,22 @@ def _summary_sheet_table(
         })
 
 
+SUMMARY_COLUMNS = list(_summary_sheet_table())
+
+
 def _create_group_summary_sheet(
     groups: List[GroupCarpet],
-) -> pd.DataFrame:
+    pair_mode: str = "B",
+    metrics: Optional[ReportMetrics] = None,
+) -> SheetTable:
     """إنشاء ورقة ملخص المجموعات مع الإحصائيات."""
-    summary = []
-    
-    pair_mode = str(ConfigManager.get_value("pair_mode", "B")).upper()
+    if metrics is None:
+        metrics = ReportMetrics(groups, [])
+    return SheetTable(SUMMARY_COLUMNS, _group_summary_rows(groups, pair_mode, metrics))
+
+
+def _group_summary_rows(groups: List[GroupCarpet], pair_mode: str, metrics: ReportMetrics) -> Iterator[tuple]:
+    pair_mode = str(pair_mode).upper()
     multiplier = 2 if pair_mode == "A" else 1
     
     total_width= 0
@@ -41,31 +50,36 @@ def _create_group_summary_sheet(
     total_qty_used= 0
     total_area_div= 0
     group_id= 0
-    for g in groups:
+    for g_width, types_count, g_max_height, g_area, g_qty in zip(
+            metrics.group_total_width.tolist(),
+            metrics.group_item_count.tolist(),
+            metrics.group_max_height.tolist(),
+            metrics.group_total_area.tolist(),
+            metrics.group_total_qty.tolist(),
+        ):
         group_id+= 1
-        types_count = len(g.items)
-        summary.append(
+        yield tuple(
             _summary_sheet_table(
                 f'القصة_{group_id}',
-                g.total_width(),
-                len(g.items),
-                g.max_height(),
-                g.total_area() * multiplier,
-                g.total_qty() * multiplier,
+                g_width,
                 types_count,
-                g.total_area() * multiplier,
-            )
+                g_max_height,
+                g_area * multiplier,
+                g_qty * multiplier,
+                types_count,
+                g_area * multiplier,
+            ).values()
         )
-        total_width+= g.total_width()
-        total_height+= g.max_height()
-        total_area+= g.total_area() * multiplier
+        total_width+= g_width
+        total_height+= g_max_height
+        total_area+= g_area * multiplier
         items_count+= types_count
-        total_qty_used+= g.total_qty() * multiplier
-        total_area_div+= g.total_area() * multiplier
+        total_qty_used+= g_qty * multiplier
+        total_area_div+= g_area * multiplier
 
-    summary.append(_summary_sheet_table())
+    yield tuple(_summary_sheet_table().values())
     
-    summary.append(
+    yield tuple(
         _summary_sheet_table(
             "المجموع",
             total_width,
@@ -75,9 +89,5 @@ def _create_group_summary_sheet(
             total_qty_used,
             items_count,
             total_area_div
-        )
+        ).values()
     )
-
-    df = pd.DataFrame(summary)
-
-    return df
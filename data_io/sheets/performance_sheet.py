@@ -0,0 +1,57 @@
+from typing import Iterator, Optional
+
+from .sheet_table import SheetTable
+
+
+def _performance_sheet_table(metric= '', value= ''):
+    return ({
+            'المقياس': metric,
+            'القيمة': value,
+        })
+
+
+PERFORMANCE_COLUMNS = list(_performance_sheet_table())
+
+
+def _create_performance_sheet(report: Optional[dict]) -> SheetTable:
+    """
+    ورقة الأداء من تقرير عدادات المحرك (EngineStats.report() في
+    core.instrumentation): الأزمنة، مجموعات الشركاء لكل مستوى، استدعاءات
+    الحل وإخفاقاتها، التراجعات، عدادات ذاكرة الارتفاعات، وأبطأ السجادات الرئيسية.
+    """
+    if not report:
+        return SheetTable()
+    # dtype=object: الأعداد الصحيحة تبقى صحيحة بجانب الأزمنة العشرية
+    rows = (tuple(row.values()) for row in _performance_rows(report))
+    return SheetTable(PERFORMANCE_COLUMNS, rows, frame_dtype=object)
+
+
+def _performance_rows(report: dict) -> Iterator[dict]:
+    yield _performance_sheet_table('زمن build_groups (ثانية)', report.get("seconds", 0))
+    yield _performance_sheet_table('السجاد الرئيسي المعالج', report.get("mains", 0))
+    yield _performance_sheet_table('زمن السجاد الرئيسي (ثانية)', report.get("main_seconds_total", 0))
+    yield _performance_sheet_table('متوسط زمن السجادة الرئيسية (ثانية)', report.get("main_seconds_mean", 0))
+    yield _performance_sheet_table('أقصى زمن لسجادة رئيسية (ثانية)', report.get("main_seconds_max", 0))
+
+    calls_by_level = report.get("partner_calls_by_level", {})
+    for level, count in report.get("partner_sets_by_level", {}).items():
+        yield _performance_sheet_table(f'مجموعات الشركاء - المستوى {level}', count)
+        yield _performance_sheet_table(f'استدعاءات المستوى {level}', calls_by_level.get(level, 0))
+    yield _performance_sheet_table('مجموع مجموعات الشركاء', report.get("partner_sets_total", 0))
+    yield _performance_sheet_table('المرفوض بفلتر العرض', report.get("width_filter_rejects", 0))
+
+    for name, counts in report.get("solver", {}).items():
+        yield _performance_sheet_table(f'{name} - استدعاءات', counts.get("calls", 0))
+        yield _performance_sheet_table(f'{name} - إخفاقات', counts.get("failures", 0))
+    yield _performance_sheet_table('تراجعات process_partner_group', report.get("rollbacks", 0))
+
+    height_cache = report.get("height_profile_cache", {})
+    if height_cache:
+        yield _performance_sheet_table('ذاكرة الارتفاعات - إصابات', height_cache["hits"])
+        yield _performance_sheet_table('ذاكرة الارتفاعات - إخفاقات', height_cache["misses"])
+        yield _performance_sheet_table('ذاكرة الارتفاعات - الحجم الحالي', height_cache["currsize"])
+        yield _performance_sheet_table('ذاكرة الارتفاعات - الحجم الأقصى', height_cache["maxsize"])
+
+    for rank, main in enumerate(report.get("slowest_mains", []), 1):
+        label = f'أبطأ سجادة رئيسية {rank} (id {main["id"]}، {main["width"]}x{main["height"]}) (ثانية)'
+        yield _performance_sheet_table(label, main["seconds"])
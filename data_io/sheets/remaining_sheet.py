@@ -1,6 +1,7 @@
-import pandas as pd
-from typing import List
+from typing import Iterator, List, Optional
 from models.carpet import Carpet
+from models.report_metrics import ReportMetrics
+from .sheet_table import SheetTable
 
 
 def _remaining_sheet_table(
@@ -19,50 +20,43 @@ def _remaining_sheet_table(
         })
 
 
-def _create_remaining_sheet(remaining: List[Carpet]) -> pd.DataFrame:
-    aggregated = {}
-    for r in remaining:
-        if r.rem_qty > 0:
-            if r.repeated:
-                for rep in r.repeated:
-                    if rep.get("qty_rem") > 0:
-                        key = (rep.get("id"), r.width, r.height, rep.get("client_order"))
-                        aggregated[key] = aggregated.get(key, 0) + int(rep.get("qty_rem"))
-            else:
-                if r.rem_qty > 0:
-                    key = (r.id, r.width, r.height, r.client_order)
-                    aggregated[key] = aggregated.get(key, 0) + int(r.rem_qty)
+REMAINING_COLUMNS = list(_remaining_sheet_table())
+
+
+def _create_remaining_sheet(remaining: List[Carpet], metrics: Optional[ReportMetrics] = None) -> SheetTable:
+    if metrics is None:
+        metrics = ReportMetrics([], remaining)
+    return SheetTable(REMAINING_COLUMNS, _remaining_rows(metrics))
+
+
+def _remaining_rows(metrics: ReportMetrics) -> Iterator[tuple]:
+    aggregated = metrics.remaining_listed_by_sku
 
-    rem_rows = []
     total_width = 0
     total_hieght = 0
     total_rem_qty = 0
     for (rid, w, h, co), q in aggregated.items():
-        rem_rows.append(
+        yield tuple(
             _remaining_sheet_table(
                 rid,
                 co,
                 w,
                 h,
                 q
-            )
+            ).values()
         )
         total_width+= w
         total_hieght+= h
         total_rem_qty+= q
 
-    rem_rows.append(_remaining_sheet_table())
+    yield tuple(_remaining_sheet_table().values())
 
-    rem_rows.append(
+    yield tuple(
         _remaining_sheet_table(
             'المجموع',
             '',
             total_width,
             total_hieght,
             total_rem_qty
-        )
+        ).values()
     )
-
-    df = pd.DataFrame(rem_rows)
-
-    return df
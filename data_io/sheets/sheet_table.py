@@ -0,0 +1,29 @@
+"""
+Sheet Table
+جدول ورقة تقرير كأعمدة وصفوف tuple، دون بناء DataFrame.
+"""
+from typing import Iterable, Optional, Sequence
+
+import pandas as pd
+
+
+class SheetTable:
+    """
+    أعمدة ورقة تقرير وصفوفها بترتيب الأعمدة.
+
+    rows مكرر (مولد عادة) يُمر عليه مرة واحدة: كاتب Excel يكتب كل صف
+    مباشرة عند توليده، و to_frame يبني DataFrame لملفات csv/parquet فقط.
+    frame_dtype يُمرر إلى DataFrame (مثلاً object لإبقاء الأعداد الصحيحة
+    صحيحة بجانب العشرية في نفس العمود).
+    """
+    __slots__ = ("columns", "rows", "frame_dtype")
+
+    def __init__(self, columns: Sequence[str] = (), rows: Iterable[tuple] = (), frame_dtype: Optional[object] = None):
+        self.columns = list(columns)
+        self.rows = rows
+        self.frame_dtype = frame_dtype
+
+    def to_frame(self) -> pd.DataFrame:
+        if not self.columns:
+            return pd.DataFrame()
+        return pd.DataFrame(list(self.rows), columns=self.columns, dtype=self.frame_dtype)
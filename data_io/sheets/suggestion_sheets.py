@@ -1,7 +1,9 @@
 import pandas as pd
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from models.carpet import Carpet
 from models.group_carpet import GroupCarpet
+from models.report_metrics import ReportMetrics
+from .sheet_table import SheetTable
 
 
 def _create_remaining_suggestion_sheet(remaining: List[Carpet], min_width, max_width, tolerance) -> pd.DataFrame:
@@ -170,14 +172,34 @@ def _create_enhanset_remaining_suggestion_sheet(
     return df
 
 
-def _create_pair_complement_sheet(remaining: List[Carpet], min_width: int, max_width: int) -> pd.DataFrame:
-    aggregated = {}
-    for r in remaining:
-        if r.rem_qty > 0:
-            key = (r.id, r.width, r.height, r.client_order)
-            aggregated[key] = aggregated.get(key, 0) + int(r.rem_qty)
+PAIR_COMPLEMENT_COLUMNS = [
+    'معرف السجادة',
+    'أمر العميل',
+    'العرض الأصلي',
+    'الطول الأصلي',
+    'الكمية المتبقية',
+    'عرض مكمل مقترح',
+    'طول مكمل مقترح',
+    'كمية مكمل مقترحة',
+    'العرض الإجمالي بعد الإكمال',
+    'صالح ضمن الحدود',
+]
+
+
+def _create_pair_complement_sheet(
+        remaining: List[Carpet],
+        min_width: int,
+        max_width: int,
+        metrics: Optional[ReportMetrics] = None,
+    ) -> SheetTable:
+    if metrics is None:
+        metrics = ReportMetrics([], remaining)
+    return SheetTable(PAIR_COMPLEMENT_COLUMNS, _pair_complement_rows(metrics, min_width, max_width))
+
+
+def _pair_complement_rows(metrics: ReportMetrics, min_width: int, max_width: int) -> Iterator[tuple]:
+    aggregated = metrics.remaining_by_carpet
 
-    rows = []
     total_original_width = 0
     total_complement_width = 0
     total_complement_height = 0
@@ -187,47 +209,34 @@ def _create_pair_complement_sheet(remaining: List[Carpet], min_width: int, max_w
         comp_w = max(0, max_width - w)
         total_w = w + comp_w
         valid = (min_width <= total_w <= max_width)
-        rows.append({
-            'معرف السجادة': rid,
-            'أمر العميل': co,
-            'العرض الأصلي': w,
-            'الطول الأصلي': h,
-            'الكمية المتبقية': q,
-            'عرض مكمل مقترح': comp_w,
-            'طول مكمل مقترح': h,
-            'كمية مكمل مقترحة': q,
-            'العرض الإجمالي بعد الإكمال': total_w,
-            'صالح ضمن الحدود': 'نعم' if valid else 'لا',
-        })
+        yield (
+            rid,
+            co,
+            w,
+            h,
+            q,
+            comp_w,
+            h,
+            q,
+            total_w,
+            'نعم' if valid else 'لا',
+        )
         total_original_width += w
         total_complement_width += comp_w
         total_complement_height += h
         total_qty += q
 
-    rows.append({
-        'معرف السجادة': '',
-        'أمر العميل': '',
-        'العرض الأصلي': '',
-        'الطول الأصلي': '',
-        'الكمية المتبقية': '',
-        'عرض مكمل مقترح': '',
-        'طول مكمل مقترح': '',
-        'كمية مكمل مقترحة': '',
-        'العرض الإجمالي بعد الإكمال': '',
-        'صالح ضمن الحدود': '',
-    })
-
-    rows.append({
-        'معرف السجادة': 'المجموع',
-        'أمر العميل': '',
-        'العرض الأصلي': total_original_width,
-        'الطول الأصلي': '',
-        'الكمية المتبقية': total_qty,
-        'عرض مكمل مقترح': total_complement_width,
-        'طول مكمل مقترح': total_complement_height,
-        'كمية مكمل مقترحة': total_qty,
-        'العرض الإجمالي بعد الإكمال': total_original_width + total_complement_width,
-        'صالح ضمن الحدود': '',
-    })
-
-    return pd.DataFrame(rows)
+    yield ('',) * len(PAIR_COMPLEMENT_COLUMNS)
+
+    yield (
+        'المجموع',
+        '',
+        total_original_width,
+        '',
+        total_qty,
+        total_complement_width,
+        total_complement_height,
+        total_qty,
+        total_original_width + total_complement_width,
+        '',
+    )
@@ -1,8 +1,9 @@
-import pandas as pd
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from models.group_carpet import GroupCarpet
 from models.carpet import Carpet
-from core.config.config_manager import ConfigManager
+from models.report_metrics import ReportMetrics
+from core.waste_engine import waste_from_metrics
+from .sheet_table import SheetTable
 
 
 def _waste_sheet_table(
@@ -23,13 +24,21 @@ def _waste_sheet_table(
         })
 
 
+WASTE_COLUMNS = list(_waste_sheet_table())
+
+
 def _generate_waste_sheet(
     groups: List[GroupCarpet],
     originals: Optional[List[Carpet]],
     max_width: int,
-) -> pd.DataFrame:
-    total= 0
-    summary = []
+    metrics: Optional[ReportMetrics] = None,
+) -> SheetTable:
+    if metrics is None:
+        metrics = ReportMetrics(groups, [], originals)
+    return SheetTable(WASTE_COLUMNS, _waste_rows(metrics, max_width))
+
+
+def _waste_rows(metrics: ReportMetrics, max_width: int) -> Iterator[tuple]:
     total_width= 0
     total_wasteWidth= 0
     total_pathLoss= 0
@@ -39,44 +48,42 @@ def _generate_waste_sheet(
     total_result= 0
     group_id= 0
 
-    for c in originals:
-        total+= c.area() * c.qty
+    # كل المقاييس لكل المجموعات دفعة واحدة من مصفوفات العناصر
+    waste = waste_from_metrics(metrics, max_width)
+    if waste.original_area > 0:
+        percentages = waste.percentage.tolist()
+    else:
+        percentages = [0] * len(waste)
 
-    for g in groups:
+    for g_width, wasteWidth, max_length_ref, sumPathLoss, result in zip(
+            waste.total_width.tolist(),
+            waste.waste_width.tolist(),
+            waste.max_length_ref.tolist(),
+            waste.group_waste.tolist(),
+            percentages,
+        ):
         group_id+= 1
-        sumPathLoss= 0
-        wasteWidth = (max_width - g.total_width()) * g.max_length_ref()
-        
-        for item in g.items:
-            
-            sumPathLoss += (g.max_length_ref() - item.length_ref()) * item.width
-
-        sumPathLoss+= wasteWidth
-
-        result = sumPathLoss * 100 / (total) if total > 0 else 0
         total_result+= result
 
-        summary.append(
+        yield tuple(
             _waste_sheet_table(
                 f'القصة_{group_id}',
-                g.total_width(),
+                g_width,
                 wasteWidth,
-                g.max_length_ref(),
+                max_length_ref,
                 sumPathLoss,
                 f"{round(result, 2)}%"
-            )
+            ).values()
         )
 
-        total_width+= g.total_width()
+        total_width+= g_width
         total_wasteWidth+= wasteWidth
         total_pathLoss+= sumPathLoss
-        total_maxPath+= g.max_length_ref()
+        total_maxPath+= max_length_ref
 
-    summary.append(
-        _waste_sheet_table()
-    )
+    yield tuple(_waste_sheet_table().values())
     
-    summary.append(
+    yield tuple(
         _waste_sheet_table(
             "المجموع",
             total_width,
@@ -84,9 +91,5 @@ def _generate_waste_sheet(
             total_maxPath,
             total_pathLoss,
             f"{round(total_result, 2)}%"
-        )
+        ).values()
     )
-
-    df = pd.DataFrame(summary)
-
-    return df
@@ -0,0 +1,114 @@
+"""
+Flat Table I/O
+==============
+قراءة وكتابة ملفات CSV و Parquet بجانب Excel لملفات نظام ERP.
+
+الإدخال بنفس ترتيب أعمدة ملف Excel: أمر العميل، العرض، الارتفاع، الكمية،
+النسيج، كود التحضير. ملفات Parquet ذات الأعمدة المسماة (INPUT_COLUMNS)
+تُرتب بالاسم، وغير ذلك تُقرأ الأعمدة حسب موقعها.
+
+الإخراج: كل ورقة من أوراق التقرير تُكتب في ملف مستقل
+<الاسم>_<الورقة>.csv أو .parquet بجانب المسار المطلوب.
+
+يتطلب Parquet مكتبة pyarrow (أو fastparquet).
+"""
+import numbers
+import os
+from typing import Dict, List
+
+import pandas as pd
+
+TABLE_EXTENSIONS = (".csv", ".parquet")
+
+# أسماء الأعمدة المعتمدة في ملفات Parquet المسماة
+INPUT_COLUMNS = ("client_order", "width", "height", "qty", "texture", "prep_code")
+
+# اسم ملف كل ورقة (أسماء الأوراق العربية غير مناسبة لأسماء الملفات في كل الأنظمة)
+SHEET_FILE_NAMES = {
+    'تفاصيل القصات': "group_details",
+    'ملخص القصات': "group_summary",
+    'السجاد المتبقي': "remaining",
+    'الإجماليات': "totals",
+    'تدقيق الكميات': "audit",
+    'الهادر': "waste",
+    'اقتراح مكمل لكل عنصر': "pair_complement",
+    'الأداء': "performance",
+    'مقارنة الخيارات': "auto_comparison",
+}
+
+
+def table_format(path: str) -> str:
+    """"csv" أو "parquet" حسب الامتداد، أو "" لملفات Excel"""
+    ext = os.path.splitext(path)[1].lower()
+    return ext[1:] if ext in TABLE_EXTENSIONS else ""
+
+
+def read_input_table(path: str) -> pd.DataFrame:
+    """قراءة ملف CSV/Parquet كجدول بلا عناوين (نفس شكل pd.read_excel(header=None))"""
+    fmt = table_format(path)
+    try:
+        if fmt == "csv":
+            # utf-8-sig: ملفات CSV المصدرة من Excel/ERP تبدأ غالباً بـ BOM
+            return pd.read_csv(path, header=None, encoding="utf-8-sig")
+
+        df = pd.read_parquet(path)
+    except ImportError as e:
+        raise ImportError(f"قراءة Parquet تتطلب تثبيت pyarrow: {e}")
+    except Exception as e:
+        raise Exception(f"فشل في قراءة الملف: {e}")
+
+    names = [str(c).strip().lower() for c in df.columns]
+    if all(name in names for name in INPUT_COLUMNS[:4]):
+        order = [names.index(name) for name in INPUT_COLUMNS if name in names]
+        df = df.iloc[:, order]
+
+    # رقم الصف (id) يُحسب من الفهرس كما في Excel
+    df = df.reset_index(drop=True)
+    df.columns = range(df.shape[1])
+    return df
+
+
+def write_output_tables(path: str, sheets: Dict[str, pd.DataFrame]) -> List[str]:
+    """
+    كتابة كل ورقة غير فارغة في ملف مستقل بصيغة امتداد path.
+    يرجع مسارات الملفات المكتوبة.
+    """
+    fmt = table_format(path)
+    base = os.path.splitext(path)[0]
+    written = []
+
+    for sheet_name, df in sheets.items():
+        if df.empty:
+            continue
+
+        sheet_path = f"{base}_{SHEET_FILE_NAMES.get(sheet_name, sheet_name)}.{fmt}"
+        if fmt == "csv":
+            df.to_csv(sheet_path, index=False, encoding="utf-8-sig")
+        else:
+            try:
+                _parquet_safe(df).to_parquet(sheet_path, index=False)
+            except ImportError as e:
+                raise ImportError(f"كتابة Parquet تتطلب تثبيت pyarrow: {e}")
+        written.append(sheet_path)
+
+    return written
+
+
+def _parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    أعمدة الأوراق تخلط الأرقام والنصوص (صف المجموع، خلايا فارغة "")
+    وParquet يتطلب نوعاً واحداً لكل عمود: العمود الرقمي مع خلايا فارغة
+    يصبح رقمياً (الفارغ NaN)، وأي عمود مختلط آخر يصبح نصياً.
+    """
+    df = df.copy()
+    for col in df.columns:
+        values = df[col]
+        if values.dtype != object:
+            continue
+
+        present = values[values.notna() & (values.astype(str) != "")]
+        if present.map(lambda v: isinstance(v, numbers.Number) and not isinstance(v, bool)).all():
+            df[col] = pd.to_numeric(values.where(values != ""), errors="coerce")
+        else:
+            df[col] = values.map(lambda v: None if v is None or (isinstance(v, float) and pd.isna(v)) else str(v))
+    return df
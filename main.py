@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 sys.path.insert(0, r'c:\Users\RYZEN\Desktop\Task\CutOptimizer')
 
@@ -11,4 +12,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # مطلوب لعمليات الاقتراحات المتوازية في النسخة المجمعة (PyInstaller)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
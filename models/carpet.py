@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from typing import Optional
 
 @dataclass
 class Carpet:
@@ -7,27 +8,71 @@ class Carpet:
     height: int
     qty: int
     client_order: int
-    rem_qty: int = field(init=False)
     repeated: list[dict] = field(default_factory=list)
     qty_original_before_pair_mode: int = field(init=False)
+    # الكمية المتبقية محلياً، أو في مصفوفة المخزون عند الارتباط بـ Inventory
+    _rem_qty: int = field(init=False, repr=False, compare=False)
+    _inventory: Optional[object] = field(default=None, init=False, repr=False, compare=False)
+    _slot: int = field(default=-1, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self.rem_qty = self.qty
+        self._rem_qty = self.qty
         self.qty_original_before_pair_mode = self.qty
 
+    @property
+    def rem_qty(self) -> int:
+        inventory = self._inventory
+        if inventory is None:
+            return self._rem_qty
+        return inventory.rem_qty.item(self._slot)
+
+    @rem_qty.setter
+    def rem_qty(self, value: int) -> None:
+        if self._inventory is None:
+            self._rem_qty = value
+        else:
+            self._inventory.set_remaining(self._slot, value)
+
+    def _bind(self, inventory, slot: int) -> None:
+        """ربط السجادة بخانة في مخزون (Inventory) لتصبح واجهة على مصفوفاته"""
+        self._inventory = inventory
+        self._slot = slot
+
+    def _unbind(self) -> None:
+        """فك الارتباط مع الاحتفاظ بالكمية المتبقية الحالية"""
+        self._rem_qty = self.rem_qty
+        self._inventory = None
+        self._slot = -1
+
+    def __getstate__(self):
+        # النسخ (deepcopy/pickle) ينتج سجادة مستقلة لا تسحب المخزون معها
+        state = self.__dict__.copy()
+        state["_rem_qty"] = self.rem_qty
+        state["_inventory"] = None
+        state["_slot"] = -1
+        return state
+
     def area(self) -> int:
         """إرجاع المساحة"""
         return self.width * self.height
 
     def consume(self, qty_used: int) -> None:
         """خصم عدد القطع المستخدمة"""
-        if qty_used > self.rem_qty:
-            raise ValueError(f"Cannot consume {qty_used}, only {self.rem_qty} left for {self.id}")
-        self.rem_qty -= qty_used
+        rem_qty = self.rem_qty
+        if qty_used > rem_qty:
+            raise ValueError(f"Cannot consume {qty_used}, only {rem_qty} left for {self.id}")
+        self.rem_qty = rem_qty - qty_used
+
+    def restore(self, qty: int) -> None:
+        """إعادة كمية مستهلكة (تراجع عن استهلاك)"""
+        self.rem_qty += qty
 
     def is_available(self) -> bool:
         """التحقق إن كانت السجادة متاحة بعد الاستهلاك"""
-        return self.rem_qty > 0
+        inventory = self._inventory
+        if inventory is None:
+            return self._rem_qty > 0
+        return inventory.rem_qty.item(self._slot) > 0
 
     def consume_from_repeated(self, qty_needed: int) -> list[dict]:
         """
@@ -1,3 +1,5 @@
 from .carpet import Carpet
 from .carpet_used import CarpetUsed
-from .group_carpet import GroupCarpet
\ No newline at end of file
+from .group_carpet import GroupCarpet
+from .inventory import Inventory, InventorySnapshot
+from .report_metrics import ReportMetrics
\ No newline at end of file
@@ -0,0 +1,123 @@
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from models.carpet import Carpet
+
+
+class Inventory:
+    """
+    مخزون بصيغة struct-of-arrays: العرض، الارتفاع، الكمية المتبقية وأمر العميل
+    محفوظة كمصفوفات NumPy، وكائنات Carpet مرتبطة به كواجهات رقيقة
+    (rem_qty في Carpet يقرأ ويكتب مباشرة في المصفوفة).
+
+    يسمح ذلك بالتراجع الجماعي بعمليات متجهية بينما يبقى باقي الكود
+    (أوراق Excel مثلاً) يتعامل مع Carpet كما هو.
+    on_availability_changed(slot, available) يُستدعى عند نفاد خانة أو عودتها
+    (مثلاً لتحديث CarpetWidthIndex) دون فحص المصفوفة كاملة.
+    """
+
+    def __init__(self, ids, widths, heights, qty, client_order, rem_qty=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.widths = np.asarray(widths, dtype=np.int64)
+        self.heights = np.asarray(heights, dtype=np.int64)
+        self.qty = np.asarray(qty, dtype=np.int64)
+        self.client_order = np.asarray(client_order, dtype=np.int64)
+        if rem_qty is None:
+            rem_qty = self.qty
+        self.rem_qty = np.array(rem_qty, dtype=np.int64)
+        self.carpets: List[Carpet] = []
+        self.on_availability_changed: Optional[Callable[[int, bool], None]] = None
+
+    @classmethod
+    def from_carpets(cls, carpets: List[Carpet]) -> "Inventory":
+        """
+        بناء مخزون من قائمة Carpet وربط كل سجادة بخانتها
+        (ترتيب القائمة الحالي = ترتيب الخانات).
+        """
+        inventory = cls(
+            ids=[c.id for c in carpets],
+            widths=[c.width for c in carpets],
+            heights=[c.height for c in carpets],
+            qty=[c.qty for c in carpets],
+            client_order=[c.client_order for c in carpets],
+            rem_qty=[c.rem_qty for c in carpets],
+        )
+        inventory.carpets = carpets
+        for slot, c in enumerate(carpets):
+            c._bind(inventory, slot)
+        return inventory
+
+    def __len__(self) -> int:
+        return len(self.carpets)
+
+    def set_remaining(self, slot: int, value: int) -> None:
+        """كتابة الكمية المتبقية لخانة (Carpet.rem_qty) مع إشعار تغير التوفر"""
+        was_available = self.rem_qty.item(slot) > 0
+        self.rem_qty[slot] = value
+        if self.on_availability_changed and was_available != (value > 0):
+            self.on_availability_changed(slot, value > 0)
+
+    def add_remaining(self, slots: List[int], qtys: List[int]) -> None:
+        """إعادة كميات لعدة خانات بعملية np.add.at واحدة"""
+        if not self.on_availability_changed:
+            np.add.at(self.rem_qty, slots, qtys)
+            return
+        slots = np.asarray(slots, dtype=np.int64)
+        was_empty = self.rem_qty[slots] <= 0
+        np.add.at(self.rem_qty, slots, qtys)
+        for slot in np.unique(slots[was_empty & (self.rem_qty[slots] > 0)]).tolist():
+            self.on_availability_changed(slot, True)
+
+    def detach(self) -> None:
+        """
+        فك ارتباط السجاد بالمخزون مع نسخ الكمية المتبقية الحالية إليه،
+        بحيث يمكن نسخه أو تمريره لاحقاً دون سحب المصفوفات معه.
+        """
+        self.on_availability_changed = None
+        for c in self.carpets:
+            if c._inventory is self:
+                c._unbind()
+
+
+class InventorySnapshot:
+    """
+    لقطة لحالة الاستهلاك بكلفة O(n): rem_qty لكل سجادة، وعناصر repeated
+    الموجودة مع qty_rem لكل منها.
+    restore تعيد نفس الكائنات إلى حالتها دون إنشاء نسخ جديدة منها
+    (بديل copy.deepcopy عند تشغيل الخوارزمية عدة مرات على نفس السجاد).
+    """
+    __slots__ = ("carpets", "_rem_qty", "_repeated", "_repeated_qty")
+
+    def __init__(self, carpets: List[Carpet]):
+        self.carpets = list(carpets)
+        self._rem_qty = [c.rem_qty for c in self.carpets]
+        self._repeated = [tuple(c.repeated) for c in self.carpets]
+        self._repeated_qty = [tuple(rep["qty_rem"] for rep in reps) for reps in self._repeated]
+
+    def restore(self) -> None:
+        for carpet, rem_qty, reps, qtys in zip(self.carpets, self._rem_qty, self._repeated, self._repeated_qty):
+            carpet.rem_qty = rem_qty
+            if reps or carpet.repeated:
+                # نفس كائن القائمة، مع حذف ما أُضيف وإعادة ما حُذف أثناء الاستهلاك
+                carpet.repeated[:] = reps
+                for rep, qty_rem in zip(reps, qtys):
+                    rep["qty_rem"] = qty_rem
+
+
+def restore_quantities(carpets: List[Carpet], quantities: List[int]) -> None:
+    """
+    إعادة كميات مستهلكة لعدة سجادات دفعة واحدة.
+    السجاد المرتبط بمخزون يُعاد بعملية np.add.at واحدة لكل مخزون،
+    وغير المرتبط يُعاد عبر Carpet.restore.
+    """
+    grouped: Dict[int, tuple] = {}
+    for carpet, qty in zip(carpets, quantities):
+        inventory = carpet._inventory
+        if inventory is None:
+            carpet.restore(qty)
+            continue
+        _, slots, qtys = grouped.setdefault(id(inventory), (inventory, [], []))
+        slots.append(carpet._slot)
+        qtys.append(qty)
+
+    for inventory, slots, qtys in grouped.values():
+        inventory.add_remaining(slots, qtys)
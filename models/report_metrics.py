@@ -0,0 +1,162 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from models.carpet import Carpet
+from models.group_carpet import GroupCarpet
+
+SkuKey = Tuple[int, int, int, int]
+
+
+class ReportMetrics:
+    """
+    نتيجة التجميع بصيغة أعمدة، تُحسب بمرور واحد على المجموعات والمتبقي
+    والأصل، وتقرأ منها كل أوراق التقرير وإحصائيات الواجهة بدل أن تعيد كل
+    ورقة حساب total_width() و max_length_ref() و length_ref() لنفسها.
+
+    المستويات:
+    - العناصر (item_*): عنصر لكل CarpetUsed بترتيب المجموعات، و item_group رقم مجموعته.
+    - المجموعات (group_*): مصفوفة لكل مقياس بطول عدد المجموعات.
+    - الأصناف (SKU): قواميس مفتاحها (id, width, height, client_order)
+      للمستخدم والمتبقي والأصلي (بترتيب الظهور كما تعرضه الأوراق).
+    """
+
+    def __init__(
+            self,
+            groups: List[GroupCarpet],
+            remaining: List[Carpet],
+            originals: Optional[List[Carpet]] = None,
+            raw_originals: Optional[List[Carpet]] = None,
+        ):
+        self._aggregate_groups(groups)
+        self._aggregate_remaining(remaining)
+
+        self.original_by_sku: Optional[Dict[SkuKey, int]] = None
+        self.original_area = 0
+        self.total_original = 0
+        if originals is not None:
+            self.original_by_sku = {}
+            for c in originals:
+                key = (c.id, c.width, c.height, c.client_order)
+                self.original_by_sku[key] = self.original_by_sku.get(key, 0) + int(c.qty)
+                self.original_area += c.area() * c.qty
+                self.total_original += c.qty
+
+        # مساحة الطلبية من الملف الخام (العرض * الطول * الكمية)
+        self.order_area_raw = 0
+        for c in raw_originals or []:
+            self.order_area_raw += c.height * c.qty * c.width
+
+    # =========================================================================
+    # التجميع
+    # =========================================================================
+
+    def _aggregate_groups(self, groups: List[GroupCarpet]) -> None:
+        item_group, widths, heights, qty_used, qty_rem, produced_qty = [], [], [], [], [], []
+        self.used_by_sku: Dict[SkuKey, int] = {}
+        used = self.used_by_sku
+
+        for index, g in enumerate(groups):
+            for it in g.items:
+                item_group.append(index)
+                widths.append(it.width)
+                heights.append(it.height)
+                qty_used.append(it.qty_used)
+                qty_rem.append(it.qty_rem)
+                if it.repeated:
+                    produced = 0
+                    for rep in it.repeated:
+                        rep_qty = int(rep.get("qty", 0))
+                        produced += rep_qty
+                        key = (rep.get("id"), it.width, it.height, rep.get("client_order"))
+                        used[key] = used.get(key, 0) + rep_qty
+                    produced_qty.append(produced)
+                else:
+                    produced_qty.append(it.qty_used)
+                    key = (it.carpet_id, it.width, it.height, it.client_order)
+                    used[key] = used.get(key, 0) + int(it.qty_used)
+
+        n_groups = len(groups)
+        self.item_group = np.asarray(item_group, dtype=np.int64)
+        self.item_width = np.asarray(widths, dtype=np.int64)
+        self.item_height = np.asarray(heights, dtype=np.int64)
+        self.item_qty_used = np.asarray(qty_used, dtype=np.int64)
+        self.item_qty_rem = np.asarray(qty_rem, dtype=np.int64)
+        # الكمية المنتجة فعلياً (مجموع qty في repeated للعناصر المدمجة)
+        self.item_produced_qty = np.asarray(produced_qty, dtype=np.int64)
+        self.item_length_ref = self.item_height * self.item_qty_used
+
+        def per_group(values, ufunc=np.add):
+            out = np.zeros(n_groups, dtype=np.int64)
+            ufunc.at(out, self.item_group, values)
+            return out
+
+        self.group_item_count = per_group(1)
+        self.group_total_width = per_group(self.item_width)
+        self.group_total_height = per_group(self.item_height)
+        self.group_max_height = per_group(self.item_height, np.maximum)
+        self.group_total_qty = per_group(self.item_qty_used)
+        self.group_total_rem_qty = per_group(self.item_qty_rem)
+        self.group_total_area = per_group(self.item_width * self.item_length_ref)
+        self.group_total_length_ref = per_group(self.item_length_ref)
+        self.group_max_length_ref = per_group(self.item_length_ref, np.maximum)
+        self.group_produced_area = per_group(self.item_width * self.item_height * self.item_produced_qty)
+
+        # فهرس آخر عنصر في كل مجموعة (-1 للمجموعة الفارغة)
+        self.group_last_item = np.full(n_groups, -1, dtype=np.int64)
+        self.group_last_item[self.item_group] = np.arange(len(self.item_group))
+
+    def _aggregate_remaining(self, remaining: List[Carpet]) -> None:
+        # تدقيق الكميات: كل repeated بكمية متبقية موجبة
+        self.remaining_by_sku: Dict[SkuKey, int] = {}
+        # ورقة المتبقي: نفس التفصيل لكن فقط للسجاد ذي الكمية المتبقية الموجبة
+        self.remaining_listed_by_sku: Dict[SkuKey, int] = {}
+        # المكمل المقترح: لكل سجادة (دون تفصيل repeated)
+        self.remaining_by_carpet: Dict[SkuKey, int] = {}
+        self.total_remaining = 0
+
+        for r in remaining:
+            rem_qty = r.rem_qty
+            self.total_remaining += rem_qty
+            listed = rem_qty > 0
+            if listed:
+                key = (r.id, r.width, r.height, r.client_order)
+                self.remaining_by_carpet[key] = self.remaining_by_carpet.get(key, 0) + int(rem_qty)
+
+            if r.repeated:
+                for rep in r.repeated:
+                    rep_rem = rep.get("qty_rem")
+                    if rep_rem > 0:
+                        key = (rep.get("id"), r.width, r.height, rep.get("client_order"))
+                        self.remaining_by_sku[key] = self.remaining_by_sku.get(key, 0) + int(rep_rem)
+                        if listed:
+                            self.remaining_listed_by_sku[key] = self.remaining_listed_by_sku.get(key, 0) + int(rep_rem)
+            elif listed:
+                key = (r.id, r.width, r.height, r.client_order)
+                self.remaining_by_sku[key] = self.remaining_by_sku.get(key, 0) + int(rem_qty)
+                self.remaining_listed_by_sku[key] = self.remaining_listed_by_sku.get(key, 0) + int(rem_qty)
+
+    # =========================================================================
+    # مقاييس مشتقة
+    # =========================================================================
+
+    @property
+    def group_count(self) -> int:
+        return len(self.group_total_width)
+
+    @property
+    def total_used(self) -> int:
+        return int(self.group_total_qty.sum())
+
+    @property
+    def produced_area(self) -> int:
+        return int(self.group_produced_area.sum())
+
+    def stats(self) -> dict:
+        """إحصائيات الواجهة (data_ready)"""
+        total_used = self.total_used
+        utilization = (total_used / self.total_original * 100) if self.total_original > 0 else 0
+        return {
+            "total_original": self.total_original,
+            "total_used": total_used,
+            "total_remaining": self.total_remaining,
+            "utilization_percentage": utilization,
+        }
@@ -0,0 +1,114 @@
+"""
+مولد طلبيات اصطناعية قابلة للتكرار (نفس seed ← نفس الملف) لاختبار الأداء.
+
+التشغيل من جذر المشروع:
+    python sample_data/generate_orders.py out.xlsx [--rows 10000] [--seed 42]
+
+الأعمدة بنفس ترتيب ملف الطلبيات: أمر العميل، العرض، الارتفاع، الكمية،
+النسيج (A/B)، التحضير (A/B/C/D أو فارغ). الامتداد يحدد الصيغة (xlsx/csv/parquet).
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# مقاسات قياسية شائعة (سم) مع أوزانها؛ الباقي مقاسات خاصة عشوائية
+STANDARD_WIDTHS = [80, 84, 95, 100, 120, 126, 133, 145, 160, 168, 178, 200, 210, 240, 250, 300]
+WIDTH_WEIGHTS = [8, 4, 6, 7, 9, 4, 8, 7, 8, 6, 4, 6, 4, 3, 3, 1]
+STANDARD_HEIGHTS = [120, 150, 160, 170, 190, 200, 230, 240, 250, 285, 300, 350, 370, 400]
+HEIGHT_WEIGHTS = [5, 7, 6, 8, 6, 9, 7, 6, 5, 4, 5, 3, 2, 1]
+
+TEXTURES = ["A", "B"]
+TEXTURE_WEIGHTS = [0.9, 0.1]
+PREP_CODES = ["", "A", "B", "C", "D"]
+PREP_WEIGHTS = [0.4, 0.15, 0.2, 0.15, 0.1]
+
+
+def _weights(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values / values.sum()
+
+
+def generate_orders(
+        rows: int,
+        seed: int = 42,
+        duplicate_ratio: float = 0.3,
+        custom_ratio: float = 0.05,
+        max_qty: int = 600,
+    ) -> pd.DataFrame:
+    """
+    جدول طلبيات عشوائي من rows صفاً.
+
+    duplicate_ratio: نسبة الصفوف التي تكرر مقاساً موجوداً (تُدمج في
+    merge_duplicate_carpets)، custom_ratio: نسبة المقاسات غير القياسية.
+    الكميات منحرفة (log-normal): أغلبها صغيرة وقليل منها كبير جداً.
+    """
+    rng = np.random.default_rng(seed)
+    distinct = max(1, int(round(rows * (1 - duplicate_ratio))))
+
+    width = rng.choice(STANDARD_WIDTHS, size=distinct, p=_weights(WIDTH_WEIGHTS))
+    height = rng.choice(STANDARD_HEIGHTS, size=distinct, p=_weights(HEIGHT_WEIGHTS))
+    custom = rng.random(distinct) < custom_ratio
+    width = np.where(custom, rng.integers(80, 351, size=distinct), width)
+    height = np.where(custom, rng.integers(100, 451, size=distinct), height)
+
+    # النسيج B يبدل العرض والارتفاع عند القراءة، فيكون ارتفاعه بمدى العروض
+    texture = rng.choice(TEXTURES, size=distinct, p=TEXTURE_WEIGHTS)
+    swapped = texture == "B"
+    height = np.where(swapped, rng.choice(STANDARD_WIDTHS, size=distinct, p=_weights(WIDTH_WEIGHTS)), height)
+    prep = rng.choice(PREP_CODES, size=distinct, p=PREP_WEIGHTS)
+
+    # كل صف مقاس جديد أو تكرار لمقاس سابق (نفس العرض والارتفاع)
+    size_index = np.concatenate([
+        np.arange(distinct),
+        rng.integers(0, distinct, size=rows - distinct),
+    ])
+    rng.shuffle(size_index)
+
+    qty = np.clip(np.rint(rng.lognormal(mean=3.0, sigma=0.8, size=rows)), 1, max_qty).astype(np.int64)
+    client_order = rng.integers(1, max(2, rows // 20) + 1, size=rows)
+
+    return pd.DataFrame({
+        "client_order": client_order,
+        "width": width[size_index],
+        "height": height[size_index],
+        "qty": qty,
+        "texture": texture[size_index],
+        "prep_code": prep[size_index],
+    })
+
+
+def write_orders(path: str, df: pd.DataFrame) -> None:
+    """
+    كتابة الجدول حسب الامتداد: xlsx و csv دون عناوين مثل ملفات الطلبيات،
+    و parquet بأسماء الأعمدة (INPUT_COLUMNS في data_io.table_io).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        df.to_csv(path, index=False, header=False)
+    elif ext == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_excel(path, index=False, header=False)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="ملف الإخراج (xlsx/csv/parquet)")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    if not 100 <= args.rows <= 100000:
+        parser.error("--rows يجب أن يكون بين 100 و 100000")
+
+    write_orders(args.output, generate_orders(args.rows, args.seed, args.duplicate_ratio))
+    print(f"{args.output} created ({args.rows} rows, seed {args.seed})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
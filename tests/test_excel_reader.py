@@ -0,0 +1,70 @@
+"""
+تطابق القراءة المتدفقة (streaming) مع القراءة الكاملة لملفات xlsx.
+
+التشغيل من جذر المشروع:
+    python -m pytest tests --rootdir=tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_io.excel_reader import read_input_arrays, read_input_excel
+
+ORDERS = [
+    [1, 100, 200, 3, "A", "B"],
+    [2, 120, 250, 4, "A", None],
+    [3, 90, 180, 2, "B", "C"],
+]
+
+
+def _write_xlsx(path, rows):
+    """None بدل الصف = صف فارغ تماماً"""
+    workbook = Workbook()
+    sheet = workbook.active
+    for row_number, row in enumerate(rows, start=1):
+        for column, value in enumerate(row or [], start=1):
+            if value is not None:
+                sheet.cell(row_number, column, value)
+    workbook.save(path)
+    return str(path)
+
+
+def _assert_same_arrays(expected, actual):
+    assert expected.keys() == actual.keys()
+    for key in expected:
+        np.testing.assert_array_equal(actual[key], expected[key], err_msg=key)
+
+
+def _carpet_rows(carpets):
+    return [(c.id, c.width, c.height, c.qty, c.client_order) for c in carpets]
+
+
+@pytest.mark.parametrize("rows", [
+    pytest.param(ORDERS, id="no-blank"),
+    pytest.param(ORDERS[:2] + [None] + ORDERS[2:], id="blank-middle"),
+    pytest.param([None] + ORDERS, id="blank-leading"),
+    pytest.param(ORDERS + [None, None], id="blank-trailing"),
+])
+def test_streaming_matches_full_read(tmp_path, rows):
+    path = _write_xlsx(tmp_path / "orders.xlsx", rows)
+
+    _assert_same_arrays(read_input_arrays(path), read_input_arrays(path, streaming=True))
+
+    full = read_input_excel(path)
+    streamed = read_input_excel(path, streaming=True)
+    assert _carpet_rows(streamed[0]) == _carpet_rows(full[0])
+    assert _carpet_rows(streamed[1]) == _carpet_rows(full[1])
+
+
+def test_blank_row_inside_data_invalidates_like_pandas(tmp_path):
+    # pandas يحول العمود كاملاً إلى float عند وجود صف فارغ، فلا يُقبل أي عرض
+    path = _write_xlsx(tmp_path / "orders.xlsx", ORDERS[:1] + [None] + ORDERS[1:])
+
+    parsed = read_input_arrays(path, streaming=True)
+    assert parsed["id"].size == 0
+    assert parsed["invalid_rows"].tolist() == [1, 2, 3, 4]
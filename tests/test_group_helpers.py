@@ -0,0 +1,134 @@
+"""
+تطابق دوال core.group_helpers المحسنة مع التنفيذ المرجعي القديم
+(itertools ثم الفلترة) على مدخلات عشوائية بذور ثابتة.
+
+التشغيل من جذر المشروع:
+    python -m pytest tests --rootdir=tests
+"""
+import os
+import random
+import sys
+from collections import Counter
+from itertools import combinations, combinations_with_replacement
+from math import ceil, floor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.group_helpers import _width_bounded_combinations, equal_products_solution_with_tolerance
+from models.carpet import Carpet
+
+SEEDS = range(40)
+
+
+def _random_candidates(rng):
+    # عروض مكررة عمداً وكميات متبقية صغيرة (منها 0) لاختبار حد التكرار
+    candidates = []
+    for carpet_id in range(1, rng.randint(0, 8) + 1):
+        carpet = Carpet(carpet_id, rng.choice([30, 45, 60, 60, 80, 95, 120]), 100, 3, 1)
+        carpet.rem_qty = rng.randint(0, 3)
+        candidates.append(carpet)
+    return candidates
+
+
+def _reference_combinations(candidates, n, min_total, max_total, allow_repetition):
+    """itertools ثم فلتر العرض، ثم فلتر rem_qty القديم (عدد التكرار لكل id)"""
+    generate = combinations_with_replacement if allow_repetition else combinations
+    for combo in generate(candidates, n):
+        if not min_total <= sum(c.width for c in combo) <= max_total:
+            continue
+        if allow_repetition:
+            counts = Counter(c.id for c in combo)
+            valid = True
+            for cid, cnt in counts.items():
+                carpet = next((cand for cand in candidates if cand.id == cid), None)
+                if not carpet or carpet.rem_qty < cnt:
+                    valid = False
+                    break
+            if not valid:
+                continue
+        yield list(combo)
+
+
+@pytest.mark.parametrize("allow_repetition", [False, True], ids=["combinations", "with-replacement"])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_width_bounded_combinations_matches_itertools(seed, allow_repetition):
+    rng = random.Random(seed)
+    candidates = _random_candidates(rng)
+
+    for _ in range(10):
+        n = rng.randint(1, 4)
+        min_total = rng.randint(0, 300)
+        max_total = min_total + rng.randint(0, 200)
+
+        expected = [
+            [c.id for c in combo]
+            for combo in _reference_combinations(candidates, n, min_total, max_total, allow_repetition)
+        ]
+        actual = [
+            [c.id for c in combo]
+            for combo in _width_bounded_combinations(candidates, n, min_total, max_total, allow_repetition)
+        ]
+        # نفس المجموعات وبنفس الترتيب (الترتيب يحدد الاستهلاك الجشع)
+        assert actual == expected, (n, min_total, max_total)
+
+
+def _reference_tolerance_countdown(a, Xmax, delta, path_length_limit=0):
+    """العد التنازلي القديم: x0 من الأكبر إلى 0 بخطوة واحدة وفحص كل الأزواج"""
+    n = len(a)
+    if n == 0 or n != len(Xmax):
+        return None, 0
+    if any(ai <= 0 for ai in a):
+        return None, 0
+    if any(xm < 0 for xm in Xmax):
+        return None, 0
+    if n == 1:
+        return [Xmax[0]], Xmax[0]
+
+    a_ref = a[0]
+    x0_max = Xmax[0]
+    for i in range(1, n):
+        x0_max = min(x0_max, floor((a[i] * Xmax[i] + delta) / a_ref))
+    if path_length_limit > 0:
+        x0_max = min(x0_max, path_length_limit // a_ref)
+    if x0_max < 0:
+        return None, 0
+
+    for x0 in range(x0_max, -1, -1):
+        target = a_ref * x0
+        x_candidate = [x0]
+        valid = True
+        for i in range(1, n):
+            x_i_min = max(0, ceil((target - delta) / a[i]))
+            x_i = min(floor((target + delta) / a[i]), Xmax[i])
+            if x_i < x_i_min or x_i < 0 or abs(a[i] * x_i - target) > delta:
+                valid = False
+                break
+            x_candidate.append(x_i)
+        if not valid:
+            continue
+
+        if all(
+            abs(a[i] * x_candidate[i] - a[j] * x_candidate[j]) <= delta
+            for i in range(n) for j in range(i + 1, n)
+        ):
+            return x_candidate, x_candidate[0]
+    return None, 0
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_tolerance_solution_matches_countdown(seed):
+    rng = random.Random(seed)
+
+    for _ in range(50):
+        n = rng.randint(1, 5)
+        a = [rng.randint(1, 60) for _ in range(n)]
+        Xmax = [rng.randint(0, 40) for _ in range(n)]
+        # delta=0 يتطلب أطوالاً متساوية تماماً
+        delta = rng.choice([0, 0, rng.randint(1, 30)])
+        path_length_limit = rng.choice([0, rng.randint(1, 1500)])
+
+        expected = _reference_tolerance_countdown(a, Xmax, delta, path_length_limit)
+        actual = equal_products_solution_with_tolerance(a, Xmax, delta, path_length_limit)
+        assert actual == expected, (a, Xmax, delta, path_length_limit)
@@ -0,0 +1,79 @@
+"""
+Performance Settings Widget
+Diagnostics toggles for long runs (grouping-engine counters, run profiling)
+and the parsed-input cache / child-process solve
+"""
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QCheckBox, QGroupBox
+from core.config.config_manager import ConfigManager
+
+
+def setting_enabled(key, default=False):
+    """Read a boolean setting (QSettings may return 'true'/'false' strings)"""
+    value = ConfigManager.get_value(key, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+class PerformanceSettingsWidget(QWidget):
+    """Widget for enabling performance diagnostics"""
+
+    def __init__(self):
+        super().__init__()
+        self._setup_ui()
+        self._load_current_setting()
+
+    def _setup_ui(self):
+        """Setup the UI components"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Group Box
+        self.group_box = QGroupBox("⏱️ تشخيص الأداء")
+        group_layout = QVBoxLayout()
+
+        # Engine counters: stats["engine"] + performance sheet in the output
+        self.engine_stats_check = QCheckBox("جمع عدادات محرك التجميع (ورقة \"الأداء\" في ملف الإخراج)")
+        self.engine_stats_check.toggled.connect(self._on_engine_stats_toggled)
+        group_layout.addWidget(self.engine_stats_check)
+
+        # Profiling: .profile.prof/.txt/.json next to the output (core.profiling)
+        self.profile_check = QCheckBox("قياس التشغيل (cProfile والذاكرة لكل مرحلة) بجانب ملف الإخراج")
+        self.profile_check.toggled.connect(self._on_profile_toggled)
+        group_layout.addWidget(self.profile_check)
+
+        # Parsed-input cache (data_io.input_cache): on by default
+        self.input_cache_check = QCheckBox("حفظ البيانات المحللة مؤقتاً لتسريع إعادة تشغيل نفس الملف")
+        self.input_cache_check.toggled.connect(self._on_input_cache_toggled)
+        group_layout.addWidget(self.input_cache_check)
+
+        # build_groups in a child process (core.solve_process): on by default
+        self.solve_process_check = QCheckBox("تشكيل المجموعات في عملية منفصلة (إيقاف فوري وواجهة أسرع استجابة)")
+        self.solve_process_check.toggled.connect(self._on_solve_process_toggled)
+        group_layout.addWidget(self.solve_process_check)
+
+        self.group_box.setLayout(group_layout)
+        layout.addWidget(self.group_box)
+
+    def _load_current_setting(self):
+        """Load current toggles from config"""
+        self.engine_stats_check.setChecked(setting_enabled("collect_engine_stats"))
+        self.profile_check.setChecked(setting_enabled("profile_runs"))
+        self.input_cache_check.setChecked(setting_enabled("use_input_cache", True))
+        self.solve_process_check.setChecked(setting_enabled("solve_in_process", True))
+
+    def _on_engine_stats_toggled(self, checked):
+        """Handle engine counters toggle"""
+        ConfigManager.set_value("collect_engine_stats", bool(checked))
+
+    def _on_profile_toggled(self, checked):
+        """Handle run profiling toggle"""
+        ConfigManager.set_value("profile_runs", bool(checked))
+
+    def _on_input_cache_toggled(self, checked):
+        """Handle parsed-input cache toggle"""
+        ConfigManager.set_value("use_input_cache", bool(checked))
+
+    def _on_solve_process_toggled(self, checked):
+        """Handle child-process solve toggle"""
+        ConfigManager.set_value("solve_in_process", bool(checked))
@@ -6,6 +6,11 @@ import traceback
 from PySide6.QtWidgets import QMessageBox
 
 from core.workers.grouping_worker import GroupingWorker
+from core.config.config_manager import ConfigManager
+from core.config.run_config import RunConfig
+from core.pipeline import PROGRESS_READ, PROGRESS_GROUPS, PROGRESS_SUGGESTIONS
+from data_io.input_cache import DEFAULT_CACHE_DIR
+from ui.components.performance_settings_widget import setting_enabled
 
 
 class ProcessingHandler:
@@ -91,7 +96,8 @@ class ProcessingHandler:
                 'tolerance': int(data.get("tolerance", 5)),
                 'path_length_limit': machine_size.get("path_length_limit", 0),
                 'sort_type': sort_type,
-                'grouping_mode': grouping_mode
+                'grouping_mode': grouping_mode,
+                'auto_select': bool(data.get("auto_select", False))
             }
             
             # Update config with ALL user selections
@@ -129,11 +135,7 @@ class ProcessingHandler:
             self.worker = GroupingWorker(
                 input_path=input_path,
                 output_path=self.output_path,
-                min_width=settings['min_width'],
-                max_width=settings['max_width'],
-                tolerance_len=settings['tolerance'],
-                path_length_limit=settings['path_length_limit'],
-                cfg=self.config  # Now includes sort_type and grouping_mode!
+                run_config=self._build_run_config(settings)
             )
             
             # Connect signals
@@ -147,6 +149,33 @@ class ProcessingHandler:
             QMessageBox.critical(self.window, "Error", f"Failed to start operation: {e}")
             self.reset_state()
     
+    def _build_run_config(self, settings):
+        """Resolve persisted settings once; the run itself never reads QSettings"""
+        return RunConfig(
+            min_width=settings['min_width'],
+            max_width=settings['max_width'],
+            tolerance=settings['tolerance'],
+            path_length_limit=settings['path_length_limit'],
+            max_partner=self.config.get("max_partner", 7),
+            grouping_mode=settings['grouping_mode'],
+            sort_type=settings['sort_type'],
+            pair_mode=ConfigManager.get_value("pair_mode", "B"),
+            measurement_unit=ConfigManager.get_value("measurement_unit", "cm"),
+            # Suggestion processes (0 = CPU count)
+            suggestion_workers=int(ConfigManager.get_value("suggestion_workers", 0) or 0),
+            # Re-running the same file skips Excel parsing (opt-out in settings)
+            input_cache_dir=DEFAULT_CACHE_DIR if setting_enabled("use_input_cache", True) else None,
+            # Engine counters -> stats["engine"] and a performance sheet
+            collect_engine_stats=setting_enabled("collect_engine_stats"),
+            # cProfile + tracemalloc files next to the _processed output
+            profile_run=setting_enabled("profile_runs"),
+            # build_groups runs in a child process: no GIL contention with the
+            # event loop, and Stop terminates it instead of waiting for a check
+            solve_in_process=setting_enabled("solve_in_process", True),
+            # Every sort x mode in parallel; the best plan is written
+            auto_select=settings.get('auto_select', False),
+        )
+    
     # ==================== Worker Signal Handlers ====================
     
     def on_progress(self, value):
@@ -156,12 +185,22 @@ class ProcessingHandler:
         
         self.window.operations_section.update_progress(
             percentage=value,
-            current_step="Processing...",
+            current_step=self._progress_step(value),
             processed=f"{value}%",
             elapsed=elapsed_str,
             remaining=remaining_str
         )
     
+    def _progress_step(self, value):
+        """Stage label for a pipeline percentage (see core.pipeline PROGRESS_*)"""
+        if value < PROGRESS_READ:
+            return "Reading input..."
+        if value < PROGRESS_GROUPS:
+            return "Building groups..."
+        if value < PROGRESS_SUGGESTIONS:
+            return "Generating suggestions..."
+        return "Writing output..."
+    
     def on_error(self, error_msg):
         """Handle worker error"""
         QMessageBox.critical(self.window, "Error", f"An error occurred:\n{error_msg}")
@@ -169,6 +208,11 @@ class ProcessingHandler:
     def on_data_ready(self, groups, remaining, stats):
         """Handle worker data ready signal"""
         try:
+            # csv/parquet output is one file per sheet; open the first one written
+            output_files = stats.get("output_files")
+            if output_files is not None:
+                self.output_path = output_files[0] if output_files else None
+            
             table_data = self._prepare_table_data(groups)
             self.window.results_widget.set_data(table_data)
             self._update_statistics(stats)
@@ -19,9 +19,12 @@ class TimerManager:
         self.timer.timeout.connect(self._update_display)
         self.start_time = None
         self.elapsed_str = "00:00:00"
+        # Last percentage reported by the worker (real work units, not the bar)
+        self.progress = 0
     
     def start(self):
         """Start the elapsed time timer"""
+        self.progress = 0
         self.start_time = QElapsedTimer()
         self.start_time.start()
         self.timer.start(1000)  # Update every second
@@ -46,10 +49,9 @@ class TimerManager:
         
         self.elapsed_str = self._format_elapsed_time()
         remaining_str = self._calculate_remaining_time()
-        current_progress = self.operations_section.progress_widget.progress_bar.value()
         
         self.operations_section.update_progress(
-            percentage=current_progress,
+            percentage=self.progress,
             elapsed=self.elapsed_str,
             remaining=remaining_str
         )
@@ -65,17 +67,15 @@ class TimerManager:
         return f"{h:02d}:{m:02d}:{s:02d}"
     
     def _calculate_remaining_time(self):
-        """Calculate and format remaining time based on current progress"""
+        """Calculate and format remaining time based on the last reported progress"""
         if not self.start_time:
             return "--:--:--"
         
-        current_progress = self.operations_section.progress_widget.progress_bar.value()
-        
-        if current_progress <= 0:
+        if self.progress <= 0:
             return "--:--:--"
         
         elapsed_ms = self.start_time.elapsed()
-        total_estimated_ms = (elapsed_ms / current_progress) * 100
+        total_estimated_ms = (elapsed_ms / self.progress) * 100
         remaining_ms = total_estimated_ms - elapsed_ms
         
         if remaining_ms <= 0:
@@ -88,7 +88,8 @@ class TimerManager:
     
     def calculate_remaining_time_for_progress(self, progress):
         """
-        Calculate remaining time based on specific progress value
+        Record a progress value reported by the worker and calculate
+        the remaining time from it
         
         Args:
             progress: Current progress percentage (0-100)
@@ -96,6 +97,7 @@ class TimerManager:
         Returns:
             Formatted remaining time string
         """
+        self.progress = progress
         if not self.start_time or progress <= 0:
             return "--:--:--"
         
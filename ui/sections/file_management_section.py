@@ -224,7 +224,7 @@ class FileManagementSection(QWidget):
             self,
             "Select Excel File",
             "",
-            "Excel Files (*.xlsx *.xls);;All Files (*.*)"
+            "Order Files (*.xlsx *.xls *.csv *.parquet);;Excel Files (*.xlsx *.xls);;All Files (*.*)"
         )
         
         if file_path:
@@ -303,7 +303,7 @@ class FileManagementSection(QWidget):
             urls = event.mimeData().urls()
             if urls:
                 file_path = urls[0].toLocalFile()
-                if file_path.endswith(('.xlsx', '.xls')):
+                if file_path.endswith(('.xlsx', '.xls', '.csv', '.parquet')):
                     self._load_file(file_path)
                     event.acceptProposedAction()
                     
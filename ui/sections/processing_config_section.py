@@ -242,9 +242,21 @@ class ProcessingConfigSection(GlassCardLayout):
         layout.addWidget(self.radio_all_combinations)
         layout.addWidget(self.radio_no_main_repeat)
 
+        # Auto: run every sort x mode combination and keep the best plan
+        self.auto_check = QCheckBox("Auto (best of all)")
+        self.auto_check.setToolTip("Runs every sort type and grouping mode in parallel and keeps the best result")
+        self.auto_check.toggled.connect(self._on_auto_toggled)
+        layout.addWidget(self.auto_check)
+
         layout.addStretch()
         return panel
 
+    def _on_auto_toggled(self, checked):
+        """Sort and mode choices are ignored in auto mode"""
+        for radio in (self.radio_width, self.radio_quantity, self.radio_height,
+                      self.radio_all_combinations, self.radio_no_main_repeat):
+            radio.setEnabled(not checked)
+
     def _setup_footer(self):
         """Setup Action Buttons inside the glass card"""
         footer_layout = QHBoxLayout()
@@ -324,6 +336,7 @@ class ProcessingConfigSection(GlassCardLayout):
             "tolerance": tolerance,
             "sort_type": sort_type,
             "grouping_mode": grouping_mode,
+            "auto_select": self.auto_check.isChecked(),
             "generate_report": False  # No report generation option
         }
         self.start_processing_signal.emit(data)
@@ -8,6 +8,7 @@ from ui.widgets.app_button import AppButton
 from ui.components.appearance_settings_widget import AppearanceSettingsWidget
 from ui.components.machine_sizes_widget import MachineSizesWidget
 from ui.components.measurement_settings_widget import MeasurementSettingsWidget
+from ui.components.performance_settings_widget import PerformanceSettingsWidget
 from ui.styles.settings_styles import SettingsStyles
 
 
@@ -49,6 +50,10 @@ class SettingsView(QDialog):
         self.measurement_widget = MeasurementSettingsWidget()
         main_layout.addWidget(self.measurement_widget)
 
+        # قسم تشخيص الأداء
+        self.performance_widget = PerformanceSettingsWidget()
+        main_layout.addWidget(self.performance_widget)
+
         
         # مساحة فارغة للتوسع المستقبلي
         main_layout.addStretch()